@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+덱 명세(JSON/YAML) -> PPTX 컴파일러
+
+슬라이드별 템플릿 인덱스, 텍스트를 넣을 대상 shape(placeholder/이름/텍스트 검색),
+추가할 텍스트 상자/도형을 선언적으로 기술하고, 코드 변경 없이 PPTX로 렌더링한다.
+
+사용법:
+    python deck_spec.py jjiban_presentation.json
+    python deck_spec.py specs/*.json          # 한 프로세스에서 여러 명세 렌더링
+
+명세 형식 (YAML은 PyYAML이 설치된 경우에만 지원):
+    {
+      "template": "PPT기본양식_병합.pptx",      # 명세 파일 기준 상대 경로
+      "output": "결과.pptx",
+      "replace": {"{{회사명}}": "동국제강"},     # 모든 슬라이드의 텍스트 치환 (선택)
+      "slides": [
+        {
+          "template": 10,                       # 템플릿 슬라이드 인덱스 (0-based)
+          "replace": {"{{소제목}}": "개요"},     # 이 슬라이드만 치환 (전체 replace보다 우선)
+          "set": [                              # 템플릿에 있는 shape에 텍스트 넣기
+            {"target": {"placeholder": "title"}, "text": "제목"},
+            {"target": {"contains": ["Title", "제목"]}, "text": "..."},
+            {"target": {"name": "ColumnHeader", "nth": 1}, "text": "..."},
+            {"target": {"index": 7}, "paragraphs": ["첫 줄", {"text": "하위 항목", "level": 1}]},
+            {"target": {"placeholder": "body"}, "text": "긴 본문 ...", "fit": {"max": 18, "min": 10}}
+          ],
+          "add": [                              # 순서대로 추가 (위치/크기는 inch)
+            {"box": [1, 2, 8, 4], "text": "텍스트 상자\\n두 번째 문단", "font_size": 14},
+            {"shape": "ROUNDED_RECTANGLE", "box": [1, 3, 1.5, 1], "text": "도형"}
+          ]
+        }
+      ]
+    }
+
+"replace"는 set/add보다 먼저 적용한다 (SlideIndex - 모든 키를 한 번에 치환).
+"fit": 상자에 들어가는 가장 큰 글자 크기로 맞춤 (pptx_textfit.py - 테마 글꼴 폭 기준).
+true이면 font_size(없으면 18pt)부터 8pt까지, {"max", "min"}으로 범위 지정.
+제목 placeholder는 제목 글꼴(majorFont), 나머지는 본문 글꼴(minorFont)로 잰다.
+"""
+
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE, PP_PLACEHOLDER
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.util import Inches, Pt
+from collections import OrderedDict
+from functools import lru_cache
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import time
+
+import pptx_package as pkg
+from pptx_merge import TOKEN_PATTERN, analyze_theme, select_slides
+from pptx_snapshot import load_snapshot, shape_map
+from pptx_textfit import DEFAULT_MAX_SIZE, TextFitter, get_fitter
+
+try:
+    import yaml
+except ImportError:  # YAML 명세는 선택 기능
+    yaml = None
+
+# 컴파일러가 보관하는 슬라이드 구성(select_slides 결과) 수
+SKELETON_CACHE_SIZE = 32
+
+# 제목 글꼴(majorFont)로 맞추는 placeholder
+_TITLE_PLACEHOLDERS = (PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE)
+
+
+# ============================================================
+# 명세 읽기
+# ============================================================
+
+def load_spec(spec_file):
+    """
+    덱 명세 파일 읽기 (.json, .yaml/.yml)
+
+    template/output 상대 경로는 명세 파일 위치 기준 절대 경로로 바꿔 둔다.
+    """
+    with open(spec_file, encoding='utf-8') as f:
+        if spec_file.lower().endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise RuntimeError('YAML 명세를 읽으려면 PyYAML이 필요합니다 (pip install pyyaml)')
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(spec_file))
+    for key in ('template', 'output'):
+        if spec.get(key):
+            spec[key] = os.path.join(base_dir, spec[key])
+    return spec
+
+
+# ============================================================
+# 텍스트/도형 기본 연산
+# ============================================================
+
+@lru_cache(maxsize=256)
+def _replacement_matcher(keys):
+    """치환 키 전체를 하나의 정규식으로 (겹치면 긴 키 우선)"""
+    return re.compile('|'.join(re.escape(key) for key in sorted(keys, key=len, reverse=True)))
+
+
+class SlideIndex:
+    """
+    슬라이드 하나의 조회 테이블 (shape를 한 번만 훑어서 생성)
+
+    {{토큰}} -> 그 토큰이 든 run, placeholder idx/종류와 shape 이름 -> shape, 전체 텍스트 run
+    목록을 보관해 조회와 일괄 치환이 shape/문단/run을 매번 다시 훑지 않는다.
+    """
+
+    def __init__(self, slide):
+        self.slide = slide
+        self.by_name = {}
+        self.by_placeholder_idx = {}
+        self.by_placeholder_type = {}
+        self.runs = []
+        self.tokens = {}
+
+        for shape in slide.shapes:
+            # p:contentPart(잉크)는 비시각 속성이 없어 이름도 없음
+            for name in shape._element.xpath('./*[1]/p:cNvPr/@name'):
+                self.by_name.setdefault(name, []).append(shape)
+            if shape.is_placeholder:
+                ph = shape.placeholder_format
+                self.by_placeholder_idx[ph.idx] = shape
+                self.by_placeholder_type.setdefault(ph.type, []).append(shape)
+            # shape.text_frame은 txBody가 없으면 빈 txBody를 추가하므로 먼저 확인
+            if not shape.has_text_frame or shape._element.find('p:txBody', pkg.NS) is None:
+                continue
+            for paragraph in shape.text_frame.paragraphs:
+                for run in paragraph.runs:
+                    self.runs.append(run)
+                    self._index_tokens(run)
+
+    def _index_tokens(self, run):
+        for token in set(TOKEN_PATTERN.findall(run.text)):
+            self.tokens.setdefault(token, []).append(run)
+
+    def shape(self, name=None, idx=None, ph_type=None):
+        """shape 이름, placeholder idx 또는 종류가 일치하는 첫 shape (없으면 None)"""
+        if name is not None:
+            shapes = self.by_name.get(name)
+        elif idx is not None:
+            return self.by_placeholder_idx.get(idx)
+        else:
+            shapes = self.by_placeholder_type.get(ph_type)
+        return shapes[0] if shapes else None
+
+    def replace(self, replacements):
+        """
+        각 키를 값으로 치환 -> 바뀐 run 수
+
+        모든 키를 run마다 한 번에 찾는다 (한 키의 치환 결과를 다음 키가 다시 검색하지 않음).
+        키가 모두 {{토큰}}이면 그 토큰이 든 run만 방문한다.
+        """
+        if not replacements:
+            return 0
+        if all(TOKEN_PATTERN.fullmatch(key) for key in replacements):
+            candidates = list({id(run): run for key in replacements
+                               for run in self.tokens.get(key, [])}.values())
+        else:
+            candidates = self.runs
+
+        matcher = _replacement_matcher(tuple(replacements))
+        changed = []
+        for run in candidates:
+            text = run.text
+            new_text = matcher.sub(lambda m: replacements[m.group(0)], text)
+            if new_text != text:
+                run.text = new_text
+                changed.append(run)
+
+        # 바뀐 run의 토큰 다시 색인
+        if changed:
+            changed_ids = {id(run) for run in changed}
+            for token in list(self.tokens):
+                runs = [run for run in self.tokens[token] if id(run) not in changed_ids]
+                if runs:
+                    self.tokens[token] = runs
+                else:
+                    del self.tokens[token]
+            for run in changed:
+                self._index_tokens(run)
+        return len(changed)
+
+
+def replace_text(slide, replacements, index=None):
+    """
+    슬라이드 텍스트 치환 ({찾을 텍스트: 바꿀 텍스트}) -> 바뀐 run 수
+
+    index: 같은 슬라이드에 여러 번 치환할 때 재사용할 SlideIndex (None이면 새로 만듦)
+    """
+    index = index or SlideIndex(slide)
+    return index.replace(replacements)
+
+
+def fill_text_frame(text_frame, item):
+    """
+    텍스트 프레임 내용 교체
+
+    item의 'text'(문자열, '\\n'은 문단 구분) 또는 'paragraphs'(문자열 또는
+    {'text', 'level', 'font_size', 'bold'} 목록)를 사용한다. item의 font_size/bold는
+    모든 문단의 기본값이다.
+    """
+    paragraphs = item.get('paragraphs')
+    if paragraphs is None:
+        paragraphs = item.get('text', '').split('\n')
+
+    text_frame.text = ''
+    for i, para in enumerate(paragraphs):
+        if isinstance(para, str):
+            para = {'text': para}
+        p = text_frame.paragraphs[0] if i == 0 else text_frame.add_paragraph()
+        if 'level' in para:
+            p.level = para['level']
+        run = p.add_run()
+        run.text = para.get('text', '')
+
+        font_size = para.get('font_size', item.get('font_size'))
+        bold = para.get('bold', item.get('bold'))
+        if font_size:
+            run.font.size = Pt(font_size)
+        if bold is not None:
+            run.font.bold = bold
+
+
+def fit_item(shape, item, fitter):
+    """
+    'fit' 항목의 글자 크기 결정 -> font_size를 채운 item 사본 (fit이 없으면 item 그대로)
+
+    문단 전체를 shape 크기(상속된 placeholder 크기 포함)와 텍스트 프레임 여백에 맞춘다.
+    문단별 font_size는 그대로 둔다.
+    """
+    fit = item.get('fit')
+    if not fit:
+        return item
+    fit = fit if isinstance(fit, dict) else {}
+    paragraphs = item.get('paragraphs')
+    text = item.get('text', '') if paragraphs is None else '\n'.join(
+        para if isinstance(para, str) else para.get('text', '') for para in paragraphs)
+
+    text_frame = shape.text_frame
+    text_frame.word_wrap = True
+    insets = (text_frame.margin_left, text_frame.margin_top, text_frame.margin_right, text_frame.margin_bottom)
+    result = fitter.fit(text, shape.width, shape.height,
+                        max_size=fit.get('max', item.get('font_size') or DEFAULT_MAX_SIZE),
+                        min_size=fit.get('min'), bold=bool(item.get('bold')), insets=insets)
+    return {**item, 'font_size': result['size']}
+
+
+def is_title(shape):
+    """제목 글꼴(majorFont)로 맞추는 shape인지 (제목 placeholder)"""
+    return shape.is_placeholder and shape.placeholder_format.type in _TITLE_PLACEHOLDERS
+
+
+@lru_cache(maxsize=16)
+def _theme_fonts(theme_xml):
+    """테마 XML 글꼴 스키마 -> {'majorFont'|'minorFont': (latin, ea)} (없는 글꼴은 None)"""
+    root = pkg.parse_xml(theme_xml)
+    fonts = {}
+    for slot in ('majorFont', 'minorFont'):
+        font = root.find(f'.//a:fontScheme/a:{slot}', pkg.NS)
+        faces = [None if font is None else font.find(f'a:{script}', pkg.NS) for script in ('latin', 'ea')]
+        fonts[slot] = tuple(None if face is None else face.get('typeface') for face in faces)
+    return fonts
+
+
+def slide_fitter(slide, major=False):
+    """
+    python-pptx 슬라이드용 TextFitter - 슬라이드 마스터 테마 글꼴 기준 (DeckCompiler.fitter와 같은 글꼴)
+
+    major: True이면 제목 글꼴(majorFont), False이면 본문 글꼴(minorFont)
+    """
+    theme = slide.slide_layout.slide_master.part.part_related_by(RT.THEME)
+    latin, ea = _theme_fonts(theme.blob)['majorFont' if major else 'minorFont']
+    return get_fitter(latin, ea)
+
+
+def add_element(slide, item, fitter=None):
+    """
+    'add' 항목 하나를 슬라이드에 추가 (shape가 없으면 텍스트 상자)
+
+    fitter: 'fit' 항목에 사용할 TextFitter (None이면 fit 무시)
+    """
+    left, top, width, height = (Inches(v) for v in item['box'])
+    if 'shape' in item:
+        shape = slide.shapes.add_shape(MSO_SHAPE[item['shape']], left, top, width, height)
+    else:
+        shape = slide.shapes.add_textbox(left, top, width, height)
+    if 'text' in item or 'paragraphs' in item:
+        fill_text_frame(shape.text_frame, fit_item(shape, item, fitter) if fitter else item)
+    return shape
+
+
+# ============================================================
+# 컴파일러
+# ============================================================
+
+class DeckCompiler:
+    """
+    템플릿 하나에 대한 덱 명세 컴파일러 (여러 명세에 재사용)
+
+    템플릿 패키지는 한 번만 열어 두고, 템플릿 슬라이드별 shape 목록과 대상 shape 해석
+    결과, 템플릿 슬라이드 조합별 슬라이드 구성(select_slides 결과 - 레이아웃/마스터
+    연결 포함)을 캐시한다. 같은 템플릿으로 많은 명세를 렌더링할 때 명세마다 남는 작업은
+    구성 로드와 텍스트/도형 추가뿐이다.
+    유효한 템플릿 스냅샷(pptx_snapshot.py)이 있으면 패키지를 열지 않고 shape 목록을 스냅샷에서 읽는다.
+    """
+
+    def __init__(self, template_pptx, skeleton_cache_size=SKELETON_CACHE_SIZE):
+        self.template_pptx = template_pptx
+        self.snapshot = load_snapshot(template_pptx)
+        if self.snapshot is not None:
+            self.package = None
+            self.slide_partnames = self.snapshot.slide_partnames()
+        else:
+            self.package = pkg.LazyPackage(template_pptx)
+            self.slide_partnames = self.package.slide_partnames()
+        self.skeleton_cache_size = skeleton_cache_size
+        self._shapes = {}
+        self._targets = {}
+        self._skeletons = OrderedDict()
+        self.skeleton_bytes = 0         # 캐시한 슬라이드 구성 PPTX 바이트 합계 (메모리 상한 계산용)
+        self._fitters = {}
+
+    def close(self):
+        if self.package is not None:
+            self.package.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def shapes(self, index):
+        """
+        템플릿 슬라이드의 shape 목록 (캐시 - 스냅샷이 있으면 스냅샷에서)
+
+        Returns:
+            pptx_snapshot.shape_map() 형식 - python-pptx slide.shapes 순서의
+            [{'name', 'placeholder', 'text', 'x', 'y', 'cx', 'cy', 'tokens'}]
+        """
+        if index not in self._shapes:
+            if self.snapshot is not None:
+                self._shapes[index] = self.snapshot.slides[index]['shapes']
+            else:
+                self._shapes[index] = shape_map(self.package.sp_tree(self.slide_partnames[index]))
+        return self._shapes[index]
+
+    def fitter(self, major=False):
+        """템플릿 테마 글꼴의 TextFitter (major=True이면 제목 글꼴, 스냅샷이 있으면 스냅샷 테마)"""
+        if major not in self._fitters:
+            if self.snapshot is not None:
+                themes = self.snapshot.data['theme']
+            else:
+                themes = analyze_theme(self.package, verbose=False)
+            self._fitters[major] = TextFitter.from_theme(themes, major=major)
+        return self._fitters[major]
+
+    def resolve(self, index, target):
+        """
+        대상 지정을 템플릿 슬라이드의 shape 인덱스로 해석 (캐시)
+
+        target: {'index': n} | {'name': ...} | {'placeholder': 'title'} |
+                {'contains': 문자열 또는 목록}, 'nth'로 n번째 일치 항목 선택 (기본 0)
+        """
+        key = (index, json.dumps(target, sort_keys=True, ensure_ascii=False))
+        if key not in self._targets:
+            self._targets[key] = self._resolve(index, target)
+        return self._targets[key]
+
+    def _resolve(self, index, target):
+        shapes = self.shapes(index)
+        if 'index' in target:
+            return target['index'] if 0 <= target['index'] < len(shapes) else None
+
+        if 'name' in target:
+            matches = [i for i, s in enumerate(shapes) if s['name'] == target['name']]
+        elif 'placeholder' in target:
+            matches = [i for i, s in enumerate(shapes) if s['placeholder'] == target['placeholder']]
+        elif 'contains' in target:
+            needles = target['contains']
+            needles = [needles] if isinstance(needles, str) else needles
+            matches = [i for i, s in enumerate(shapes) if any(n in s['text'] for n in needles)]
+        else:
+            raise ValueError(f'알 수 없는 대상 지정: {target}')
+
+        nth = target.get('nth', 0)
+        return matches[nth] if nth < len(matches) else None
+
+    def skeleton(self, indices):
+        """템플릿 슬라이드 조합의 구성 PPTX 바이트 (LRU 캐시)"""
+        key = tuple(indices)
+        if key in self._skeletons:
+            self._skeletons.move_to_end(key)
+            return self._skeletons[key]
+
+        buffer = io.BytesIO()
+        select_slides(self.template_pptx, key, buffer, verbose=False)
+        self._skeletons[key] = buffer.getvalue()
+        self.skeleton_bytes += len(self._skeletons[key])
+        while len(self._skeletons) > self.skeleton_cache_size:
+            self.skeleton_bytes -= len(self._skeletons.popitem(last=False)[1])
+        return self._skeletons[key]
+
+    def compile(self, spec, progress=None):
+        """
+        명세를 python-pptx Presentation으로 컴파일
+
+        progress: 슬라이드를 채울 때마다 {'slide', 'total'}로 호출되는 함수
+                  (예외를 던지면 컴파일이 그 자리에서 중단된다)
+        """
+        slide_specs = spec['slides']
+        indices = [slide_spec['template'] for slide_spec in slide_specs]
+        for n, index in enumerate(indices, 1):
+            if not 0 <= index < len(self.slide_partnames):
+                raise IndexError(f'슬라이드 {n}: 템플릿 슬라이드 인덱스 범위 초과 ({index})')
+
+        prs = Presentation(io.BytesIO(self.skeleton(indices)))
+        for n, (slide, slide_spec) in enumerate(zip(prs.slides, slide_specs), 1):
+            replacements = {**spec.get('replace', {}), **slide_spec.get('replace', {})}
+            if replacements:
+                replace_text(slide, replacements)
+
+            for item in slide_spec.get('set', []):
+                shape_index = self.resolve(slide_spec['template'], item['target'])
+                if shape_index is None:
+                    raise ValueError(f'슬라이드 {n}: 대상 shape를 찾을 수 없음 ({item["target"]})')
+                shape = slide.shapes[shape_index]
+                if not shape.has_text_frame:
+                    raise ValueError(f'슬라이드 {n}: 텍스트를 넣을 수 없는 shape ({item["target"]})')
+                if item.get('fit'):
+                    item = fit_item(shape, item, self.fitter(is_title(shape)))
+                fill_text_frame(shape.text_frame, item)
+
+            for item in slide_spec.get('add', []):
+                add_element(slide, item, self.fitter() if item.get('fit') else None)
+
+            if progress is not None:
+                progress({'slide': n, 'total': len(slide_specs)})
+        return prs
+
+    def render(self, spec, output=None):
+        """명세를 PPTX 파일로 렌더링 (output이 없으면 명세의 output)"""
+        output = output or spec['output']
+        self.compile(spec).save(output)
+        return output
+
+
+# ============================================================
+# 여러 명세 렌더링
+# ============================================================
+
+def render_specs(spec_files, compilers=None):
+    """
+    명세 파일들을 한 프로세스에서 렌더링 (템플릿별 컴파일러 공유)
+
+    Args:
+        spec_files: 명세 파일 경로 목록
+        compilers: {템플릿 경로: DeckCompiler} (호출 간 캐시 유지용, None이면 새로 만듦)
+
+    Returns:
+        명세 순서대로 [{'spec', 'output', 'ok', 'seconds', 'error'}]
+    """
+    compilers = {} if compilers is None else compilers
+    results = []
+    for spec_file in spec_files:
+        result = {'spec': spec_file, 'output': None, 'ok': False, 'seconds': 0.0, 'error': None}
+        start = time.perf_counter()
+        try:
+            spec = load_spec(spec_file)
+            template = spec['template']
+            if template not in compilers:
+                compilers[template] = DeckCompiler(template)
+            result['output'] = compilers[template].render(spec)
+            result['ok'] = True
+        except Exception as e:
+            result['error'] = f'{type(e).__name__}: {e}'
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='덱 명세(JSON/YAML) -> PPTX 렌더링')
+    parser.add_argument('specs', nargs='+', metavar='SPEC', help='덱 명세 파일')
+    args = parser.parse_args()
+
+    compilers = {}
+    try:
+        results = render_specs(args.specs, compilers)
+    finally:
+        for compiler in compilers.values():
+            compiler.close()
+
+    for result in results:
+        if result['ok']:
+            print(f"✓ {result['spec']} -> {result['output']} ({result['seconds']:.2f}초)")
+        else:
+            print(f"✗ {result['spec']}: {result['error']}")
+
+    if not all(r['ok'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+PPTX 병합/렌더링 asyncio API
+
+이벤트 루프에서 await할 수 있는 병합(merge_async)과 덱 명세 렌더링(render_async)을
+제공한다. lxml/python-pptx 작업은 크기가 정해진 스레드 풀에서 실행하고, 세마포어로
+동시에 받아들이는 작업 수를 제한한다(대기 작업은 await에서 막힘 - 역압).
+
+취소와 타임아웃은 작업 스레드에 중단 신호를 보내고, 작업은 다음 슬라이드 경계에서
+JobCancelled로 멈춘다. 파일 출력은 임시 파일에 쓴 뒤 완료 시에만 교체하므로 중단된
+작업이 불완전한 PPTX를 남기지 않는다. 진행 상황은 progress 콜백으로 이벤트 루프에서
+받는다.
+
+사용법:
+    async with AsyncJobRunner(max_workers=4) as runner:
+        data = await runner.merge('PPT기본양식.pptx', 'PPT템플릿_예시.pptx', layout_index=8,
+                                  timeout=30, progress=print)
+        await runner.render(spec, 'out.pptx')
+
+    # 모듈 기본 runner 사용
+    data = await merge_async('PPT기본양식.pptx', 'PPT템플릿_예시.pptx')
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import io
+import os
+import threading
+
+from pptx_merge import merge_pptx_stream
+from pptx_server import TemplateCache, DEFAULT_CACHE_MB
+
+
+class JobCancelled(Exception):
+    """취소/타임아웃으로 작업 스레드가 중단됨"""
+
+
+def _write_output(data, output):
+    """결과 바이트를 그대로 반환하거나, 출력 파일로 원자적으로 기록하고 경로 반환"""
+    if output is None:
+        return data
+    tmp_file = f'{output}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, output)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return output
+
+
+class AsyncJobRunner:
+    """
+    병합/렌더링 작업 실행기 (이벤트 루프에서 사용)
+
+    파싱한 기본 양식과 덱 컴파일러는 pptx_server.TemplateCache에 보관해 작업 간에 공유한다.
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, cache_mb=DEFAULT_CACHE_MB):
+        """
+        Args:
+            max_workers: 작업 스레드 수 (None이면 min(4, CPU 수))
+            max_pending: 동시에 받아들이는 작업 수 (None이면 max_workers의 2배)
+            cache_mb: 템플릿 캐시 메모리 상한 MB
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending or self.max_workers * 2
+        self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='pptx-job')
+        self._semaphore = None
+        self._loop = None
+        self.cache = TemplateCache(cache_mb * 1024 * 1024)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """이벤트 루프를 막지 않고 종료 (실행 중인 작업 대기는 기본 executor 스레드에서)"""
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def close(self):
+        """대기 작업을 취소하고 실행 중인 작업이 끝날 때까지 기다림 (이벤트 루프에서는 aclose 사용)"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.cache.close()
+
+    async def merge(self, base_pptx, source_pptx, output=None, layout_index=None, apply_template=True,
+                    timeout=None, progress=None):
+        """
+        스트리밍 병합 (merge_pptx_stream)
+
+        Args:
+            output: 출력 파일 경로 (None이면 PPTX 바이트 반환)
+            timeout: 초 단위 제한 (초과 시 작업을 중단하고 asyncio.TimeoutError)
+            progress: 슬라이드마다 {'slide', 'total', 'templates'}로 호출 (이벤트 루프 스레드)
+
+        Returns:
+            output이 없으면 PPTX 바이트, 있으면 output
+        """
+        def job(report):
+            buffer = io.BytesIO()
+            with self.cache.base(base_pptx) as (base, _):
+                merge_pptx_stream(base['path'], source_pptx, buffer, layout_index, apply_template,
+                                  base=base, verbose=False, progress=report)
+            return _write_output(buffer.getvalue(), output)
+
+        return await self._run(job, timeout, progress)
+
+    async def render(self, spec, output=None, timeout=None, progress=None):
+        """
+        덱 명세 렌더링 (deck_spec.DeckCompiler)
+
+        Args:
+            spec: 덱 명세 dict (template은 현재 작업 디렉터리 기준 또는 절대 경로)
+            progress: 슬라이드마다 {'slide', 'total'}로 호출
+            그 외: merge()와 동일
+        """
+        def job(report):
+            with self.cache.compiler(spec['template']) as (compiler, lock), lock:
+                prs = compiler.compile(spec, progress=report)
+            buffer = io.BytesIO()
+            prs.save(buffer)
+            return _write_output(buffer.getvalue(), output)
+
+        return await self._run(job, timeout, progress)
+
+    def _get_semaphore(self, loop):
+        """이벤트 루프별 세마포어 (asyncio.run()을 여러 번 호출해도 재사용 가능하도록)"""
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        return self._semaphore
+
+    async def _run(self, job, timeout, progress):
+        """
+        작업을 스레드 풀에서 실행
+
+        취소/타임아웃 시 중단 신호를 보내고 작업 스레드가 실제로 멈출 때까지 기다린 뒤
+        예외를 다시 던진다 (세마포어 자리는 그때 반환).
+        """
+        loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+
+        def report(event):
+            if cancelled.is_set():
+                raise JobCancelled()
+            if progress is not None:
+                loop.call_soon_threadsafe(progress, event)
+
+        def run():
+            if cancelled.is_set():   # 풀에서 대기하는 동안 취소됨
+                raise JobCancelled()
+            return job(report)
+
+        async with self._get_semaphore(loop):
+            future = loop.run_in_executor(self.executor, run)
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                cancelled.set()
+                try:
+                    await asyncio.wait([future])
+                finally:
+                    if future.done() and not future.cancelled():
+                        future.exception()   # JobCancelled - 이미 처리한 중단
+                raise
+
+
+# ============================================================
+# 모듈 기본 runner
+# ============================================================
+
+_default_runner = None
+
+
+def default_runner():
+    """모듈 기본 AsyncJobRunner (처음 사용할 때 생성)"""
+    global _default_runner
+    if _default_runner is None:
+        _default_runner = AsyncJobRunner()
+    return _default_runner
+
+
+async def merge_async(base_pptx, source_pptx, output=None, layout_index=None, apply_template=True,
+                      timeout=None, progress=None):
+    """기본 runner로 스트리밍 병합 (AsyncJobRunner.merge 참고)"""
+    return await default_runner().merge(base_pptx, source_pptx, output, layout_index, apply_template,
+                                        timeout, progress)
+
+
+async def render_async(spec, output=None, timeout=None, progress=None):
+    """기본 runner로 덱 명세 렌더링 (AsyncJobRunner.render 참고)"""
+    return await default_runner().render(spec, output, timeout, progress)
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+병합/분석/생성 성능 벤치마크
+
+크기를 조절할 수 있는 합성 덱(슬라이드 수, 슬라이드당 shape 수, shape당 문단 수,
+미디어 수와 크기)을 로컬에서 만들고, 주요 진입점의 실행 시간과 최대 RSS를 측정해
+JSON으로 기록한다. 이전 결과와 비교해 기준보다 느려진 항목을 표시한다.
+
+측정 항목:
+    merge          merge_pptx (python-pptx 객체 모델 병합)
+    merge_stream   merge_pptx_stream (ZIP 스트리밍 병합)
+    analyze        analyze_pptx
+    analyze_theme  analyze_theme
+    convert        convert_to_template (덱의 모든 문단)
+    generate       generate_presentation.create_presentation (덱 명세 렌더링)
+
+각 항목은 새 프로세스(spawn)에서 실행해 최대 RSS가 다른 항목의 영향을 받지 않게 한다.
+합성 덱은 작업 디렉터리에 캐시된다 (같은 크기 설정이면 다시 만들지 않음).
+
+사용법:
+    python pptx_bench.py --slides 10,100,1000 --output bench.json
+    python pptx_bench.py --slides 100 --shapes 8 --paragraphs 4 --media 20 --media-px 2048
+    python pptx_bench.py --slides 10,100 --only merge,merge_stream --repeat 5
+    python pptx_bench.py --slides 10,100 --compare bench.json --threshold 0.2   # 느려지면 종료 코드 1
+    python pptx_bench.py --slides 100 --base PPT기본양식.pptx --layout 8       # 실제 기본 양식 사용
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+from pptx import Presentation
+from pptx.util import Emu
+from PIL import Image
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+
+try:
+    import resource
+except ImportError:  # Windows - 최대 RSS는 기록하지 않음
+    resource = None
+
+import pptx_package as pkg
+from pptx_merge import (TOOL_VERSION, analyze_pptx, analyze_theme, convert_to_template,
+                        merge_pptx, merge_pptx_stream)
+
+DEFAULT_WORKDIR = os.path.join(tempfile.gettempdir(), 'gendoc_bench')
+
+# 합성 덱 기본 크기
+DEFAULT_DECK = {'shapes': 5, 'paragraphs': 3, 'media': 4, 'media_px': 1024}
+
+# 합성 기본 양식(python-pptx 기본 템플릿)에서 병합에 쓰는 레이아웃 (Title and Content)
+SYNTHETIC_LAYOUT = 1
+
+# 비교 시 기본 허용 오차 (중앙값이 기준보다 20% 넘게 느리면 회귀)
+DEFAULT_THRESHOLD = 0.2
+
+# 합성 문단 텍스트 - 일부는 템플릿 변환 규칙에 일치하도록 스타일 가이드 문구를 섞는다
+_SAMPLE_TEXTS = [
+    '소제목 / Medium 14pt',
+    '중제목 | Medium, 16pt',
+    '텍스트를 입력하세요',
+    '우리는 인간생활의 향상과 개선에 필요한 제품과 서비스를 제공한다',
+    '프로젝트 일정과 주요 마일스톤',
+    '시장 분석 결과 요약',
+    'Quarterly revenue grew across all regions',
+    '핵심 지표: 사용자 수, 유지율, 전환율',
+]
+
+
+# ============================================================
+# 합성 덱
+# ============================================================
+
+def _synthetic_image(rng, width):
+    """노이즈 JPEG (압축이 잘 되지 않아 크기가 픽셀 수에 비례)"""
+    size = (width, width * 3 // 4)
+    image = Image.frombytes('RGB', size, rng.randbytes(size[0] * size[1] * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+
+def make_deck(path, slides, shapes=DEFAULT_DECK['shapes'], paragraphs=DEFAULT_DECK['paragraphs'],
+              media=DEFAULT_DECK['media'], media_px=DEFAULT_DECK['media_px'], seed=0):
+    """
+    합성 덱 생성 (같은 인자와 seed면 같은 내용)
+
+    빈 레이아웃 슬라이드마다 텍스트 상자 shapes개(문단 paragraphs개)를 격자로 배치하고,
+    서로 다른 미디어 media개(media_px 폭의 JPEG)를 슬라이드에 돌아가며 넣는다.
+    """
+    rng = random.Random(seed)
+    prs = Presentation()
+    blank = prs.slide_layouts[6]
+    columns = max(1, int(shapes ** 0.5))
+    rows = -(-shapes // columns)
+    cell_width = prs.slide_width // columns
+    cell_height = prs.slide_height // max(rows, 1)
+
+    slide_list = []
+    for _ in range(slides):
+        slide = prs.slides.add_slide(blank)
+        for j in range(shapes):
+            left = Emu((j % columns) * cell_width)
+            top = Emu((j // columns) * cell_height)
+            text_frame = slide.shapes.add_textbox(left, top, Emu(cell_width), Emu(cell_height)).text_frame
+            for k in range(paragraphs):
+                para = text_frame.paragraphs[0] if k == 0 else text_frame.add_paragraph()
+                para.text = rng.choice(_SAMPLE_TEXTS)
+        slide_list.append(slide)
+
+    for m in range(media if slide_list else 0):
+        slide = slide_list[m % len(slide_list)]
+        slide.shapes.add_picture(io.BytesIO(_synthetic_image(rng, media_px)),
+                                 Emu(prs.slide_width // 2), Emu(prs.slide_height // 2),
+                                 width=Emu(prs.slide_width // 4))
+    prs.save(path)
+    return path
+
+
+def make_spec(path, template, slides):
+    """합성 덱을 템플릿으로 쓰는 덱 명세 (deck_spec 형식) 생성"""
+    spec = {
+        'template': os.path.abspath(template),
+        'output': os.path.abspath(path) + '.pptx',
+        'slides': [
+            {
+                'template': i,
+                'set': [{'target': {'index': 0}, 'text': f'슬라이드 {i + 1}\n벤치마크 본문'}],
+                'add': [{'box': [1, 1, 4, 1], 'text': '추가 텍스트 상자'}],
+            }
+            for i in range(slides)
+        ],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(spec, f, ensure_ascii=False)
+    return path
+
+
+def prepare_case(workdir, slides, deck, base=None, layout=None):
+    """
+    측정 대상 파일 준비 (합성 덱은 크기 설정별로 캐시)
+
+    Returns:
+        {'slides', 'base', 'source', 'spec', 'output', 'layout'}
+    """
+    os.makedirs(workdir, exist_ok=True)
+    stem = f"deck_{slides}s_{deck['shapes']}x{deck['paragraphs']}p_{deck['media']}m_{deck['media_px']}px"
+    source = os.path.join(workdir, stem + '.pptx')
+    if not os.path.exists(source):
+        make_deck(source, slides, **deck)
+
+    if base is None:
+        base = os.path.join(workdir, 'synthetic_base.pptx')
+        if not os.path.exists(base):
+            Presentation().save(base)
+        layout = SYNTHETIC_LAYOUT if layout is None else layout
+
+    return {
+        'slides': slides,
+        'base': base,
+        'source': source,
+        'spec': make_spec(os.path.join(workdir, stem + '.spec.json'), source, slides),
+        'output': os.path.join(workdir, stem + '.out.pptx'),
+        'layout': layout,
+    }
+
+
+# ============================================================
+# 측정 항목
+# ============================================================
+
+def _paragraph_texts(pptx_file):
+    """덱의 모든 문단 텍스트 (convert 측정 준비 - 측정 시간에 포함하지 않음)"""
+    with zipfile.ZipFile(pptx_file) as zf:
+        return [pkg.paragraph_text(para)
+                for name in pkg.slide_partnames(zf)
+                for para in pkg.parse_xml(zf.read(name)).iter(pkg.qn('a:p'))]
+
+
+def _generate(spec_file):
+    from generate_presentation import create_presentation
+    create_presentation(spec_file)
+
+
+# 이름 -> (준비 함수(case) -> 상태, 실행 함수(상태))
+BENCHMARKS = {
+    'merge': (lambda case: case,
+              lambda case: merge_pptx(case['base'], case['source'], case['output'], case['layout'])),
+    'merge_stream': (lambda case: case,
+                     lambda case: merge_pptx_stream(case['base'], case['source'], case['output'],
+                                                    case['layout'], verbose=False)),
+    'merge_low_memory': (lambda case: case,
+                         lambda case: merge_pptx_stream(case['base'], case['source'], case['output'],
+                                                        case['layout'], verbose=False, low_memory=True)),
+    'analyze': (lambda case: case['source'],
+                lambda source: analyze_pptx(source, verbose=False)),
+    'analyze_theme': (lambda case: case['source'],
+                      lambda source: analyze_theme(source, verbose=False)),
+    'convert': (lambda case: _paragraph_texts(case['source']),
+                lambda texts: [convert_to_template(text) for text in texts]),
+    'generate': (lambda case: case['spec'],
+                 _generate),
+}
+
+
+def _peak_rss_mb():
+    """
+    현재 프로세스의 최대 RSS (MB, 측정할 수 없으면 None)
+
+    Linux에서는 ru_maxrss가 exec 이전(덱을 생성한 부모 프로세스)의 값을 물려받으므로
+    측정 프로세스 자신의 최대값인 /proc/self/status의 VmHWM을 우선 사용한다.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _run_case(name, case, repeat):
+    """측정 프로세스에서 항목 하나 실행 -> {'seconds', 'peak_rss_mb'}"""
+    setup, run = BENCHMARKS[name]
+    state = setup(case)
+    seconds = []
+    with redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(state)
+            seconds.append(round(time.perf_counter() - start, 6))
+    return {'seconds': seconds, 'peak_rss_mb': _peak_rss_mb()}
+
+
+def run_benchmarks(slide_counts, deck=None, names=None, repeat=3, workdir=DEFAULT_WORKDIR,
+                   base=None, layout=None, verbose=True):
+    """
+    벤치마크 실행
+
+    Args:
+        slide_counts: 측정할 슬라이드 수 목록
+        deck: 합성 덱 크기 {'shapes', 'paragraphs', 'media', 'media_px'} (생략한 값은 기본값)
+        names: 측정 항목 (None이면 전체)
+        repeat: 항목별 반복 횟수
+        base: 병합 기본 양식 (None이면 python-pptx 기본 템플릿)
+        layout: 병합 레이아웃 인덱스
+
+    Returns:
+        {'meta': {...}, 'results': [{'bench', 'slides', 'min', 'median', 'seconds', 'peak_rss_mb'}]}
+    """
+    deck = {**DEFAULT_DECK, **(deck or {})}
+    names = list(names or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f'알 수 없는 측정 항목: {", ".join(unknown)}')
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for slides in slide_counts:
+        case = prepare_case(workdir, slides, deck, base, layout)
+        for name in names:
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                measured = executor.submit(_run_case, name, case, repeat).result()
+            result = {
+                'bench': name,
+                'slides': slides,
+                'min': min(measured['seconds']),
+                'median': round(statistics.median(measured['seconds']), 6),
+                'seconds': measured['seconds'],
+                'peak_rss_mb': measured['peak_rss_mb'],
+            }
+            results.append(result)
+            if verbose:
+                print_result(result)
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'tool_version': TOOL_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat,
+            'deck': deck,
+            'base': os.path.basename(base) if base else 'synthetic',
+        },
+        'results': results,
+    }
+
+
+def print_result(result):
+    rss = f"{result['peak_rss_mb']:8.1f}MB" if result['peak_rss_mb'] is not None else '         -'
+    print(f"{result['bench']:<16} {result['slides']:>6}장  중앙값 {result['median']:9.4f}초 "
+          f"(최소 {result['min']:.4f}초)  최대 RSS {rss}")
+
+
+# ============================================================
+# 결과 비교
+# ============================================================
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    이전 결과와 비교해 회귀 항목 찾기
+
+    (항목, 슬라이드 수)가 같은 결과끼리 중앙값 시간과 최대 RSS를 비교한다.
+
+    Returns:
+        [{'bench', 'slides', 'metric', 'baseline', 'current', 'ratio'}] - 기준 대비
+        (1 + threshold)배를 넘은 항목
+    """
+    previous = {(r['bench'], r['slides']): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = previous.get((result['bench'], result['slides']))
+        if before is None:
+            continue
+        for metric in ('median', 'peak_rss_mb'):
+            if not before.get(metric) or result.get(metric) is None:
+                continue
+            ratio = result[metric] / before[metric]
+            if ratio > 1 + threshold:
+                regressions.append({'bench': result['bench'], 'slides': result['slides'], 'metric': metric,
+                                    'baseline': before[metric], 'current': result[metric],
+                                    'ratio': round(ratio, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='병합/분석/생성 성능 벤치마크 (합성 덱)')
+    parser.add_argument('--slides', default='10,100', help='슬라이드 수 목록 (쉼표 구분, 기본: 10,100)')
+    parser.add_argument('--shapes', type=int, default=DEFAULT_DECK['shapes'], help='슬라이드당 텍스트 상자 수')
+    parser.add_argument('--paragraphs', type=int, default=DEFAULT_DECK['paragraphs'], help='텍스트 상자당 문단 수')
+    parser.add_argument('--media', type=int, default=DEFAULT_DECK['media'], help='덱의 서로 다른 이미지 수')
+    parser.add_argument('--media-px', type=int, default=DEFAULT_DECK['media_px'], help='이미지 폭 (픽셀)')
+    parser.add_argument('--only', help=f'측정 항목 (쉼표 구분: {", ".join(BENCHMARKS)})')
+    parser.add_argument('--repeat', type=int, default=3, help='항목별 반복 횟수 (기본: 3)')
+    parser.add_argument('--base', help='병합 기본 양식 (기본: python-pptx 기본 템플릿)')
+    parser.add_argument('--layout', type=int, default=None, help='병합 레이아웃 인덱스')
+    parser.add_argument('--workdir', default=DEFAULT_WORKDIR, help=f'합성 덱/출력 디렉터리 (기본: {DEFAULT_WORKDIR})')
+    parser.add_argument('--output', help='결과 JSON 저장')
+    parser.add_argument('--compare', metavar='BASELINE', help='이전 결과 JSON과 비교 (회귀가 있으면 종료 코드 1)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'회귀 판정 허용 오차 (기본: {DEFAULT_THRESHOLD} = 20%%)')
+    args = parser.parse_args()
+
+    deck = {'shapes': args.shapes, 'paragraphs': args.paragraphs,
+            'media': args.media, 'media_px': args.media_px}
+    slide_counts = [int(n) for n in args.slides.split(',') if n.strip()]
+    names = [n.strip() for n in args.only.split(',')] if args.only else None
+
+    report = run_benchmarks(slide_counts, deck, names, args.repeat, args.workdir, args.base, args.layout)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n✓ 결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('deck') != report['meta']['deck']:
+            print(f"\n⚠ 합성 덱 설정이 기준과 다릅니다: {baseline['meta'].get('deck')}")
+        regressions = compare_results(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n회귀 {len(regressions)}건 (허용 오차 {args.threshold:.0%}):")
+            for r in regressions:
+                print(f"  ✗ {r['bench']} {r['slides']}장 {r['metric']}: "
+                      f"{r['baseline']} -> {r['current']} ({r['ratio']:.2f}배)")
+            sys.exit(1)
+        print(f"\n✓ 회귀 없음 (기준: {args.compare})")
+
+
+if __name__ == "__main__":
+    main()
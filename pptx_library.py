@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+슬라이드 라이브러리 색인 (여러 템플릿 덱에서 슬라이드 검색)
+
+디렉터리의 PPTX 파일을 훑어 슬라이드별 텍스트 단어, 토큰({{...}}), 레이아웃 이름,
+shape 수, 같은 크기 shape 반복 수(카드형 배치), 배치 지문(geometry)을 SQLite 역색인에
+저장한다. 다시 색인할 때는 크기/수정 시각이 바뀐 파일만 해시를 계산하고, 내용이 바뀐
+덱만 다시 분석한다. 검색은 색인만 읽으므로 덱 수와 무관하게 밀리초 단위로 끝난다.
+
+슬라이드 정보는 템플릿 스냅샷(pptx_snapshot.py)이 유효하면 스냅샷에서, 아니면
+open_analysis + slide_maps/analyze_all_layouts로 읽는다.
+
+사용법:
+    python pptx_library.py --index templates/                 # 색인 생성/갱신 (기본: slide_library.db)
+    python pptx_library.py 타임라인                            # 텍스트 검색 (단어 앞부분 일치, AND)
+    python pptx_library.py 요약 --repeat 4                     # 같은 크기 shape 4개 이상 (4카드 요약 등)
+    python pptx_library.py --token '{{소제목}}' --layout 'Title Only' --shapes 5-12
+    python pptx_library.py --like templates/PPT기본양식_병합.pptx:10   # 같은 배치의 슬라이드
+    python pptx_library.py 일정 --format json --limit 50
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+
+import pptx_package as pkg
+from pptx_merge import TOOL_VERSION, analyze_all_layouts, analyze_pptx, file_sha256, open_analysis
+from pptx_snapshot import load_snapshot, slide_maps
+
+DEFAULT_INDEX = 'slide_library.db'
+
+LIBRARY_FORMAT = 1
+
+# 배치 지문 격자 (슬라이드 가로/세로를 나눈 칸 수 - 이보다 작은 위치 차이는 같은 배치로 봄)
+GEOMETRY_GRID = 24
+
+_WORD = re.compile(r'\w+')
+
+# 한 글자로도 색인하는 문자 (한글 음절 - '값', '안' 같은 단어와 음절 하나로 시작하는 검색어)
+_SYLLABLE = re.compile('[\uac00-\ud7a3]')
+
+# 검색어 앞부분 일치 상한 (UTF-8 바이트 순서에서 가장 큰 문자)
+_MAX_CHAR = '\U0010ffff'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS decks (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER, mtime_ns INTEGER, sha256 TEXT, slide_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS slides (
+    id INTEGER PRIMARY KEY,
+    deck_id INTEGER NOT NULL REFERENCES decks(id) ON DELETE CASCADE,
+    slide_index INTEGER, partname TEXT, layout TEXT, title TEXT,
+    shape_count INTEGER, repeat INTEGER, geometry TEXT, tokens TEXT
+);
+CREATE INDEX IF NOT EXISTS slides_deck ON slides(deck_id);
+CREATE INDEX IF NOT EXISTS slides_geometry ON slides(geometry);
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT NOT NULL,
+    slide_id INTEGER NOT NULL REFERENCES slides(id) ON DELETE CASCADE,
+    PRIMARY KEY (term, slide_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS terms_slide ON terms(slide_id);
+"""
+
+
+# ============================================================
+# 슬라이드 특징
+# ============================================================
+
+def words(text):
+    """색인 단어 (소문자, 2글자 이상 - 한글은 한 음절도 포함)"""
+    return {word for word in _WORD.findall(text.lower()) if len(word) >= 2 or _SYLLABLE.fullmatch(word)}
+
+
+def _grid(value, extent):
+    return round(value * GEOMETRY_GRID / extent) if value is not None and extent else -1
+
+
+def slide_features(slide, slide_width, slide_height):
+    """
+    슬라이드의 검색 특징
+
+    Args:
+        slide: slide_maps() 항목
+        slide_width, slide_height: 슬라이드 크기 (EMU)
+
+    Returns:
+        {'shape_count', 'repeat', 'geometry', 'words'}
+        repeat: 격자 기준 같은 크기 shape의 최대 개수 (4카드 배치면 4 이상)
+        geometry: shape 위치/크기를 격자에 맞춰 정렬한 목록의 해시 (같은 배치 = 같은 값)
+    """
+    boxes = []
+    for shape in slide['shapes']:
+        boxes.append((_grid(shape['x'], slide_width), _grid(shape['y'], slide_height),
+                      _grid(shape['cx'], slide_width), _grid(shape['cy'], slide_height)))
+    sizes = Counter((cx, cy) for _, _, cx, cy in boxes if cx > 0 and cy > 0)
+    text = '\n'.join([slide['name']] + [shape['text'] for shape in slide['shapes']])
+    return {
+        'shape_count': len(boxes),
+        'repeat': max(sizes.values(), default=0),
+        'geometry': hashlib.sha1(json.dumps(sorted(boxes)).encode()).hexdigest()[:16],
+        'words': words(text),
+    }
+
+
+def read_deck(path):
+    """
+    덱의 슬라이드 목록과 레이아웃 이름, 슬라이드 크기 (스냅샷이 유효하면 스냅샷에서)
+
+    Returns:
+        (slide_maps() 결과, {(마스터, 레이아웃): 이름}, 슬라이드 가로, 세로 (EMU))
+    """
+    snapshot = load_snapshot(path)
+    if snapshot is not None:
+        slides, layouts, info = snapshot.slides, snapshot.data['layouts'], snapshot.data['pptx']
+    else:
+        with open_analysis(path) as package:
+            slides = slide_maps(package)
+            layouts = analyze_all_layouts(package, verbose=False)
+            info = analyze_pptx(package, verbose=False)
+    names = {(layout['master_index'], layout['index']): layout['name'] for layout in layouts}
+    return slides, names, info['slide_width'] * pkg.EMU_PER_INCH, info['slide_height'] * pkg.EMU_PER_INCH
+
+
+# ============================================================
+# 색인
+# ============================================================
+
+class SlideLibrary:
+    """
+    슬라이드 라이브러리 색인 (SQLite 파일 하나)
+
+        library = SlideLibrary('slide_library.db')
+        library.update('templates/')
+        library.search(text='타임라인', repeat=4)
+    """
+
+    def __init__(self, index_file=DEFAULT_INDEX):
+        self.index_file = index_file
+        self.db = sqlite3.connect(index_file)
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.executescript(_SCHEMA)
+        version = f'{LIBRARY_FORMAT}:{TOOL_VERSION}:{GEOMETRY_GRID}'
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != version:
+            # 형식/도구 버전이 바뀌면 전체 다시 색인
+            with self.db:
+                self.db.execute('DELETE FROM decks')
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def update(self, root, verbose=True):
+        """
+        디렉터리의 PPTX를 색인에 반영 (바뀐 덱만 다시 분석)
+
+        크기/수정 시각이 같으면 건너뛰고, 다르면 SHA-256이 바뀐 경우에만 다시 분석한다.
+        root 아래에서 사라진 덱은 색인에서 제거한다. 읽을 수 없는 덱은 경고 후 건너뛴다.
+
+        Returns:
+            {'added', 'updated', 'unchanged', 'removed', 'failed', 'slides', 'seconds'}
+        """
+        start = time.perf_counter()
+        root = os.path.abspath(root)
+        stats = dict.fromkeys(('added', 'updated', 'unchanged', 'removed', 'failed', 'slides'), 0)
+        known = {path: (deck_id, size, mtime_ns, sha256) for deck_id, path, size, mtime_ns, sha256 in
+                 self.db.execute('SELECT id, path, size, mtime_ns, sha256 FROM decks')}
+
+        found = set()
+        for path in _find_decks(root):
+            found.add(path)
+            stat = os.stat(path)
+            previous = known.get(path)
+            if previous and previous[1:3] == (stat.st_size, stat.st_mtime_ns):
+                stats['unchanged'] += 1
+                continue
+
+            digest = file_sha256(path)
+            if previous and previous[3] == digest:
+                with self.db:
+                    self.db.execute('UPDATE decks SET size = ?, mtime_ns = ? WHERE id = ?',
+                                    (stat.st_size, stat.st_mtime_ns, previous[0]))
+                stats['unchanged'] += 1
+                continue
+
+            try:
+                count = self._index_deck(path, stat, digest)
+            except Exception as e:
+                print(f"Warning: {path} 색인 실패 ({type(e).__name__}: {e})", file=sys.stderr)
+                stats['failed'] += 1
+                continue
+            stats['updated' if previous else 'added'] += 1
+            stats['slides'] += count
+            if verbose:
+                print(f"  {'갱신' if previous else '추가'}: {os.path.relpath(path, root)} ({count}개 슬라이드)")
+
+        prefix = os.path.join(root, '')
+        removed = [path for path in known if path.startswith(prefix) and path not in found]
+        with self.db:
+            for path in removed:
+                self.db.execute('DELETE FROM decks WHERE path = ?', (path,))
+        stats['removed'] = len(removed)
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+
+        if verbose:
+            print(f"✓ 색인: {self.index_file} (추가 {stats['added']}, 갱신 {stats['updated']}, "
+                  f"변경 없음 {stats['unchanged']}, 제거 {stats['removed']}, 실패 {stats['failed']}, "
+                  f"{stats['seconds']:.2f}초)")
+        return stats
+
+    def _index_deck(self, path, stat, digest):
+        """덱 하나를 (다시) 색인 - 한 트랜잭션으로 이전 항목 교체"""
+        slides, layout_names, width, height = read_deck(path)
+        with self.db:
+            self.db.execute('DELETE FROM decks WHERE path = ?', (path,))
+            deck_id = self.db.execute(
+                'INSERT INTO decks (path, size, mtime_ns, sha256, slide_count) VALUES (?, ?, ?, ?, ?)',
+                (path, stat.st_size, stat.st_mtime_ns, digest, len(slides))).lastrowid
+            for slide in slides:
+                features = slide_features(slide, width, height)
+                layout = layout_names.get(tuple(slide['layout_index'] or ()), '')
+                slide_id = self.db.execute(
+                    'INSERT INTO slides (deck_id, slide_index, partname, layout, title, shape_count, repeat, '
+                    'geometry, tokens) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (deck_id, slide['index'], slide['partname'], layout, slide['title'],
+                     features['shape_count'], features['repeat'], features['geometry'],
+                     json.dumps(slide['tokens'], ensure_ascii=False))).lastrowid
+                terms = {'w:' + word for word in features['words']}
+                terms |= {'t:' + token for token in slide['tokens']}
+                terms.add('l:' + layout.lower())
+                self.db.executemany('INSERT OR IGNORE INTO terms VALUES (?, ?)',
+                                    ((term, slide_id) for term in terms))
+        return len(slides)
+
+    def search(self, text=None, tokens=(), layout=None, shapes=None, repeat=None, geometry=None, like=None,
+               limit=20):
+        """
+        슬라이드 검색 (모든 조건 AND)
+
+        Args:
+            text: 검색어 (공백 구분 단어마다 색인 단어의 앞부분 일치 - 한글은 한 음절부터)
+            tokens: 포함해야 하는 토큰 목록 ('{{소제목}}')
+            layout: 레이아웃 이름 (대소문자 무시, 전체 일치)
+            shapes: shape 수 - 정수 또는 (최소, 최대)
+            repeat: 같은 크기 shape 최소 개수
+            geometry: 배치 지문
+            like: (덱 경로, 슬라이드 인덱스) - 그 슬라이드와 배치 지문이 같은 슬라이드
+            limit: 최대 결과 수
+
+        Returns:
+            [{'deck', 'slide', 'title', 'layout', 'shape_count', 'repeat', 'geometry', 'tokens'}]
+            (slide는 0-based - --select/명세의 template 인덱스와 같음)
+
+        Raises:
+            ValueError: text에 색인 단어(words)가 하나도 없음 (조건 없이 전체가 검색되지 않도록)
+        """
+        terms = words(text or '')
+        if text and text.strip() and not terms:
+            raise ValueError(f'검색어에 색인 단어가 없음 (한글 음절 또는 2글자 이상): {text!r}')
+        conditions, params = [], []
+        for word in terms:
+            conditions.append('s.id IN (SELECT slide_id FROM terms WHERE term >= ? AND term < ?)')
+            params += ['w:' + word, 'w:' + word + _MAX_CHAR]
+        for token in tokens:
+            conditions.append('s.id IN (SELECT slide_id FROM terms WHERE term = ?)')
+            params.append('t:' + token)
+        if layout:
+            conditions.append('s.id IN (SELECT slide_id FROM terms WHERE term = ?)')
+            params.append('l:' + layout.lower())
+        if shapes is not None:
+            low, high = shapes if isinstance(shapes, (tuple, list)) else (shapes, shapes)
+            conditions.append('s.shape_count BETWEEN ? AND ?')
+            params += [low, high]
+        if repeat is not None:
+            conditions.append('s.repeat >= ?')
+            params.append(repeat)
+        if like is not None:
+            row = self.db.execute(
+                'SELECT s.geometry FROM slides s JOIN decks d ON d.id = s.deck_id '
+                'WHERE d.path = ? AND s.slide_index = ?', (os.path.abspath(like[0]), like[1])).fetchone()
+            if row is None:
+                raise ValueError(f'색인에 없는 슬라이드: {like[0]}:{like[1]}')
+            geometry = row[0]
+        if geometry is not None:
+            conditions.append('s.geometry = ?')
+            params.append(geometry)
+
+        sql = ('SELECT d.path, s.slide_index, s.title, s.layout, s.shape_count, s.repeat, s.geometry, s.tokens '
+               'FROM slides s JOIN decks d ON d.id = s.deck_id')
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY d.path, s.slide_index LIMIT ?'
+        return [{'deck': path, 'slide': index, 'title': title, 'layout': layout_name,
+                 'shape_count': shape_count, 'repeat': repeat_count, 'geometry': geometry_hash,
+                 'tokens': json.loads(tokens_json)}
+                for path, index, title, layout_name, shape_count, repeat_count, geometry_hash, tokens_json
+                in self.db.execute(sql, params + [limit])]
+
+    def stats(self):
+        decks, slides = self.db.execute('SELECT COUNT(*), COALESCE(SUM(slide_count), 0) FROM decks').fetchone()
+        return {'decks': decks, 'slides': slides}
+
+
+def _find_decks(root):
+    """root 아래 PPTX 파일 (PowerPoint 잠금 파일 ~$*.pptx 제외, 정렬)"""
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith('.pptx') and not filename.startswith('~$'):
+                yield os.path.join(directory, filename)
+
+
+def _parse_range(value):
+    """'5' -> 5, '5-12' -> (5, 12)"""
+    low, _, high = value.partition('-')
+    return (int(low), int(high)) if high else int(low)
+
+
+def _parse_slide_ref(value):
+    """'덱.pptx:10' -> ('덱.pptx', 10)"""
+    path, _, index = value.rpartition(':')
+    return path, int(index)
+
+
+def print_results(results, elapsed_ms):
+    for result in results:
+        tokens = f"  {', '.join(result['tokens'])}" if result['tokens'] else ''
+        print(f"{result['deck']}:{result['slide']}  [{result['layout']}] shape {result['shape_count']}개, "
+              f"반복 {result['repeat']}  '{result['title'][:40]}'{tokens}")
+    print(f"\n{len(results)}개 ({elapsed_ms:.1f}ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='슬라이드 라이브러리 색인/검색')
+    parser.add_argument('text', nargs='*', help='검색어 (단어 앞부분 일치, 모두 포함)')
+    parser.add_argument('--db', default=DEFAULT_INDEX, help=f'색인 파일 (기본: {DEFAULT_INDEX})')
+    parser.add_argument('--index', metavar='DIR', action='append', help='PPTX 디렉터리 색인/갱신 (여러 번 지정 가능)')
+    parser.add_argument('--token', action='append', default=[], help="포함할 토큰 (예: '{{소제목}}')")
+    parser.add_argument('--layout', help='레이아웃 이름')
+    parser.add_argument('--shapes', type=_parse_range, metavar='N|MIN-MAX', help='shape 수')
+    parser.add_argument('--repeat', type=int, metavar='N', help='같은 크기 shape 최소 개수 (카드형 배치)')
+    parser.add_argument('--geometry', help='배치 지문')
+    parser.add_argument('--like', type=_parse_slide_ref, metavar='DECK:SLIDE',
+                        help='이 슬라이드(0-based)와 배치가 같은 슬라이드')
+    parser.add_argument('--limit', type=int, default=20, help='최대 결과 수 (기본: 20)')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='결과 출력 형식')
+    args = parser.parse_args()
+
+    with SlideLibrary(args.db) as library:
+        for root in args.index or []:
+            library.update(root)
+
+        query = (args.text or args.token or args.layout or args.shapes is not None or args.repeat is not None
+                 or args.geometry or args.like)
+        if not query:
+            if not args.index:
+                stats = library.stats()
+                print(f"{args.db}: 덱 {stats['decks']}개, 슬라이드 {stats['slides']}개")
+            return
+
+        start = time.perf_counter()
+        try:
+            results = library.search(' '.join(args.text), args.token, args.layout, args.shapes, args.repeat,
+                                     args.geometry, args.like, args.limit)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.format == 'json':
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_results(results, elapsed_ms)
+
+
+if __name__ == "__main__":
+    main()
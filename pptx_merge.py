@@ -11,16 +11,59 @@ PPTX 병합 및 LLM 템플릿 변환 스크립트
 
     # 병합 (템플릿 변환 없이)
     python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --layout 8 --no-template
+
+    # 병합 (ZIP 스트리밍 모드 - 객체 모델 없이 파트 단위 처리)
+    python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --layout 8 --stream
+
+    # 저메모리 병합/분석 (대형 덱 - 슬라이드를 한 장씩 iterparse, 최대 메모리가 슬라이드 수와 무관)
+    python pptx_merge.py --base PPT기본양식.pptx --source 대형덱.pptx --output 결과.pptx --low-memory
+
+    # 템플릿 슬라이드 선택 (필요한 파트만 읽어 출력 구성)
+    python pptx_merge.py --base PPT기본양식.pptx --select 0,10,13 --output 결과.pptx
+
+    # 저장 후 크기 최적화 (미사용 레이아웃/마스터 제거, 이미지 축소, XML 재압축 - pptx_optimize.py 참고)
+    python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --optimize
+
+    # 슬라이드별 {{...}} 토큰 목록 (병합하면서 기록 / 임의 덱 검색)
+    python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --tokens tokens.json
+    python pptx_merge.py --scan-tokens 결과.pptx --tokens tokens.json
+
+    # 단계별/슬라이드별 소요 시간 측정 (Chrome trace 저장 - pptx_profile.py 참고)
+    python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --profile-trace merge.trace.json
+
+    # 템플릿 스냅샷 컴파일 (스트리밍/일괄 병합과 덱 생성이 템플릿 대신 스냅샷을 읽음 - pptx_snapshot.py 참고)
+    python pptx_snapshot.py PPT기본양식.pptx PPT기본양식_병합.pptx
+
+    # 일괄 병합 (기본 양식 1회 파싱, 프로세스 풀)
+    python pptx_merge.py --base PPT기본양식.pptx --batch jobs.csv --workers 8
+
+    # 상주 서버 (파싱한 템플릿 캐시 유지, HTTP로 병합/분석/렌더링 - pptx_server.py 참고)
+    python pptx_merge.py --serve 127.0.0.1:8765
 """
 
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TARGET_MODE as RTM
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.opc.package import PartFactory, _Relationship
 from pptx.util import Inches, Pt
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager, nullcontext
 from copy import deepcopy
 from lxml import etree
+import hashlib
 import zipfile
 import re
 import argparse
+import csv
+import json
+import os
 import sys
+import time
+
+import pptx_package as pkg
+from pptx_optimize import DEFAULT_COMPRESS_LEVEL, DEFAULT_DPI, optimize_pptx
+from pptx_profile import NULL_PROFILER, Profiler
 
 # ============================================================
 # 설정 - 필요시 수정
@@ -47,35 +90,252 @@ TEMPLATE_REPLACEMENTS = [
 ]
 
 
+# 템플릿 규칙 파일 (JSON) 예시 - REMOVE_PATTERNS/TEMPLATE_REPLACEMENTS 대신 사용
+# {
+#   "remove": ["우리는 인간생활의 향상과 개선에 필요한[^\\n]*", ...],
+#   "replace": [["소제목/?[ ]*Medium[ ]*14pt", "{{소제목}}"], ...]
+# }
+
+
+# ============================================================
+# 템플릿 변환 엔진
+# ============================================================
+
+# 정리 단계에서 앞/뒤에서 제거되는 문자 ([\s\|\.])
+_CLEANUP_TRAILING = re.compile(r'[\s\|\.]+$')
+_CLEANUP_LEADING = re.compile(r'^[\s\|\.]+')
+_CLEANUP_BLANK_LINES = re.compile(r'\n\s*\n+')
+
+
+# 다른 규칙과 합치면 의미가 바뀌는 그룹 참조 (\1, (?P=이름), (?(1)...)) - 합친 패턴에서는 번호가 밀림
+_GROUP_REFERENCE = re.compile(r'(?<!\\)(?:\\\\)*\\[1-9]|\(\?P=|\(\?\(')
+
+
+def _combinable(pattern):
+    """
+    하나의 alternation으로 합쳐도 단독으로 검색할 때와 일치 여부가 같은 패턴인지
+
+    앵커(^, $)와 전후방 탐색은 위치 기준이므로 그대로 합칠 수 있다. 그룹 참조와
+    전역 인라인 플래그((?s), (?m) 등 - 합친 패턴 전체에 적용됨)가 있으면 합치지 않는다.
+    """
+    return not re.compile(pattern).flags & ~re.UNICODE and not _GROUP_REFERENCE.search(pattern)
+
+
+def _cleanup(text):
+    """변환 결과 정리 (앞/뒤 공백·구분자 제거, 빈 줄 제거)"""
+    # 정리할 것이 없는 일반 문단은 정규식 없이 통과
+    if not text or ('\n' not in text
+                    and not (text[0].isspace() or text[0] in '|.')
+                    and not (text[-1].isspace() or text[-1] in '|.')):
+        return text
+    text = _CLEANUP_TRAILING.sub('', text)
+    text = _CLEANUP_LEADING.sub('', text)
+    text = _CLEANUP_BLANK_LINES.sub('\n', text)
+    return text.strip()
+
+
+class TemplateConverter:
+    """
+    LLM 템플릿 변환 규칙 엔진
+
+    규칙(정규식)은 생성 시 한 번만 컴파일한다. 모든 규칙을 하나의 alternation으로 합친
+    사전 필터로 문단을 한 번 검사해, 일치하는 규칙이 없는 문단(대부분)은 규칙별
+    치환 없이 정리 단계만 거친다. 일치하면 기존과 같은 순서로 규칙을 적용하므로
+    결과는 순차 re.sub와 동일하다. 합칠 수 없는 규칙(_combinable - 그룹 참조, 전역
+    인라인 플래그)이 하나라도 있으면 사전 필터 없이 규칙별로 검사한다.
+    """
+
+    def __init__(self, remove_patterns, replacements):
+        """
+        Args:
+            remove_patterns: 제거할 텍스트 패턴 목록 (대소문자 무시)
+            replacements: (패턴, 치환 문자열) 목록
+        """
+        self.remove_patterns = list(remove_patterns)
+        self.replacements = [tuple(item) for item in replacements]
+        self._remove = [re.compile(p, re.IGNORECASE) for p in self.remove_patterns]
+        self._replace = [(re.compile(p), r) for p, r in self.replacements]
+
+        self._prefilter = None
+        patterns = self.remove_patterns + [p for p, _ in self.replacements]
+        if all(_combinable(p) for p in patterns):
+            branches = [f'(?i:{p})' for p in self.remove_patterns]
+            branches += [f'(?:{p})' for p, _ in self.replacements]
+            branches.append(re.escape('{{소제목}}'))
+            try:
+                self._prefilter = re.compile('|'.join(branches))
+            except re.error:
+                # 이름이 같은 그룹 등으로 합칠 수 없으면 사전 필터 없이 동작
+                pass
+
+    @classmethod
+    def from_file(cls, rules_file):
+        """JSON 규칙 파일에서 생성 ({"remove": [...], "replace": [[패턴, 치환], ...]})"""
+        with open(rules_file, encoding='utf-8') as f:
+            rules = json.load(f)
+        return cls(rules.get('remove', []), rules.get('replace', []))
+
+    def convert(self, text):
+        """텍스트를 LLM 템플릿으로 변환"""
+        if self._prefilter is not None and not self._prefilter.search(text):
+            return _cleanup(text)
+
+        result = text
+
+        # placeholder 문장 제거
+        for pattern in self._remove:
+            result = pattern.sub('', result)
+
+        # 스타일 가이드 -> 템플릿
+        for pattern, replacement in self._replace:
+            result = pattern.sub(replacement, result)
+
+        # 소제목 뒤에 본문 템플릿 추가
+        if '{{소제목}}' in result and '{{본문_내용}}' not in result:
+            result = result.replace('{{소제목}}', '{{소제목}}\n{{본문_내용}}')
+
+        # 정리
+        return _cleanup(result)
+
+
+# 현재 사용 중인 변환 규칙 (import 시 기본 규칙으로 한 번 컴파일)
+_converter = TemplateConverter(REMOVE_PATTERNS, TEMPLATE_REPLACEMENTS)
+
+
+def set_template_rules(remove_patterns, replacements):
+    """변환 규칙 교체 (이후 convert_to_template 호출에 적용)"""
+    global _converter
+    _converter = TemplateConverter(remove_patterns, replacements)
+    return _converter
+
+
+def load_template_rules(rules_file):
+    """JSON 규칙 파일을 읽어 변환 규칙 교체"""
+    global _converter
+    _converter = TemplateConverter.from_file(rules_file)
+    return _converter
+
+
 # ============================================================
 # 핵심 함수
 # ============================================================
 
 def convert_to_template(text):
     """텍스트를 LLM 템플릿으로 변환"""
-    result = text
+    return _converter.convert(text)
+
+
+class PartStore:
+    """
+    슬라이드 복사 시 관계 대상 파트를 대상 프레젠테이션으로 옮기는 저장소 (python-pptx용)
+
+    미디어 파트(/ppt/media/)는 SHA-256 콘텐츠 해시로 키를 잡아 같은 내용은 한 번만
+    패키지에 추가하고, 참조하는 모든 슬라이드가 공유한다. 같은 패키지 안의 미디어는
+    그대로 공유한다. 차트/OLE 등 나머지 파트는 참조하는 슬라이드마다 새로 복사한다.
+    """
 
-    # placeholder 문장 제거
-    for pattern in REMOVE_PATTERNS:
-        result = re.sub(pattern, '', result, flags=re.IGNORECASE)
+    def __init__(self, package):
+        self.package = package
+        self._media = None   # SHA-256 -> 미디어 파트 (첫 사용 시 생성)
 
-    # 스타일 가이드 -> 템플릿
-    for pattern, replacement in TEMPLATE_REPLACEMENTS:
-        result = re.sub(pattern, replacement, result)
+    def get(self, part, _copied=None):
+        """대상 패키지에서 사용할 파트 반환 (필요하면 복사)"""
+        if part.partname.startswith('/' + pkg.MEDIA_PREFIX):
+            if part.package is self.package:
+                return part
+            digest = hashlib.sha256(part.blob).hexdigest()
+            media = self._media_index()
+            if digest not in media:
+                media[digest] = self._new_part(part)
+            return media[digest]
 
-    # 소제목 뒤에 본문 템플릿 추가
-    if '{{소제목}}' in result and '{{본문_내용}}' not in result:
-        result = result.replace('{{소제목}}', '{{소제목}}\n{{본문_내용}}')
+        _copied = {} if _copied is None else _copied
+        if part.partname in _copied:
+            return _copied[part.partname]
+        new_part = _copied[part.partname] = self._new_part(part)
 
-    # 정리
-    result = re.sub(r'[\s\|\.]+$', '', result)
-    result = re.sub(r'^[\s\|\.]+', '', result)
-    result = re.sub(r'\n\s*\n+', '\n', result)
+        # 파트 내용(rId 포함)은 그대로 두고 같은 rId로 관계를 복원
+        for rId, rel in part.rels.items():
+            if rel.is_external:
+                target = rel.target_ref
+            else:
+                target = self.get(rel.target_part, _copied)
+            new_part.rels._rels[rId] = _Relationship(
+                new_part.rels._base_uri, rId, rel.reltype,
+                RTM.EXTERNAL if rel.is_external else RTM.INTERNAL, target)
+        return new_part
 
-    return result.strip()
+    def _media_index(self):
+        if self._media is None:
+            self._media = {}
+            for part in self.package.iter_parts():
+                if part.partname.startswith('/' + pkg.MEDIA_PREFIX):
+                    self._media.setdefault(hashlib.sha256(part.blob).hexdigest(), part)
+        return self._media
 
+    def _new_part(self, part):
+        tmpl = re.sub(r'\d*(\.[^./]*)?$', lambda m: '%d' + (m.group(1) or ''), part.partname, count=1)
+        partname = self.package.next_partname(tmpl)
+        return PartFactory(partname, part.content_type, self.package, part.blob)
 
-def merge_pptx(base_pptx, source_pptx, output_pptx, layout_index=None, apply_template=True):
+
+def copy_shapes(source_slide, dest_slide, part_store=None, stats=None):
+    """
+    원본 슬라이드의 shape를 대상 슬라이드로 복사 (관계 포함)
+
+    shape가 r:embed/r:id 등으로 참조하는 이미지/차트/OLE 파트도 함께 옮기고
+    복사된 요소의 rId를 대상 슬라이드 기준으로 다시 매핑한다.
+
+    Args:
+        source_slide: 원본 슬라이드 (다른 프레젠테이션이어도 됨)
+        dest_slide: 대상 슬라이드
+        part_store: 여러 슬라이드가 공유할 PartStore (None이면 새로 생성)
+        stats: dict를 넘기면 복사한 shape/요소 수와 deepcopy(관계 매핑 포함)/삽입 시간(ms)을
+               'shapes', 'elements', 'deepcopy_ms', 'insert_ms'에 누적
+    """
+    if part_store is None:
+        part_store = PartStore(dest_slide.part.package)
+    source_part, dest_part = source_slide.part, dest_slide.part
+    same_package = source_part.package is dest_part.package
+    rid_map = {}
+
+    for shape in source_slide.shapes:
+        if stats is not None:
+            start = time.perf_counter()
+        new_el = deepcopy(shape.element)
+        elements = 0
+        for elem in new_el.iter(etree.Element):
+            elements += 1
+            for attr, value in list(elem.attrib.items()):
+                if not attr.startswith(pkg.R_ATTR_PREFIX):
+                    continue
+                if value not in rid_map:
+                    rel = source_part.rels.get(value)
+                    if rel is None:
+                        rid_map[value] = None
+                    elif rel.is_external:
+                        rid_map[value] = dest_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+                    elif rel.reltype in pkg.SLIDE_LOCAL_RELTYPES:
+                        # 같은 덱 안의 슬라이드 링크 등은 유지, 다른 덱이면 버림
+                        rid_map[value] = dest_part.relate_to(rel.target_part, rel.reltype) if same_package else None
+                    else:
+                        rid_map[value] = dest_part.relate_to(part_store.get(rel.target_part), rel.reltype)
+                if rid_map[value] is None:
+                    del elem.attrib[attr]
+                else:
+                    elem.set(attr, rid_map[value])
+        if stats is not None:
+            copied = time.perf_counter()
+        dest_slide.shapes._spTree.insert_element_before(new_el, 'p:extLst')
+        if stats is not None:
+            stats['shapes'] = stats.get('shapes', 0) + 1
+            stats['elements'] = stats.get('elements', 0) + elements
+            stats['deepcopy_ms'] = stats.get('deepcopy_ms', 0) + (copied - start) * 1000
+            stats['insert_ms'] = stats.get('insert_ms', 0) + (time.perf_counter() - copied) * 1000
+
+
+def merge_pptx(base_pptx, source_pptx, output_pptx, layout_index=None, apply_template=True, workers=None,
+               profiler=None, token_manifest=None):
     """
     PPTX 파일 병합
 
@@ -85,9 +345,18 @@ def merge_pptx(base_pptx, source_pptx, output_pptx, layout_index=None, apply_tem
         output_pptx: 출력 파일
         layout_index: 레이아웃 인덱스 (None이면 빈 레이아웃)
         apply_template: LLM 템플릿 변환 적용 여부
+        workers: 템플릿 변환 병렬 worker 수 (None이면 순차 변환,
+                 template_edits_parallel 참고 - 결과는 순차 변환과 동일)
+        profiler: 단계별 시간 측정기 (pptx_profile.Profiler, None이면 측정 안 함)
+        token_manifest: 추가한 슬라이드별 토큰 목록을 저장할 JSON 파일 (write_token_manifest 형식,
+                        토큰은 변환하면서 수집)
     """
-    prs_base = Presentation(base_pptx)
-    prs_source = Presentation(source_pptx)
+    profiler = profiler or NULL_PROFILER
+    with profiler.phase('open_base'):
+        prs_base = Presentation(base_pptx)
+    with profiler.phase('open_source') as info:
+        prs_source = Presentation(source_pptx)
+        info['slides'] = len(prs_source.slides)
 
     # 레이아웃 선택
     if layout_index is not None:
@@ -106,153 +375,1271 @@ def merge_pptx(base_pptx, source_pptx, output_pptx, layout_index=None, apply_tem
     print()
 
     # 슬라이드 복사
-    for idx, slide in enumerate(prs_source.slides):
-        new_slide = prs_base.slides.add_slide(target_layout)
+    part_store = PartStore(prs_base.part.package)
+    new_slides = []
+    for idx, slide in enumerate(prs_source.slides, 1):
+        with profiler.phase('add_slide', idx):
+            new_slide = prs_base.slides.add_slide(target_layout)
 
         # 레이아웃의 기본 placeholder 제거
-        for shape in list(new_slide.shapes):
-            if shape.is_placeholder:
-                shape._element.getparent().remove(shape._element)
-
-        # 원본 shape 복사
-        for shape in slide.shapes:
-            new_el = deepcopy(shape.element)
-            new_slide.shapes._spTree.insert_element_before(new_el, 'p:extLst')
-
-        # 템플릿 변환
-        if apply_template:
-            for shape in new_slide.shapes:
-                if hasattr(shape, 'text_frame'):
+        with profiler.phase('remove_placeholders', idx) as info:
+            info['removed'] = 0
+            for shape in list(new_slide.shapes):
+                if shape.is_placeholder:
+                    shape._element.getparent().remove(shape._element)
+                    info['removed'] += 1
+
+        # 원본 shape 복사 (이미지/차트 등 관계 포함, 미디어는 콘텐츠 해시로 공유)
+        with profiler.phase('copy_shapes', idx) as info:
+            copy_shapes(slide, new_slide, part_store, info if profiler.enabled else None)
+        new_slides.append(new_slide)
+
+    # 템플릿 변환 (병렬 모드는 슬라이드 XML을 worker에서 변환하고 순서대로 적용)
+    # 변환하면서 슬라이드별 토큰을 수집한다 (변환 대상이 아닌 표/그룹 등은 a:t 텍스트에서)
+    slide_tokens = [[] for _ in new_slides]
+    if apply_template and workers is not None:
+        with profiler.phase('template_parallel', workers=workers) as info:
+            slide_xmls = [etree.tostring(new_slide._element) for new_slide in new_slides]
+            results = template_edits_parallel(slide_xmls, workers)
+            for new_slide, tokens, (edits, found) in zip(new_slides, slide_tokens, results):
+                apply_template_edits(new_slide._element, edits)
+                tokens.extend(found)
+                info['converted'] = info.get('converted', 0) + len(edits)
+    elif apply_template:
+        for idx, (new_slide, tokens) in enumerate(zip(new_slides, slide_tokens), 1):
+            with profiler.phase('template_convert', idx) as info:
+                info['paragraphs'] = info['converted'] = 0
+                for shape in new_slide.shapes:
+                    if shape._element.tag != _P_SP:
+                        paragraph_tokens_xml(shape._element, tokens)
+                        continue
+                    if shape._element.find('p:txBody', pkg.NS) is None:
+                        # shape.text_frame(hasattr 포함)은 빈 txBody를 추가하므로 접근하지 않음
+                        # (template_edits_xml과 같은 결과)
+                        continue
                     for para in shape.text_frame.paragraphs:
                         full_text = ''.join(run.text for run in para.runs)
                         converted = convert_to_template(full_text)
+                        _add_tokens(converted, tokens)
+                        info['paragraphs'] += 1
                         if full_text != converted and para.runs:
+                            info['converted'] += 1
                             para.runs[0].text = converted
                             for run in para.runs[1:]:
                                 run.text = ''
+    else:
+        for idx, (new_slide, tokens) in enumerate(zip(new_slides, slide_tokens), 1):
+            with profiler.phase('template_scan', idx):
+                paragraph_tokens_xml(new_slide._element, tokens)
 
-        # 사용된 템플릿 확인
-        templates = set(re.findall(r'\{\{[^}]+\}\}',
-                        ' '.join(s.text for s in new_slide.shapes if hasattr(s, 'text'))))
-        template_str = ', '.join(sorted(templates)) if templates else '-'
+    token_slides = []
+    for idx, (new_slide, tokens) in enumerate(zip(new_slides, slide_tokens)):
+        tokens = unique_tokens(tokens)
+        token_slides.append({'slide': len(prs_base.slides) - len(new_slides) + idx + 1, 'source_slide': idx + 1,
+                             'partname': new_slide.part.partname.lstrip('/'), 'tokens': tokens})
+        template_str = ', '.join(sorted(tokens)) if tokens else '-'
         print(f"슬라이드 {idx + 1}: {template_str}")
 
-    prs_base.save(output_pptx)
+    with profiler.phase('save') as info:
+        prs_base.save(output_pptx)
+        info['bytes'] = _written_bytes(output_pptx)
     print(f"\n✓ 완료: {output_pptx} (총 {len(prs_base.slides)}개 슬라이드)")
 
+    if token_manifest:
+        write_token_manifest(token_manifest, output_pptx if isinstance(output_pptx, str) else None, token_slides)
+
     return prs_base
 
 
-def analyze_pptx(pptx_file):
-    """PPTX 파일 분석"""
-    prs = Presentation(pptx_file)
+def _written_bytes(output):
+    """기록한 출력 크기 (파일 경로 또는 파일 객체의 현재 위치)"""
+    return os.path.getsize(output) if isinstance(output, str) else output.tell()
+
+
+def template_edits_xml(sld, tokens=None):
+    """
+    슬라이드 XML에서 템플릿 변환으로 바뀌는 문단 목록 (XML은 수정하지 않음)
+
+    merge_pptx의 템플릿 변환과 동일하게 spTree 최상위 p:sp의 문단만 대상으로 한다.
+
+    Args:
+        tokens: 리스트를 넘기면 변환 후 슬라이드에 남는 {{...}} 토큰을 문서 순서대로 추가
+                (변환한 문단은 변환 결과에서, 변환 대상이 아닌 표/그룹 등은 a:t 텍스트에서
+                수집 - 변환 후 슬라이드를 다시 검색할 필요 없음)
+
+    Returns:
+        [(p:sp 순번, 문단 순번, 변환된 텍스트)]
+    """
+    edits = []
+    sp_index = -1
+    for shape in sld.iterfind('p:cSld/p:spTree/*', pkg.NS):
+        if shape.tag != _P_SP:
+            if tokens is not None and shape.tag in pkg.SHAPE_TAGS:
+                paragraph_tokens_xml(shape, tokens)
+            continue
+        sp_index += 1
+        for para_index, para in enumerate(shape.iterfind('p:txBody/a:p', pkg.NS)):
+            runs = para.findall('a:r', pkg.NS)
+            if not runs:
+                continue
+            full_text = ''.join(run.findtext('a:t', '', pkg.NS) for run in runs)
+            converted = convert_to_template(full_text)
+            if full_text != converted:
+                edits.append((sp_index, para_index, converted))
+            if tokens is not None:
+                _add_tokens(converted, tokens)
+    return edits
+
+
+def apply_template_edits(sld, edits):
+    """template_edits_xml() 결과 적용 - 문단의 첫 run에 변환 텍스트, 나머지 run은 빈 문자열"""
+    if not edits:
+        return
+    sps = sld.findall('p:cSld/p:spTree/p:sp', pkg.NS)
+    for sp_index, para_index, converted in edits:
+        para = sps[sp_index].findall('p:txBody/a:p', pkg.NS)[para_index]
+        runs = para.findall('a:r', pkg.NS)
+        for run, text in zip(runs, [converted] + [''] * (len(runs) - 1)):
+            t = run.find('a:t', pkg.NS)
+            if t is None:
+                t = etree.SubElement(run, pkg.qn('a:t'))
+            t.text = text
+
+
+def apply_template_xml(sld):
+    """슬라이드 XML에 LLM 템플릿 변환 적용 (python-pptx 객체 없이 lxml 수준)"""
+    apply_template_edits(sld, template_edits_xml(sld))
+
+
+def _template_edits_worker(xml):
+    tokens = []
+    edits = template_edits_xml(pkg.parse_xml(xml), tokens)
+    return edits, tokens
+
+
+def _init_template_worker(rules):
+    set_template_rules(*rules)
+
+
+def template_edits_parallel(slide_xmls, workers):
+    """
+    여러 슬라이드의 템플릿 변환을 병렬 계산 (슬라이드 순서대로 결과 반환)
+
+    슬라이드 XML 바이트를 프로세스 풀에 나눠 template_edits_xml()을 실행한다 (토큰 수집 포함).
+    GIL이 없는 빌드(free-threaded)에서는 스레드 풀을 사용한다. 결과는 입력 순서를
+    그대로 따르므로 적용 결과는 순차 변환과 같다.
+
+    Args:
+        slide_xmls: 슬라이드 XML 바이트 목록
+        workers: worker 수 (None이면 CPU 수)
+
+    Returns:
+        슬라이드별 (template_edits_xml() 결과, 변환 후 토큰 목록)
+    """
+    if not slide_xmls:
+        return []
+    rules = (_converter.remove_patterns, _converter.replacements)
+    workers = min(workers or os.cpu_count() or 1, len(slide_xmls))
+    chunksize = max(1, len(slide_xmls) // (workers * 4))
+    if getattr(sys, '_is_gil_enabled', lambda: True)():
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_template_worker,
+                                       initargs=(rules,))
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    with executor:
+        return list(executor.map(_template_edits_worker, slide_xmls, chunksize=chunksize))
+
+
+# ============================================================
+# 템플릿 토큰 목록
+# ============================================================
+
+# LLM 템플릿 토큰 ({{소제목}} 등)
+TOKEN_PATTERN = re.compile(r'\{\{[^}]+\}\}')
+
+_P_SP = pkg.qn('p:sp')
+_A_P = pkg.qn('a:p')
+_A_T = pkg.qn('a:t')
+
+
+def _add_tokens(text, tokens):
+    """텍스트의 토큰을 tokens에 추가 (토큰이 없는 대부분의 문단은 정규식 없이 통과)"""
+    if '{{' in text:
+        tokens.extend(TOKEN_PATTERN.findall(text))
+
+
+def paragraph_tokens_xml(root, tokens):
+    """root 아래 모든 문단(a:p)의 토큰을 tokens에 추가 (문단의 a:t를 이어 붙여 run 경계에 걸친 토큰 포함)"""
+    for para in root.iter(_A_P):
+        _add_tokens(''.join(t.text or '' for t in para.iter(_A_T)), tokens)
+
+
+def unique_tokens(tokens):
+    """중복을 제거한 토큰 목록 (처음 나온 순서 유지)"""
+    return list(dict.fromkeys(tokens))
+
+
+def slide_tokens_xml(sld):
+    """슬라이드 XML의 토큰 목록 (표/그룹 포함 모든 shape, 문서 순서, 중복 제거)"""
+    tokens = []
+    paragraph_tokens_xml(sld, tokens)
+    return unique_tokens(tokens)
+
+
+def scan_tokens(pptx_file):
+    """
+    덱의 슬라이드별 토큰 목록 (python-pptx 객체 없이 iterparse로 a:p/a:t만 처리)
+
+    슬라이드 XML을 스트리밍으로 읽고 처리한 문단은 바로 비워 큰 덱에서도 메모리 사용이
+    슬라이드 하나의 일부 수준으로 유지된다.
+
+    Returns:
+        [{'slide', 'partname', 'tokens'}] (slide는 1-based)
+    """
+    slides = []
+    with zipfile.ZipFile(pptx_file, 'r') as zf:
+        for number, partname in enumerate(pkg.slide_partnames(zf), 1):
+            tokens = []
+            texts = []
+            with zf.open(partname) as f:
+                for _, elem in etree.iterparse(f, events=('end',), tag=(_A_T, _A_P)):
+                    if elem.tag == _A_T:
+                        texts.append(elem.text or '')
+                    else:
+                        _add_tokens(''.join(texts), tokens)
+                        texts.clear()
+                        elem.clear(keep_tail=True)
+            slides.append({'slide': number, 'partname': partname, 'tokens': unique_tokens(tokens)})
+    return slides
+
+
+def write_token_manifest(path, pptx_file, slides):
+    """
+    토큰 목록 파일 저장 (LLM 채우기 단계 입력)
+
+    형식: {"file": PPTX 경로, "slides": [{"slide", "partname", "tokens", ...}]}
+    """
+    tmp_file = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'file': pptx_file, 'slides': slides}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, path)
+    return path
+
+
+def load_base(base_pptx):
+    """
+    스트리밍 병합용 기본 양식 정보 읽기
+
+    presentation.xml/rels/[Content_Types].xml, 레이아웃 목록, 미디어 해시를 한 번만
+    읽어 두고 여러 병합에 재사용한다 (pickle 가능 - 일괄 병합 worker로 전달).
+    유효한 템플릿 스냅샷(pptx_snapshot.py)이 있으면 미디어를 다시 해시하지 않고 스냅샷에서 읽는다.
+    """
+    from pptx_snapshot import load_snapshot
+    snapshot = load_snapshot(base_pptx)
+    if snapshot is not None:
+        return snapshot.base_info()
+
+    with zipfile.ZipFile(base_pptx, 'r') as zbase:
+        pres_name = pkg.main_document_partname(zbase)
+        layouts = pkg.layout_partnames(zbase, pkg.master_partnames(zbase, pres_name)[0])
+        return {
+            'path': base_pptx,
+            'pres_name': pres_name,
+            'pres_xml': zbase.read(pres_name),
+            'pres_rels': pkg.read_rels(zbase, pres_name),
+            'content_types': zbase.read(pkg.CONTENT_TYPES),
+            'slides': pkg.slide_partnames(zbase, pres_name),
+            'layouts': layouts,
+            'layout_names': [pkg.part_name(zbase, layout) for layout in layouts],
+            'names': zbase.namelist(),
+            'media': {name: pkg.member_digest(zbase, name)
+                      for name in zbase.namelist() if name.startswith(pkg.MEDIA_PREFIX)},
+        }
+
+
+def merge_pptx_stream(base_pptx, source_pptx, output_pptx, layout_index=None, apply_template=True, base=None,
+                      verbose=True, progress=None, incremental=False, workers=None, profiler=None,
+                      token_manifest=None, low_memory=False):
+    """
+    PPTX 파일 병합 (ZIP 스트리밍 모드)
+
+    Presentation()으로 두 파일을 모두 로드하지 않고 OPC 패키지를 직접 다룬다.
+    미디어/마스터/테마 등 변경되지 않는 파트는 원본 ZIP에서 그대로 스트리밍 복사하고,
+    슬라이드 XML, rels, [Content_Types].xml, presentation.xml만 파싱/재작성한다.
+    소스 슬라이드는 한 장씩 처리 후 바로 출력 ZIP에 기록한다.
+    슬라이드가 참조하는 이미지/차트/OLE 파트도 함께 복사하며, 미디어는 SHA-256
+    콘텐츠 해시로 중복을 제거해 한 번만 기록한다.
+
+    Args:
+        merge_pptx와 동일
+        output_pptx: 출력 파일 경로 또는 쓰기 가능한 파일 객체 (예: io.BytesIO)
+        base: load_base() 결과 (None이면 base_pptx에서 새로 읽음)
+        verbose: 진행 내용 출력 여부
+        progress: 슬라이드를 기록할 때마다 {'slide', 'total', 'templates'}로 호출되는 함수
+                  (예외를 던지면 병합이 그 자리에서 중단된다)
+        incremental: 증분 병합 - 출력 옆에 슬라이드별 지문(<출력>.slides.json)을 저장하고,
+                     다시 실행할 때 지문이 같은 소스 슬라이드는 이전 출력의 변환 결과를
+                     그대로 재사용한다 (output_pptx가 파일 경로일 때만 적용)
+        workers: 템플릿 변환 병렬 worker 수 (None이면 순차 변환, 결과는 동일)
+        profiler: 단계별 시간 측정기 (pptx_profile.Profiler, None이면 측정 안 함)
+        token_manifest: 추가한 슬라이드별 토큰 목록을 저장할 JSON 파일 (merge_pptx와 동일)
+        low_memory: 저메모리 모드 - 소스 슬라이드를 iterparse로 읽으면서 shape가 아닌 요소를
+                    바로 버리고, 모든 슬라이드 XML을 미리 읽는 병렬 변환은 사용하지 않는다
+                    (workers 무시). 최대 메모리가 슬라이드 수와 무관하게 가장 큰 슬라이드
+                    하나 수준으로 유지된다 (결과는 기본 모드와 동일)
+
+    Returns:
+        슬라이드별 사용된 템플릿 목록 (정렬된 리스트의 리스트)
+    """
+    profiler = profiler or NULL_PROFILER
+    if base is None:
+        with profiler.phase('open_base'):
+            base = load_base(base_pptx)
+
+    incremental = incremental and isinstance(output_pptx, str)
+    previous = None
+    if incremental:
+        manifest_key = _merge_manifest_key(base, layout_index, apply_template)
+        previous = _load_merge_manifest(output_pptx, manifest_key)
+
+    with zipfile.ZipFile(base['path'], 'r') as zbase, zipfile.ZipFile(source_pptx, 'r') as zsrc:
+        pres_name = base['pres_name']
+        pres = pkg.parse_xml(base['pres_xml'])
+        pres_rels = [dict(rel) for rel in base['pres_rels']]
+        content_types = pkg.parse_xml(base['content_types'])
+
+        base_slides = base['slides']
+        source_slides = pkg.slide_partnames(zsrc)
+
+        # 레이아웃 선택 (prs.slide_layouts와 동일하게 첫 번째 마스터 기준)
+        layouts = base['layouts']
+        if layout_index is not None:
+            target_layout = layouts[layout_index]
+        else:
+            # 빈 레이아웃 찾기
+            target_layout = layouts[6] if len(layouts) > 6 else layouts[-1]
+        layout_name = dict(zip(layouts, base['layout_names']))[target_layout]
+
+        # 증분 병합: 지문이 같은 슬라이드는 이전 출력에서 재사용
+        fingerprints = []
+        if incremental:
+            with profiler.phase('fingerprint', slides=len(source_slides)):
+                fingerprints = [pkg.part_fingerprint(zsrc, name) for name in source_slides]
+        # 지문이 같은 슬라이드가 여러 장이면 이전 항목을 순서대로 한 번씩만 사용
+        # (차트/OLE 등 슬라이드별 파트를 두 슬라이드가 공유하지 않도록 - 전체 병합과 동일)
+        reusable = {}
+        for entry in previous['slides'] if previous else []:
+            reusable.setdefault(entry['fingerprint'], []).append(entry)
+        reused = ([reusable[fp].pop(0) if reusable.get(fp) else None for fp in fingerprints]
+                  if incremental else [None] * len(source_slides))
+        reused_parts = {name for entry in reused if entry for name in entry['parts']}
+
+        # 병렬 템플릿 변환: 변환할 슬라이드의 변경 내용을 미리 계산해 두고 순서대로 적용
+        template_edits = {}
+        if apply_template and workers is not None and not low_memory:
+            pending = [i for i, entry in enumerate(reused) if entry is None]
+            with profiler.phase('template_parallel', workers=workers, slides=len(pending)):
+                results = template_edits_parallel([zsrc.read(source_slides[i]) for i in pending], workers)
+            template_edits = dict(zip(pending, results))
+
+        if verbose:
+            print(f"기본 양식: {len(base_slides)}개 슬라이드")
+            print(f"추가 대상: {len(source_slides)}개 슬라이드")
+            print(f"레이아웃: [{layout_index}] '{layout_name}'")
+            print(f"템플릿 변환: {'활성화' if apply_template else '비활성화'}")
+            if incremental:
+                reused_count = sum(1 for entry in reused if entry)
+                print(f"증분 병합: 재사용 {reused_count}개, 변환 {len(source_slides) - reused_count}개")
+            print()
+
+        # 새 슬라이드 파트 이름/ID 할당
+        used_numbers = [int(m.group(1)) for m in
+                        (re.fullmatch(r'ppt/slides/slide(\d+)\.xml', n) for n in base['names']) if m]
+        next_number = max(used_numbers, default=0) + 1
+        sld_id_lst = pkg.slide_id_list(pres)
+        next_id = max((int(s.get('id')) for s in sld_id_lst), default=255) + 1
+
+        new_slides = []
+        for offset in range(len(source_slides)):
+            partname = f'ppt/slides/slide{next_number + offset}.xml'
+            rel_id = pkg.next_rel_id(pres_rels)
+            pres_rels.append({'id': rel_id, 'type': pkg.RT_SLIDE, 'external': False,
+                              'target': pkg.relative_target(pres_name, partname)})
+            sld_id = etree.SubElement(sld_id_lst, pkg.qn('p:sldId'))
+            sld_id.set('id', str(next_id + offset))
+            sld_id.set(pkg.qn('r:id'), rel_id)
+            pkg.add_override(content_types, partname, pkg.CT_SLIDE)
+            new_slides.append(partname)
+
+        rewritten = {
+            pres_name: pkg.serialize_xml(pres),
+            pkg.rels_name(pres_name): pkg.rels_xml(pres_rels),
+        }
+
+        # 증분 병합은 이전 출력을 읽으면서 쓰므로 임시 파일에 기록 후 교체
+        write_to = f'{output_pptx}.{os.getpid()}.tmp' if incremental else output_pptx
+        try:
+            with zipfile.ZipFile(write_to, 'w', zipfile.ZIP_DEFLATED) as zout, \
+                    (zipfile.ZipFile(output_pptx, 'r') if previous else nullcontext()) as zold:
+                names = set(base['names']) | set(new_slides) | {pkg.rels_name(n) for n in new_slides}
+                names |= reused_parts | {pkg.rels_name(n) for n in reused_parts}
+                store = pkg.ZipPartStore(zout, content_types, names)
+                for name, digest in base['media'].items():
+                    store.add_media(name, digest)
+
+                # 재사용 슬라이드가 참조하는 파트(미디어/차트 등)는 이전 출력의 이름 그대로 복사
+                if reused_parts:
+                    with profiler.phase('copy_reused', parts=len(reused_parts)):
+                        for name in sorted(reused_parts):
+                            store.copy_existing(zold, name)
+                for entry in reused:
+                    for name, digest in (entry['media'] if entry else {}).items():
+                        store.add_media(name, digest)
+
+                with profiler.phase('copy_base') as stat:
+                    stat['members'] = stat['bytes'] = 0
+                    for info in zbase.infolist():
+                        if info.filename == pkg.CONTENT_TYPES:
+                            continue
+                        if info.filename in rewritten:
+                            pkg.write_member(zout, info.filename, rewritten[info.filename])
+                            stat['bytes'] += len(rewritten[info.filename])
+                        else:
+                            pkg.copy_member(zbase, info, zout)
+                            stat['bytes'] += info.file_size
+                        stat['members'] += 1
+
+                # 슬라이드 복사 (한 장씩 파싱 -> 변환 -> 기록)
+                slide_templates = []
+                slide_tokens = []
+                for idx, (src_name, partname) in enumerate(zip(source_slides, new_slides)):
+                    entry = reused[idx]
+                    slide_no = idx + 1
+                    if entry is not None:
+                        # 변경 없는 슬라이드 - 이전 변환 결과 재사용 (rels 대상도 같은 이름으로 복사됨)
+                        with profiler.phase('reuse', slide_no) as stat:
+                            stat['bytes'] = 0
+                            for old_name, new_name in ((entry['partname'], partname),
+                                                       (pkg.rels_name(entry['partname']), pkg.rels_name(partname))):
+                                info = zold.getinfo(old_name)
+                                pkg.copy_member(zold, info, zout, name=new_name)
+                                stat['bytes'] += info.file_size
+                        tokens = entry['tokens']
+                    else:
+                        with profiler.phase('parse', slide_no) as stat:
+                            if low_memory:
+                                sld = pkg.parse_slide_shapes(zsrc, src_name)
+                            else:
+                                sld = pkg.strip_to_shapes(pkg.parse_xml(zsrc.read(src_name)))
+                            stat['bytes_in'] = zsrc.getinfo(src_name).file_size
+
+                        # 템플릿 변환 (변환하면서 토큰 수집, 변환하지 않으면 a:t 텍스트만 검색)
+                        tokens = []
+                        if apply_template:
+                            with profiler.phase('template_convert', slide_no) as stat:
+                                if idx in template_edits:
+                                    edits, tokens = template_edits[idx]
+                                else:
+                                    edits = template_edits_xml(sld, tokens)
+                                apply_template_edits(sld, edits)
+                                stat['converted'] = len(edits)
+                        else:
+                            with profiler.phase('template_scan', slide_no):
+                                paragraph_tokens_xml(sld, tokens)
+                        tokens = unique_tokens(tokens)
+
+                        # 이미지/차트/OLE 등 관계 복사 (미디어는 콘텐츠 해시로 공유)
+                        with profiler.phase('copy_relationships', slide_no) as stat:
+                            slide_rels = [{'id': 'rId1', 'type': pkg.RT_SLIDE_LAYOUT, 'external': False,
+                                           'target': pkg.relative_target(partname, target_layout)}]
+                            store.copy_relationships(zsrc, src_name, sld, partname, slide_rels)
+                            stat['rels'] = len(slide_rels) - 1
+
+                        with profiler.phase('write', slide_no) as stat:
+                            xml = pkg.serialize_xml(sld)
+                            rels = pkg.rels_xml(slide_rels)
+                            pkg.write_member(zout, partname, xml)
+                            pkg.write_member(zout, pkg.rels_name(partname), rels)
+                            stat['bytes'] = len(xml) + len(rels)
+
+                    templates = sorted(tokens)
+                    if verbose:
+                        template_str = ', '.join(templates) if templates else '-'
+                        reuse_str = ' (재사용)' if entry is not None else ''
+                        print(f"슬라이드 {idx + 1}: {template_str}{reuse_str}")
+                    slide_templates.append(templates)
+                    slide_tokens.append(tokens)
+                    if progress is not None:
+                        progress({'slide': idx + 1, 'total': len(new_slides), 'templates': templates})
+
+                # 복사한 파트의 타입까지 반영된 [Content_Types].xml은 마지막에 기록
+                pkg.write_member(zout, pkg.CONTENT_TYPES, pkg.serialize_xml(content_types))
+        except BaseException:
+            if incremental and os.path.exists(write_to):
+                os.remove(write_to)
+            raise
+
+    if incremental:
+        os.replace(write_to, output_pptx)
+        with profiler.phase('save_manifest'):
+            _save_merge_manifest(output_pptx, manifest_key, base, new_slides, fingerprints, slide_tokens,
+                                 {name: digest for digest, name in store.media.items()})
+
+    if token_manifest:
+        write_token_manifest(token_manifest, output_pptx if isinstance(output_pptx, str) else None, [
+            {'slide': len(base_slides) + idx + 1, 'source_slide': idx + 1, 'partname': partname, 'tokens': tokens}
+            for idx, (partname, tokens) in enumerate(zip(new_slides, slide_tokens))])
+
+    if verbose:
+        print(f"\n✓ 완료: {output_pptx} (총 {len(base_slides) + len(new_slides)}개 슬라이드)")
+
+    return slide_templates
+
+
+# 증분 병합 지문 파일 (<출력>.slides.json)
+MERGE_MANIFEST_SUFFIX = '.slides.json'
+
+
+def _merge_manifest_key(base, layout_index, apply_template):
+    """증분 병합 결과를 재사용할 수 있는 조건 (하나라도 다르면 전체 다시 변환)"""
+    rules = json.dumps([_converter.remove_patterns, _converter.replacements], ensure_ascii=False)
+    return {
+        'tool_version': TOOL_VERSION,
+        'base': file_sha256(base['path']),
+        'layout': layout_index,
+        'template': apply_template,
+        'rules': hashlib.sha256(rules.encode('utf-8')).hexdigest() if apply_template else None,
+    }
+
+
+def _load_merge_manifest(output_pptx, key):
+    """이전 증분 병합의 슬라이드 지문 (없거나 조건이 다르면 None)"""
+    try:
+        with open(output_pptx + MERGE_MANIFEST_SUFFIX, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('key') != key or not os.path.exists(output_pptx):
+        return None
+    return manifest
+
+
+def _save_merge_manifest(output_pptx, key, base, new_slides, fingerprints, slide_tokens, media_digests):
+    """
+    슬라이드별 지문과 재사용 정보 저장
+
+    슬라이드마다 출력 파트 이름, 토큰 목록, 슬라이드가 참조하는 (기본 양식에 없는) 파트와
+    그 중 미디어의 콘텐츠 해시를 기록한다.
+    """
+    base_names = set(base['names'])
+    slides = []
+    with zipfile.ZipFile(output_pptx, 'r') as zout:
+        for partname, fingerprint, tokens in zip(new_slides, fingerprints, slide_tokens):
+            parts = pkg.reachable_parts(zout, partname, exclude=base_names)
+            slides.append({
+                'fingerprint': fingerprint,
+                'partname': partname,
+                'tokens': tokens,
+                'parts': sorted(parts),
+                'media': {name: media_digests[name] for name in sorted(parts) if name in media_digests},
+            })
+
+    manifest_file = output_pptx + MERGE_MANIFEST_SUFFIX
+    tmp_file = f'{manifest_file}.{os.getpid()}.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'key': key, 'slides': slides}, f, ensure_ascii=False)
+    os.replace(tmp_file, manifest_file)
+
+
+# ============================================================
+# 슬라이드 선택 빌드
+# ============================================================
+
+# 섹션(PowerPoint 2010+) 확장 URI - 선택 빌드에서는 원본 섹션 구성이 의미 없으므로 제거
+_SECTION_EXT_URI = '{521415D9-36F7-43E2-AB2F-B90AF26B5E84}'
+
+
+def select_slides(template_pptx, indices, output, all_layouts=False, verbose=True):
+    """
+    템플릿에서 지정한 슬라이드만으로 새 PPTX 구성 (ZIP 스트리밍 모드)
+
+    템플릿 전체를 Presentation()으로 로드해 슬라이드를 복제한 뒤 원본을 삭제하는 대신,
+    선택한 슬라이드와 그 슬라이드가 참조하는 레이아웃/마스터/테마/미디어만 읽어 출력을
+    만든다. 작업량이 템플릿 크기가 아니라 출력 크기에 비례한다.
+
+    - 같은 인덱스를 여러 번 지정하면 슬라이드가 그만큼 복제된다 (차트 등은 슬라이드마다
+      복사, 미디어는 콘텐츠 해시로 공유).
+    - 슬라이드 노트, 슬라이드 간 링크, 사용자 지정 쇼/섹션 정보는 가져오지 않는다.
+    - all_layouts=False이면 선택한 슬라이드가 쓰지 않는 레이아웃/마스터도 제외되므로
+      출력의 slide_layouts 인덱스가 템플릿과 달라질 수 있다.
+
+    Args:
+        template_pptx: 템플릿 파일
+        indices: 출력에 넣을 템플릿 슬라이드 인덱스 (0-based, 출력 순서)
+        output: 출력 파일 경로 또는 쓰기 가능한 파일 객체 (예: io.BytesIO)
+        all_layouts: 모든 레이아웃/마스터 유지 여부
+        verbose: 진행 내용 출력 여부
+
+    Returns:
+        출력 슬라이드별 원본 템플릿 슬라이드 파트 이름
+    """
+    indices = list(indices)
+    with zipfile.ZipFile(template_pptx, 'r') as zin:
+        pres_name = pkg.main_document_partname(zin)
+        pres = pkg.parse_xml(zin.read(pres_name))
+        pres_rels = pkg.read_rels(zin, pres_name)
+        ct_map = pkg.content_type_map(zin)
+
+        targets = {rel['id']: pkg.resolve_target(pres_name, rel['target'])
+                   for rel in pres_rels if not rel['external']}
+        template_slides = [targets[sld.get(pkg.qn('r:id'))]
+                           for sld in pres.iterfind('p:sldIdLst/p:sldId', pkg.NS)]
+        selected = [template_slides[i] for i in indices]
+
+        # 선택한 슬라이드가 사용하는 레이아웃과 그 마스터
+        slide_rels = {name: pkg.read_rels(zin, name) for name in set(selected)}
+        layouts = {pkg.resolve_target(name, rel['target'])
+                   for name, rels in slide_rels.items()
+                   for rel in rels if rel['type'] == pkg.RT_SLIDE_LAYOUT}
+        masters = {master for layout in layouts
+                   for master in pkg.rel_targets(zin, layout, pkg.RT_SLIDE_MASTER).values()}
+
+        def keep_rel(partname, rel):
+            if partname == pres_name:
+                return rel['type'] != pkg.RT_SLIDE and (
+                    all_layouts or rel['type'] != pkg.RT_SLIDE_MASTER
+                    or pkg.resolve_target(partname, rel['target']) in masters)
+            if partname in masters and not all_layouts:
+                return rel['type'] != pkg.RT_SLIDE_LAYOUT or \
+                    pkg.resolve_target(partname, rel['target']) in layouts
+            return True
+
+        # 패키지 루트에서 도달 가능한 슬라이드 외 파트 (관계 그래프 순회)
+        parts = pkg.walk_parts(zin, keep_rel)    # 파트 이름 -> 유지할 관계 목록
 
+        # presentation.xml: 슬라이드 목록 재구성, 제외된 마스터 제거
+        kept_ids = {rel['id'] for rel in parts[pres_name]}
+        for master_id in pres.findall('p:sldMasterIdLst/p:sldMasterId', pkg.NS):
+            if master_id.get(pkg.qn('r:id')) not in kept_ids:
+                master_id.getparent().remove(master_id)
+        for elem in pres.findall('p:custShowLst', pkg.NS):
+            pres.remove(elem)
+        for ext in pres.findall('p:extLst/p:ext', pkg.NS):
+            if ext.get('uri') == _SECTION_EXT_URI:
+                ext.getparent().remove(ext)
+
+        sld_id_lst = pkg.slide_id_list(pres)
+        for sld_id in list(sld_id_lst):
+            sld_id_lst.remove(sld_id)
+
+        new_slides = []
+        for offset in range(len(selected)):
+            partname = f'ppt/slides/slide{offset + 1}.xml'
+            rel_id = pkg.next_rel_id(parts[pres_name])
+            parts[pres_name].append({'id': rel_id, 'type': pkg.RT_SLIDE, 'external': False,
+                                     'target': pkg.relative_target(pres_name, partname)})
+            sld_id = etree.SubElement(sld_id_lst, pkg.qn('p:sldId'))
+            sld_id.set('id', str(256 + offset))
+            sld_id.set(pkg.qn('r:id'), rel_id)
+            new_slides.append(partname)
+
+        rewritten = {pres_name: pres}
+        if not all_layouts:
+            for master in masters:
+                master_xml = pkg.parse_xml(zin.read(master))
+                kept_ids = {rel['id'] for rel in parts[master]}
+                for layout_id in master_xml.findall('p:sldLayoutIdLst/p:sldLayoutId', pkg.NS):
+                    if layout_id.get(pkg.qn('r:id')) not in kept_ids:
+                        layout_id.getparent().remove(layout_id)
+                rewritten[master] = master_xml
+
+        # [Content_Types].xml: Default는 유지, Override는 기록하는 파트만
+        content_types = pkg.parse_xml(zin.read(pkg.CONTENT_TYPES))
+        for override in content_types.findall('ct:Override', pkg.NS):
+            content_types.remove(override)
+        for partname in parts:
+            if partname in ct_map['overrides']:
+                pkg.add_override(content_types, partname, ct_map['overrides'][partname])
+        for partname in new_slides:
+            pkg.add_override(content_types, partname, pkg.CT_SLIDE)
+
+        if verbose:
+            print(f"템플릿: {len(template_slides)}개 슬라이드")
+            print(f"선택: {len(selected)}개 슬라이드 "
+                  f"(레이아웃 {'전체' if all_layouts else f'{len(layouts)}개'}, "
+                  f"마스터 {'전체' if all_layouts else f'{len(masters)}개'})")
+            print()
+
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zout:
+            names = set(parts) | {pkg.rels_name(n) for n in parts}
+            names |= set(new_slides) | {pkg.rels_name(n) for n in new_slides}
+            store = pkg.ZipPartStore(zout, content_types, names)
+
+            pkg.write_member(zout, '_rels/.rels', pkg.rels_xml(pkg.read_rels(zin, None)))
+            for partname, rels in parts.items():
+                if partname in rewritten:
+                    pkg.write_member(zout, partname, pkg.serialize_xml(rewritten[partname]))
+                else:
+                    pkg.copy_member(zin, zin.getinfo(partname), zout)
+                    if partname.startswith(pkg.MEDIA_PREFIX):
+                        store.add_media(partname, pkg.member_digest(zin, partname))
+                if rels:
+                    pkg.write_member(zout, pkg.rels_name(partname), pkg.rels_xml(rels))
+
+            # 슬라이드 복사 (레이아웃 관계는 그대로, 나머지 관계는 대상 파트까지 복사)
+            for idx, (src_name, partname) in enumerate(zip(selected, new_slides)):
+                sld = pkg.parse_xml(zin.read(src_name))
+                rels = [rel for rel in slide_rels[src_name] if rel['type'] == pkg.RT_SLIDE_LAYOUT]
+                store.copy_relationships(zin, src_name, sld, partname, rels)
+
+                pkg.write_member(zout, partname, pkg.serialize_xml(sld))
+                pkg.write_member(zout, pkg.rels_name(partname), pkg.rels_xml(rels))
+                if verbose:
+                    print(f"슬라이드 {idx + 1}: 템플릿 슬라이드 {indices[idx] + 1}")
+
+            pkg.write_member(zout, pkg.CONTENT_TYPES, pkg.serialize_xml(content_types))
+
+    if verbose:
+        print(f"\n✓ 완료: {output if isinstance(output, str) else '(스트림)'} "
+              f"(총 {len(new_slides)}개 슬라이드)")
+
+    return selected
+
+
+# ============================================================
+# 일괄 병합
+# ============================================================
+
+def read_manifest(manifest_file):
+    """
+    일괄 병합 매니페스트 읽기
+
+    JSON: [{"source": ..., "output": ..., "layout": 8}, ...]
+    CSV:  source,output,layout 헤더 (layout은 비워 두면 빈 레이아웃)
+
+    Returns:
+        [{'source', 'output', 'layout'}] 작업 목록
+    """
+    with open(manifest_file, encoding='utf-8-sig', newline='') as f:
+        if manifest_file.lower().endswith('.json'):
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(f))
+
+    jobs = []
+    for row in rows:
+        layout = row.get('layout')
+        jobs.append({
+            'source': row['source'],
+            'output': row['output'],
+            'layout': int(layout) if layout not in (None, '') else None,
+        })
+    return jobs
+
+
+# worker 프로세스별 기본 양식 정보 (initializer에서 한 번만 설정)
+_batch_base = None
+_batch_apply_template = True
+
+
+def _init_batch_worker(base, apply_template, rules):
+    global _batch_base, _batch_apply_template
+    _batch_base = base
+    _batch_apply_template = apply_template
+    set_template_rules(*rules)
+
+
+def _run_batch_job(job):
+    """일괄 병합 작업 하나 실행 (실패해도 예외 대신 결과로 보고)"""
+    result = dict(job, ok=False, seconds=0.0, slides=0, error=None)
+    start = time.perf_counter()
+    try:
+        templates = merge_pptx_stream(_batch_base['path'], job['source'], job['output'],
+                                      job['layout'], _batch_apply_template, base=_batch_base,
+                                      verbose=False)
+        result['ok'] = True
+        result['slides'] = len(templates)
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def _run_batch_pool(jobs, indices, workers, initargs, report):
+    """
+    jobs[i] (i in indices)를 프로세스 풀에서 실행하고 끝나는 대로 report(i, 결과) 호출
+
+    Returns:
+        worker 프로세스가 비정상 종료되어(메모리 부족, segfault 등) 결과를 받지 못한 작업 인덱스
+    """
+    lost = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=initargs) as executor:
+        futures = {executor.submit(_run_batch_job, jobs[i]): i for i in indices}
+        for future in as_completed(futures):
+            try:
+                report(futures[future], future.result())
+            except BrokenProcessPool:
+                lost.append(futures[future])
+    return sorted(lost)
+
+
+def merge_batch(base_pptx, jobs, workers=None, apply_template=True):
+    """
+    여러 소스 덱을 하나의 기본 양식에 일괄 병합 (스트리밍 모드, 프로세스 풀)
+
+    기본 양식은 한 번만 읽어(load_base) 각 worker에 전달하고, 작업별 소요 시간과
+    실패를 기록한다. 한 작업이 실패해도 나머지 작업은 계속 진행한다. worker 프로세스가
+    비정상 종료되면 결과를 받지 못한 작업을 새 풀에서 다시 실행하고, 그래도 종료되면
+    작업마다 따로 실행해 종료시킨 작업만 실패로 기록한다.
+
+    Args:
+        base_pptx: 기본 양식
+        jobs: read_manifest() 형식의 작업 목록
+        workers: worker 프로세스 수 (None이면 CPU 수)
+        apply_template: LLM 템플릿 변환 적용 여부
+
+    Returns:
+        작업 순서대로 [{'source', 'output', 'layout', 'ok', 'seconds', 'slides', 'error'}]
+    """
+    start = time.perf_counter()
+    base = load_base(base_pptx)
+
+    print(f"기본 양식: {base_pptx} ({len(base['slides'])}개 슬라이드)")
+    print(f"작업: {len(jobs)}개")
+    print()
+
+    results = [None] * len(jobs)
+    initargs = (base, apply_template, (_converter.remove_patterns, _converter.replacements))
+
+    def report(index, result):
+        results[index] = result
+        done = sum(1 for r in results if r is not None)
+        if result['ok']:
+            print(f"[{done}/{len(jobs)}] ✓ {result['source']} -> {result['output']} "
+                  f"({result['slides']}개 슬라이드, {result['seconds']:.2f}초)")
+        else:
+            print(f"[{done}/{len(jobs)}] ✗ {result['source']}: {result['error']}")
+
+    lost = _run_batch_pool(jobs, range(len(jobs)), workers, initargs, report)
+    if lost:
+        print(f"  worker 프로세스 비정상 종료 - 작업 {len(lost)}개 다시 실행")
+        lost = _run_batch_pool(jobs, lost, workers, initargs, report)
+    for i in lost:
+        # 다시 종료되면 작업마다 따로 실행해 원인 작업 확인
+        if _run_batch_pool(jobs, [i], 1, initargs, report):
+            report(i, dict(jobs[i], ok=False, seconds=0.0, slides=0,
+                           error='BrokenProcessPool: worker 프로세스가 비정상 종료됨 (메모리 부족, segfault 등)'))
+
+    failed = sum(1 for r in results if not r['ok'])
+    print(f"\n✓ 완료: 성공 {len(jobs) - failed}개, 실패 {failed}개 "
+          f"({time.perf_counter() - start:.2f}초)")
+
+    return results
+
+
+# ============================================================
+# 분석
+# ============================================================
+
+# 레이아웃 placeholder가 위치/크기를 상속하는 마스터 placeholder 유형 (python-pptx와 동일)
+_BASE_PLACEHOLDER_TYPE = {
+    'body': 'body', 'chart': 'body', 'clipArt': 'body', 'ctrTitle': 'title',
+    'dgm': 'body', 'dt': 'dt', 'ftr': 'ftr', 'media': 'body', 'obj': 'body',
+    'pic': 'body', 'sldNum': 'sldNum', 'subTitle': 'body', 'tbl': 'body', 'title': 'title',
+}
+
+
+def open_analysis(pptx_file, low_memory=False):
+    """
+    분석 컨텍스트 열기
+
+    파일을 한 번만 열고 파트는 처음 사용할 때 한 번만 파싱한다.
+    analyze_pptx/analyze_layout/analyze_theme에 경로 대신 넘기면 같은 파싱 결과를 공유한다.
+    low_memory=True이면 파싱한 파트를 캐시하지 않고 스트림에서 한 파트씩 파싱해
+    사용 후 바로 해제한다 (분석 결과는 동일).
+    """
+    return pkg.LazyPackage(pptx_file, cache=not low_memory)
+
+
+@contextmanager
+def _analysis(pptx_file, low_memory=False):
+    """경로 또는 분석 컨텍스트를 받아 분석 컨텍스트로 사용"""
+    if isinstance(pptx_file, pkg.LazyPackage):
+        yield pptx_file
+    else:
+        with open_analysis(pptx_file, low_memory) as package:
+            yield package
+
+
+def _inches(emu):
+    return emu / pkg.EMU_PER_INCH if emu is not None else None
+
+
+def _fmt_inches(value):
+    """인치 값 출력 (위치/크기를 알 수 없으면 '-')"""
+    return f'{value:.2f}"' if value is not None else '-'
+
+
+def _layout_placeholders(package, master_partname, layout_partname):
+    """레이아웃 placeholder 목록 (마스터에서 상속되는 위치/크기 반영)"""
+    master_geometry = {}
+    for shape in pkg.iter_shape_elms(package.sp_tree(master_partname)):
+        ph = pkg.shape_ph(shape)
+        if ph is not None:
+            master_geometry.setdefault(ph.get('type', 'obj'), pkg.shape_xfrm(shape))
+
+    placeholders = []
+    for shape in pkg.iter_shape_elms(package.sp_tree(layout_partname)):
+        ph = pkg.shape_ph(shape)
+        if ph is None:
+            continue
+        ph_type = ph.get('type', 'obj')
+        geometry = pkg.shape_xfrm(shape)
+        if shape.tag == pkg.qn('p:sp'):
+            base = master_geometry.get(_BASE_PLACEHOLDER_TYPE.get(ph_type), {})
+            geometry = {k: v if v is not None else base.get(k) for k, v in geometry.items()}
+        text = pkg.shape_text(shape) if shape.tag == pkg.qn('p:sp') else ''
+        placeholders.append({
+            'idx': int(ph.get('idx', 0)),
+            'type': str(PP_PLACEHOLDER.from_xml(ph_type)).replace("PLACEHOLDER_", ""),
+            'top': _inches(geometry['y']),
+            'left': _inches(geometry['x']),
+            'width': _inches(geometry['cx']),
+            'height': _inches(geometry['cy']),
+            'text': text[:40] if text else ""
+        })
+    return placeholders
+
+
+def analyze_pptx(pptx_file, verbose=True, low_memory=False):
+    """
+    PPTX 파일 분석
+
+    Args:
+        pptx_file: 경로 또는 open_analysis() 결과
+        verbose: 분석 결과 출력 여부
+        low_memory: 경로로 열 때 저메모리 모드 사용 (open_analysis 참고)
+
+    Returns:
+        {'file', 'slide_width', 'slide_height', 'slide_count', 'master_count',
+         'masters': [{'index', 'layouts': [{'index', 'name', 'placeholder_count'}]}]}
+    """
+    with _analysis(pptx_file, low_memory) as package:
+        sld_sz = package.presentation.find('p:sldSz', pkg.NS)
+        masters = []
+        for master_index, master in enumerate(package.master_partnames()):
+            layouts = []
+            for idx, layout in enumerate(package.layout_partnames(master)):
+                layouts.append({
+                    'index': idx,
+                    'name': package.part_name(layout),
+                    'placeholder_count': sum(1 for shape in pkg.iter_shape_elms(package.sp_tree(layout))
+                                             if pkg.shape_ph(shape) is not None),
+                })
+            masters.append({'index': master_index, 'layouts': layouts})
+
+        info = {
+            'file': package.path,
+            'slide_width': int(sld_sz.get('cx')) / pkg.EMU_PER_INCH,
+            'slide_height': int(sld_sz.get('cy')) / pkg.EMU_PER_INCH,
+            'slide_count': len(package.slide_partnames()),
+            'master_count': len(masters),
+            'masters': masters,
+        }
+
+    if verbose:
+        print_pptx_info(info)
+    return info
+
+
+def print_pptx_info(info):
+    """analyze_pptx 결과 출력"""
     print("=" * 60)
-    print(f"파일: {pptx_file}")
+    print(f"파일: {info['file']}")
     print("=" * 60)
-    print(f"\n슬라이드 크기: {prs.slide_width.inches:.2f}\" x {prs.slide_height.inches:.2f}\"")
-    print(f"슬라이드 수: {len(prs.slides)}")
-    print(f"슬라이드 마스터 수: {len(prs.slide_masters)}")
+    print(f"\n슬라이드 크기: {info['slide_width']:.2f}\" x {info['slide_height']:.2f}\"")
+    print(f"슬라이드 수: {info['slide_count']}")
+    print(f"슬라이드 마스터 수: {info['master_count']}")
 
     # 레이아웃 목록
-    for master in prs.slide_masters:
-        print(f"\n슬라이드 레이아웃 ({len(master.slide_layouts)}개):")
+    for master in info['masters']:
+        print(f"\n슬라이드 레이아웃 ({len(master['layouts'])}개):")
         print("-" * 50)
-        for idx, layout in enumerate(master.slide_layouts):
-            ph_count = len(list(layout.placeholders))
-            print(f"  [{idx:2d}] '{layout.name}' (placeholder: {ph_count}개)")
+        for layout in master['layouts']:
+            print(f"  [{layout['index']:2d}] '{layout['name']}' (placeholder: {layout['placeholder_count']}개)")
 
-    return prs
 
+def analyze_layout(pptx_file, layout_index, master_index=0, verbose=True):
+    """
+    특정 레이아웃의 placeholder 상세 분석
 
-def analyze_layout(pptx_file, layout_index):
-    """특정 레이아웃의 placeholder 상세 분석"""
-    prs = Presentation(pptx_file)
-    layout = prs.slide_layouts[layout_index]
+    Args:
+        pptx_file: 경로 또는 open_analysis() 결과
+        layout_index: 레이아웃 인덱스
+        master_index: 슬라이드 마스터 인덱스
+        verbose: 분석 결과 출력 여부
 
-    print("=" * 60)
-    print(f"레이아웃 [{layout_index}]: '{layout.name}'")
-    print("=" * 60)
+    Returns:
+        {'master_index', 'index', 'name',
+         'placeholders': [{'idx', 'type', 'top', 'left', 'width', 'height', 'text'}]} (위치 기준 정렬)
+    """
+    with _analysis(pptx_file) as package:
+        master = package.master_partnames()[master_index]
+        try:
+            layout = package.layout_partnames(master)[layout_index]
+        except IndexError:
+            raise IndexError("slide layout index out of range")
 
-    placeholders = []
-    for ph in layout.placeholders:
-        placeholders.append({
-            'idx': ph.placeholder_format.idx,
-            'type': str(ph.placeholder_format.type).replace("PLACEHOLDER_", ""),
-            'top': ph.top.inches,
-            'left': ph.left.inches,
-            'width': ph.width.inches,
-            'height': ph.height.inches,
-            'text': ph.text_frame.text[:40] if hasattr(ph, 'text_frame') and ph.text_frame.text else ""
-        })
+        placeholders = _layout_placeholders(package, master, layout)
+
+        # 위치(top) 기준 정렬
+        placeholders.sort(key=lambda x: (x['top'] is None, x['top'] or 0))
+
+        info = {
+            'master_index': master_index,
+            'index': layout_index,
+            'name': package.part_name(layout),
+            'placeholders': placeholders,
+        }
 
-    # 위치(top) 기준 정렬
-    placeholders.sort(key=lambda x: x['top'])
+    if verbose:
+        print_layout_info(info)
+    return info
+
+
+def print_layout_info(info):
+    """analyze_layout 결과 출력"""
+    print("=" * 60)
+    print(f"레이아웃 [{info['index']}]: '{info['name']}'")
+    print("=" * 60)
 
+    placeholders = info['placeholders']
     print(f"\nPlaceholder ({len(placeholders)}개):")
     print("-" * 50)
     for ph in placeholders:
         print(f"\n[{ph['idx']:2d}] {ph['type']}")
-        print(f"    위치: Y={ph['top']:.2f}\", X={ph['left']:.2f}\"")
-        print(f"    크기: {ph['width']:.2f}\" x {ph['height']:.2f}\"")
+        print(f"    위치: Y={_fmt_inches(ph['top'])}, X={_fmt_inches(ph['left'])}")
+        print(f"    크기: {_fmt_inches(ph['width'])} x {_fmt_inches(ph['height'])}")
         if ph['text']:
             print(f"    기본텍스트: '{ph['text']}'")
 
 
-def analyze_theme(pptx_file):
-    """테마 색상 및 폰트 분석"""
-    print("=" * 60)
-    print("테마 분석")
-    print("=" * 60)
+def analyze_all_layouts(pptx_file, verbose=True):
+    """
+    모든 마스터의 모든 레이아웃 placeholder 상세 분석 (한 번 열어 한 번에 처리)
+
+    Returns:
+        analyze_layout 결과 리스트 (마스터, 레이아웃 순)
+    """
+    with _analysis(pptx_file) as package:
+        layouts = []
+        for master_index, master in enumerate(package.master_partnames()):
+            for layout_index in range(len(package.layout_partnames(master))):
+                layouts.append(analyze_layout(package, layout_index, master_index, verbose=False))
+
+    if verbose:
+        print_all_layouts(layouts)
+    return layouts
+
+
+def print_all_layouts(layouts):
+    """analyze_all_layouts 결과 출력"""
+    multi_master = len({layout['master_index'] for layout in layouts}) > 1
+    current_master = None
+    for layout in layouts:
+        if multi_master and layout['master_index'] != current_master:
+            current_master = layout['master_index']
+            print(f"\n[슬라이드 마스터 {current_master}]")
+        print()
+        print_layout_info(layout)
+
+
+# 테마 색상 슬롯 표시 이름
+THEME_COLOR_NAMES = {
+    'dk1': '어두운색1 (텍스트)', 'lt1': '밝은색1 (배경)',
+    'dk2': '어두운색2', 'lt2': '밝은색2',
+    'accent1': '강조색1', 'accent2': '강조색2',
+    'accent3': '강조색3', 'accent4': '강조색4',
+    'accent5': '강조색5', 'accent6': '강조색6',
+    'hlink': '하이퍼링크', 'folHlink': '방문한 링크',
+}
 
-    with zipfile.ZipFile(pptx_file, 'r') as z:
-        theme_files = [f for f in z.namelist() if 'theme1.xml' in f]
+
+def analyze_theme(pptx_file, verbose=True):
+    """
+    테마 색상 및 폰트 분석
+
+    Args:
+        pptx_file: 경로 또는 open_analysis() 결과
+        verbose: 분석 결과 출력 여부
+
+    Returns:
+        테마 파트별 [{'part', 'color_scheme': {'name', 'colors': [{'slot', 'label', 'value'}]},
+                      'font_scheme': {'name', 'fonts': [{'slot', 'label', 'latin', 'ea'}]}}]
+        (스키마가 없으면 None)
+    """
+    themes = []
+    with _analysis(pptx_file) as package:
+        theme_files = [f for f in package.namelist() if 'theme1.xml' in f]
 
         for theme_file in theme_files:
-            theme_xml = z.read(theme_file)
-            root = etree.fromstring(theme_xml)
+            root = package.xml(theme_file)
 
             nsmap = {'a': 'http://schemas.openxmlformats.org/drawingml/2006/main'}
+            theme = {'part': theme_file, 'color_scheme': None, 'font_scheme': None}
 
             # 색상 스키마
             clrScheme = root.find('.//a:clrScheme', nsmap)
             if clrScheme is not None:
-                print(f"\n[색상 스키마: {clrScheme.get('name', 'Unknown')}]")
-
-                color_names = {
-                    'dk1': '어두운색1 (텍스트)', 'lt1': '밝은색1 (배경)',
-                    'dk2': '어두운색2', 'lt2': '밝은색2',
-                    'accent1': '강조색1', 'accent2': '강조색2',
-                    'accent3': '강조색3', 'accent4': '강조색4',
-                    'accent5': '강조색5', 'accent6': '강조색6',
-                    'hlink': '하이퍼링크', 'folHlink': '방문한 링크',
-                }
-
+                colors = []
                 for elem in clrScheme:
                     tag = elem.tag.split('}')[-1]
-                    if tag in color_names:
+                    if tag in THEME_COLOR_NAMES:
                         srgb = elem.find('.//a:srgbClr', nsmap)
                         sysclr = elem.find('.//a:sysClr', nsmap)
                         if srgb is not None:
-                            print(f"  {color_names[tag]}: #{srgb.get('val')}")
+                            value = srgb.get('val')
                         elif sysclr is not None:
-                            print(f"  {color_names[tag]}: #{sysclr.get('lastClr', 'N/A')}")
+                            value = sysclr.get('lastClr', 'N/A')
+                        else:
+                            continue
+                        colors.append({'slot': tag, 'label': THEME_COLOR_NAMES[tag], 'value': value})
+                theme['color_scheme'] = {'name': clrScheme.get('name', 'Unknown'), 'colors': colors}
 
             # 폰트 스키마
             fontScheme = root.find('.//a:fontScheme', nsmap)
             if fontScheme is not None:
-                print(f"\n[폰트 스키마: {fontScheme.get('name', 'Unknown')}]")
-
+                fonts = []
                 for font_type, label in [('majorFont', '제목'), ('minorFont', '본문')]:
                     font = fontScheme.find(f'.//a:{font_type}', nsmap)
                     if font is not None:
                         latin = font.find('a:latin', nsmap)
                         ea = font.find('a:ea', nsmap)
-                        print(f"  {label}:")
-                        if latin is not None:
-                            print(f"    - 라틴: {latin.get('typeface')}")
-                        if ea is not None and ea.get('typeface'):
-                            print(f"    - 동아시아: {ea.get('typeface')}")
+                        fonts.append({
+                            'slot': font_type,
+                            'label': label,
+                            'latin': latin.get('typeface') if latin is not None else None,
+                            'ea': ea.get('typeface') if ea is not None else None,
+                        })
+                theme['font_scheme'] = {'name': fontScheme.get('name', 'Unknown'), 'fonts': fonts}
+
+            themes.append(theme)
+
+    if verbose:
+        print_theme_info(themes)
+    return themes
+
+
+def print_theme_info(themes):
+    """analyze_theme 결과 출력"""
+    print("=" * 60)
+    print("테마 분석")
+    print("=" * 60)
+
+    for theme in themes:
+        if theme['color_scheme'] is not None:
+            print(f"\n[색상 스키마: {theme['color_scheme']['name']}]")
+            for color in theme['color_scheme']['colors']:
+                print(f"  {color['label']}: #{color['value']}")
+
+        if theme['font_scheme'] is not None:
+            print(f"\n[폰트 스키마: {theme['font_scheme']['name']}]")
+            for font in theme['font_scheme']['fonts']:
+                print(f"  {font['label']}:")
+                if font['latin'] is not None:
+                    print(f"    - 라틴: {font['latin']}")
+                if font['ea']:
+                    print(f"    - 동아시아: {font['ea']}")
+
+
+# ============================================================
+# 분석 결과 캐시
+# ============================================================
+
+# 분석 결과 형식이 바뀌면 올린다 (이전 버전 캐시는 자동으로 무시됨)
+TOOL_VERSION = '2'
+
+ANALYSIS_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'gendoc', 'analysis')
+
+
+def file_sha256(path):
+    """파일 내용의 SHA-256 hex"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(pkg.COPY_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _cache_file(digest, options):
+    key = hashlib.sha256(json.dumps([digest, TOOL_VERSION, options], sort_keys=True).encode()).hexdigest()
+    return os.path.join(ANALYSIS_CACHE_DIR, key[:2], key + '.json')
+
+
+def analyze_report(pptx_file, layout_index=None, all_layouts=False, theme=False, use_cache=True,
+                   low_memory=False):
+    """
+    분석 결과를 하나의 구조화된 보고서로 생성 (파일 해시 기반 디스크 캐시 사용)
+
+    캐시 키는 입력 파일의 SHA-256, TOOL_VERSION, 분석 옵션이다. 같은 템플릿을 다시
+    분석하면 파일을 열지 않고 캐시에서 바로 반환한다.
+    low_memory는 파트 파싱 방식만 바꾸므로 캐시 키에 포함하지 않는다 (open_analysis 참고).
+
+    Returns:
+        {'file', 'sha256', 'tool_version', 'pptx', 'layout', 'all_layouts', 'theme'}
+        (요청하지 않은 항목은 None)
+    """
+    digest = file_sha256(pptx_file)
+    options = {'layout': layout_index, 'all_layouts': all_layouts, 'theme': theme}
+    cache_file = _cache_file(digest, options)
+
+    if use_cache:
+        try:
+            with open(cache_file, encoding='utf-8') as f:
+                report = json.load(f)
+            report['file'] = report['pptx']['file'] = pptx_file
+            return report
+        except (OSError, ValueError, KeyError):
+            pass
+
+    with open_analysis(pptx_file, low_memory) as package:
+        report = {
+            'file': pptx_file,
+            'sha256': digest,
+            'tool_version': TOOL_VERSION,
+            'pptx': analyze_pptx(package, verbose=False),
+            'layout': analyze_layout(package, layout_index, verbose=False) if layout_index is not None else None,
+            'all_layouts': analyze_all_layouts(package, verbose=False) if all_layouts else None,
+            'theme': analyze_theme(package, verbose=False) if theme else None,
+        }
+
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"Warning: 분석 캐시 저장 실패 ({e})", file=sys.stderr)
+
+    return report
+
+
+def print_report(report):
+    """analyze_report 결과를 텍스트로 출력"""
+    print_pptx_info(report['pptx'])
+    if report['layout'] is not None:
+        print()
+        print_layout_info(report['layout'])
+    if report['all_layouts'] is not None:
+        print_all_layouts(report['all_layouts'])
+    if report['theme'] is not None:
+        print()
+        print_theme_info(report['theme'])
 
 
 # ============================================================
@@ -274,17 +1661,58 @@ def main():
   # 테마 분석
   python pptx_merge.py --analyze PPT기본양식.pptx --theme
 
+  # 모든 레이아웃 상세 분석 + 테마 (파일은 한 번만 열림)
+  python pptx_merge.py --analyze PPT기본양식.pptx --all-layouts --theme
+
+  # 분석 결과 JSON 출력 (결과는 파일 해시 기준으로 ~/.cache/gendoc에 캐시)
+  python pptx_merge.py --analyze PPT기본양식.pptx --layout 8 --theme --format json
+
   # 병합 (템플릿 변환 포함)
   python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --layout 8
 
   # 병합 (템플릿 변환 없이)
   python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --no-template
+
+  # 병합 (ZIP 스트리밍 모드 - 대용량/대량 병합용)
+  python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --layout 8 --stream
+
+  # 템플릿에서 슬라이드 선택 (0-based, 중복 지정 시 복제 - 필요한 파트만 읽어 출력 구성)
+  python pptx_merge.py --base PPT기본양식.pptx --select 0,10,13,10 --output 결과.pptx
+
+  # 저장 후 크기 최적화 (미사용 레이아웃/마스터 제거, 150dpi 초과 이미지 축소, XML 재압축)
+  python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --optimize --dpi 150
+
+  # 추가한 슬라이드별 토큰 목록 저장 (변환하면서 수집 - LLM 채우기 단계 입력)
+  python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --tokens tokens.json
+
+  # 임의 덱의 슬라이드별 토큰 목록 (a:t만 스트리밍 검색, --tokens 없으면 화면 출력)
+  python pptx_merge.py --scan-tokens 결과.pptx --tokens tokens.json
+
+  # 단계별 소요 시간 요약 + Chrome trace (chrome://tracing, Perfetto, speedscope에서 열기)
+  python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --profile --profile-trace merge.trace.json
+
+  # 저메모리 병합 (1,000장 이상 대형 덱 - 슬라이드를 한 장씩 iterparse, 미디어는 청크 단위 복사)
+  python pptx_merge.py --base PPT기본양식.pptx --source 대형덱.pptx --output 결과.pptx --low-memory
+
+  # 증분 병합 (바뀐 슬라이드만 다시 변환 - 템플릿 편집 후 미리보기용)
+  python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --layout 8 --incremental
+
+  # 일괄 병합 (매니페스트: JSON/CSV - source, output, layout)
+  python pptx_merge.py --base PPT기본양식.pptx --batch jobs.csv --workers 8 --report report.json
+
+  # 상주 서버 (POST /merge, /render, /analyze - 템플릿은 LRU 캐시에 유지)
+  python pptx_merge.py --serve 127.0.0.1:8765 --cache-mb 256
         """
     )
 
     # 분석 모드
     parser.add_argument('--analyze', metavar='FILE', help='PPTX 파일 분석')
     parser.add_argument('--theme', action='store_true', help='테마 색상/폰트 분석 (--analyze와 함께 사용)')
+    parser.add_argument('--all-layouts', action='store_true',
+                        help='모든 레이아웃 placeholder 상세 분석 (--analyze와 함께 사용), '
+                             '--select에서는 모든 레이아웃/마스터 유지')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='분석 결과 출력 형식')
+    parser.add_argument('--no-cache', action='store_true', help='분석 결과 캐시 사용 안 함 (~/.cache/gendoc)')
 
     # 병합 모드
     parser.add_argument('--base', help='기본 양식 파일 (슬라이드 마스터 유지)')
@@ -292,29 +1720,133 @@ def main():
     parser.add_argument('--output', help='출력 파일')
     parser.add_argument('--layout', type=int, default=None, help='레이아웃 인덱스')
     parser.add_argument('--no-template', action='store_true', help='템플릿 변환 비활성화')
+    parser.add_argument('--rules', metavar='FILE', help='템플릿 변환 규칙 JSON 파일 (기본: 내장 규칙)')
+    parser.add_argument('--stream', action='store_true', help='ZIP 스트리밍 모드로 병합 (변경 없는 파트는 그대로 복사)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='증분 병합 (--stream 포함) - 소스에서 바뀐 슬라이드만 다시 변환 (<출력>.slides.json에 지문 저장)')
+    parser.add_argument('--low-memory', action='store_true',
+                        help='저메모리 모드 (병합: --stream 포함, 슬라이드를 한 장씩 iterparse / '
+                             '분석: 파싱한 파트를 캐시하지 않음) - 최대 메모리가 슬라이드 수와 무관')
+
+    # 슬라이드 선택 모드
+    parser.add_argument('--select', metavar='INDICES', help='--base에서 출력할 슬라이드 인덱스 (쉼표 구분, 0-based)')
+
+    # 출력 최적화 (병합/선택 모드)
+    parser.add_argument('--optimize', action='store_true',
+                        help='저장 후 미사용 레이아웃/마스터 제거, 과도한 해상도 이미지 축소, XML 재압축')
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI,
+                        help=f'--optimize 이미지 축소 기준 해상도 (기본: {DEFAULT_DPI})')
+    parser.add_argument('--compress-level', type=int, default=DEFAULT_COMPRESS_LEVEL, choices=range(10),
+                        metavar='0-9', help=f'--optimize XML 압축 수준 (기본: {DEFAULT_COMPRESS_LEVEL})')
+
+    # 토큰 목록
+    parser.add_argument('--tokens', metavar='FILE',
+                        help='슬라이드별 {{...}} 토큰 목록 JSON 저장 (병합 모드: 추가한 슬라이드, --scan-tokens: 전체)')
+    parser.add_argument('--scan-tokens', metavar='PPTX', help='덱의 슬라이드별 토큰 목록 검색')
+
+    # 단계별 시간 측정 (병합 모드)
+    parser.add_argument('--profile', action='store_true', help='병합 단계별/슬라이드별 소요 시간 요약 출력')
+    parser.add_argument('--profile-trace', metavar='FILE',
+                        help='단계별 이벤트를 Chrome trace JSON으로 저장 (--profile 포함)')
+
+    # 일괄 병합 모드
+    parser.add_argument('--batch', metavar='MANIFEST', help='일괄 병합 매니페스트 (JSON/CSV: source, output, layout)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='일괄 병합 worker 프로세스 수 (기본: CPU 수), '
+                             '단일 병합에서는 지정 시 템플릿 변환을 슬라이드별로 병렬 처리')
+    parser.add_argument('--report', metavar='FILE', help='일괄 병합 결과(작업별 시간/오류) JSON 저장')
+
+    # 서버 모드
+    parser.add_argument('--serve', metavar='[HOST:]PORT', help='병합/분석/렌더링 상주 서버 실행')
+    parser.add_argument('--cache-mb', type=int, default=256, help='서버 템플릿 캐시 메모리 상한 MB')
 
     args = parser.parse_args()
 
-    # 분석 모드
-    if args.analyze:
-        analyze_pptx(args.analyze)
-        if args.layout is not None:
-            print()
-            analyze_layout(args.analyze, args.layout)
-        if args.theme:
+    if args.rules:
+        load_template_rules(args.rules)
+    if args.optimize and args.incremental:
+        parser.error('--optimize는 --incremental과 함께 사용할 수 없습니다 (증분 병합은 이전 출력 구성을 재사용)')
+
+    def optimize_output():
+        if args.optimize:
             print()
-            analyze_theme(args.analyze)
+            optimize_pptx(args.output, dpi=args.dpi, compresslevel=args.compress_level)
+
+    # 서버 모드
+    if args.serve:
+        import pptx_server
+        host, port = pptx_server.parse_address(args.serve)
+        pptx_server.serve(host, port, args.cache_mb)
+        return
+
+    # 토큰 검색 모드
+    if args.scan_tokens:
+        slides = scan_tokens(args.scan_tokens)
+        if args.tokens:
+            write_token_manifest(args.tokens, args.scan_tokens, slides)
+            print(f"✓ 토큰 목록 저장: {args.tokens} ({sum(len(s['tokens']) for s in slides)}개 토큰, "
+                  f"{len(slides)}개 슬라이드)")
+        else:
+            print(json.dumps({'file': args.scan_tokens, 'slides': slides}, ensure_ascii=False, indent=2))
+        return
+
+    # 분석 모드 (파일은 한 번만 열고 모든 분석이 공유, 결과는 파일 해시로 캐시)
+    if args.analyze:
+        report = analyze_report(args.analyze, args.layout, args.all_layouts, args.theme,
+                                use_cache=not args.no_cache, low_memory=args.low_memory)
+        if args.format == 'json':
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            print_report(report)
+        return
+
+    # 일괄 병합 모드
+    if args.base and args.batch:
+        results = merge_batch(args.base, read_manifest(args.batch), args.workers, not args.no_template)
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+        if not all(r['ok'] for r in results):
+            sys.exit(1)
+        return
+
+    # 슬라이드 선택 모드
+    if args.base and args.select and args.output:
+        indices = [int(i) for i in args.select.split(',') if i.strip()]
+        select_slides(args.base, indices, args.output, all_layouts=args.all_layouts)
+        optimize_output()
         return
 
     # 병합 모드
     if args.base and args.source and args.output:
-        merge_pptx(
-            args.base,
-            args.source,
-            args.output,
-            args.layout,
-            not args.no_template
-        )
+        profiler = Profiler() if args.profile or args.profile_trace else None
+        if args.incremental:
+            merge_pptx_stream(args.base, args.source, args.output, args.layout, not args.no_template,
+                              incremental=True, workers=args.workers, profiler=profiler,
+                              token_manifest=args.tokens, low_memory=args.low_memory)
+        elif args.low_memory:
+            merge_pptx_stream(args.base, args.source, args.output, args.layout, not args.no_template,
+                              profiler=profiler, token_manifest=args.tokens, low_memory=True)
+            optimize_output()
+        else:
+            merge = merge_pptx_stream if args.stream else merge_pptx
+            merge(
+                args.base,
+                args.source,
+                args.output,
+                args.layout,
+                not args.no_template,
+                workers=args.workers,
+                profiler=profiler,
+                token_manifest=args.tokens
+            )
+            optimize_output()
+
+        if profiler is not None:
+            profiler.print_summary()
+            if args.profile_trace:
+                profiler.write_trace(args.profile_trace)
+                print(f"\n✓ trace 저장: {args.profile_trace}")
         return
 
     # 인자 부족
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+PPTX 출력 크기 최적화
+
+병합/선택 결과를 저장한 뒤 선택적으로 적용하는 후처리 단계 (ZIP 스트리밍 - 바뀌는
+파트만 파싱/재기록하고 나머지는 그대로 복사):
+
+  1. 어떤 슬라이드도 쓰지 않는 레이아웃/마스터 제거 (그것만 참조하던 테마/미디어 포함)
+  2. 슬라이드에 표시되는 크기(EMU)에 비해 픽셀이 훨씬 많은 이미지를 지정 DPI로 축소
+  3. XML 파트를 지정한 압축 수준으로 다시 deflate
+
+사용법:
+    python pptx_optimize.py 결과.pptx                                  # 제자리 최적화
+    python pptx_optimize.py 결과.pptx -o 결과_최적화.pptx --dpi 150 --compress-level 9
+    python pptx_optimize.py 결과.pptx --keep-layouts --no-images       # XML 재압축만
+
+    # 병합/선택 후 바로 적용
+    python pptx_merge.py --base PPT기본양식.pptx --source PPT템플릿_예시.pptx --output 결과.pptx --optimize
+"""
+
+from PIL import Image
+import argparse
+import io
+import os
+import zipfile
+
+import pptx_package as pkg
+
+# 이미지 축소 기준 해상도 (슬라이드에 표시되는 크기 기준 인치당 픽셀)
+DEFAULT_DPI = 150
+
+# XML 파트 deflate 압축 수준 (0-9)
+DEFAULT_COMPRESS_LEVEL = 9
+
+# 필요한 픽셀 수의 이 배수를 넘는 이미지만 축소 (조금 큰 이미지는 재인코딩 손실이 더 큼)
+DOWNSCALE_THRESHOLD = 1.5
+
+JPEG_QUALITY = 85
+
+# EXIF 방향 태그 - 회전 정보가 있는 JPEG는 재인코딩하지 않음
+_EXIF_ORIENTATION = 0x0112
+
+
+# ============================================================
+# 레이아웃/마스터 정리
+# ============================================================
+
+def used_layouts(zin, pres_name):
+    """
+    슬라이드가 사용하는 레이아웃과 그 마스터
+
+    Returns:
+        (레이아웃 파트 이름 집합, 마스터 파트 이름 집합)
+    """
+    layouts = set()
+    for slide in pkg.slide_partnames(zin, pres_name):
+        layouts.update(pkg.rel_targets(zin, slide, pkg.RT_SLIDE_LAYOUT).values())
+    masters = {master for layout in layouts
+               for master in pkg.rel_targets(zin, layout, pkg.RT_SLIDE_MASTER).values()}
+    return layouts, masters
+
+
+def _prune_id_list(root, path, kept_rels):
+    """ID 목록(sldMasterIdLst 등)에서 유지하는 관계를 가리키지 않는 항목 제거 -> 제거 수"""
+    kept_ids = {rel['id'] for rel in kept_rels}
+    removed = 0
+    for elem in root.findall(path, pkg.NS):
+        if elem.get(pkg.qn('r:id')) not in kept_ids:
+            elem.getparent().remove(elem)
+            removed += 1
+    return removed
+
+
+# ============================================================
+# 이미지 축소
+# ============================================================
+
+def _blip_extent(blip, slide_size):
+    """
+    a:blip 이미지 전체가 슬라이드에서 차지하는 크기 (EMU)
+
+    그림(p:pic)은 xfrm 크기에 그룹 배율과 자르기(srcRect)를 반영하고, 배경/도형 채우기는
+    슬라이드 크기를 상한으로 본다. 타일 채우기처럼 크기를 정할 수 없으면 None.
+    """
+    blip_fill = blip.getparent()
+    if blip_fill.find('a:tile', pkg.NS) is not None:
+        return None
+
+    cx, cy = slide_size
+    owner = blip_fill.getparent()
+    if owner.tag == pkg.qn('p:pic'):
+        xfrm = pkg.shape_xfrm(owner)
+        if xfrm['cx'] and xfrm['cy']:
+            cx, cy = xfrm['cx'], xfrm['cy']
+            for group in owner.iterancestors(pkg.qn('p:grpSp')):
+                ext = group.find('p:grpSpPr/a:xfrm/a:ext', pkg.NS)
+                ch_ext = group.find('p:grpSpPr/a:xfrm/a:chExt', pkg.NS)
+                if ext is None or ch_ext is None or not int(ch_ext.get('cx')) or not int(ch_ext.get('cy')):
+                    return None
+                cx = cx * int(ext.get('cx')) / int(ch_ext.get('cx'))
+                cy = cy * int(ext.get('cy')) / int(ch_ext.get('cy'))
+
+    src_rect = blip_fill.find('a:srcRect', pkg.NS)
+    if src_rect is not None:
+        visible_x = (100000 - int(src_rect.get('l', 0)) - int(src_rect.get('r', 0))) / 100000
+        visible_y = (100000 - int(src_rect.get('t', 0)) - int(src_rect.get('b', 0))) / 100000
+        if visible_x <= 0 or visible_y <= 0:
+            return None
+        cx, cy = cx / visible_x, cy / visible_y
+    return cx, cy
+
+
+def image_extents(zin, parts, slide_size):
+    """
+    이미지 파트별 최대 표시 크기
+
+    슬라이드/레이아웃/마스터의 a:blip 참조만 크기를 계산한다. 차트/다이어그램/노트 등
+    다른 파트가 참조하거나 a:blip 외의 요소가 참조하는 이미지는 None (축소하지 않음).
+
+    Args:
+        parts: pkg.walk_parts() 결과 (출력에 남는 파트와 관계)
+        slide_size: 슬라이드 크기 (cx, cy) EMU
+
+    Returns:
+        {이미지 파트 이름: (cx, cy) 또는 None}
+    """
+    drawing_parts = {pkg.resolve_target(partname, rel['target'])
+                     for partname, rels in parts.items() for rel in rels or ()
+                     if not rel['external'] and rel['type'] in (pkg.RT_SLIDE, pkg.RT_SLIDE_LAYOUT,
+                                                                  pkg.RT_SLIDE_MASTER)}
+    usages = {}   # 이미지 파트 이름 -> [크기 또는 None]
+    for partname, rels in parts.items():
+        images = {rel['id']: pkg.resolve_target(partname, rel['target'])
+                  for rel in rels or () if rel['type'] == pkg.RT_IMAGE and not rel['external']}
+        if not images:
+            continue
+        if partname not in drawing_parts:
+            for image in images.values():
+                usages.setdefault(image, []).append(None)
+            continue
+
+        root = pkg.parse_xml(zin.read(partname))
+        measured = set()
+        for elem in root.iter():
+            for attr, rel_id in elem.attrib.items():
+                if not attr.startswith(pkg.R_ATTR_PREFIX) or rel_id not in images:
+                    continue
+                if elem.tag == pkg.qn('a:blip') and attr == pkg.qn('r:embed'):
+                    usages.setdefault(images[rel_id], []).append(_blip_extent(elem, slide_size))
+                else:
+                    usages.setdefault(images[rel_id], []).append(None)
+                measured.add(rel_id)
+        for rel_id, image in images.items():
+            if rel_id not in measured:   # 참조하는 요소를 찾지 못한 관계 - 보수적으로 유지
+                usages.setdefault(image, []).append(None)
+
+    extents = {}
+    for image, sizes in usages.items():
+        if any(size is None for size in sizes):
+            extents[image] = None
+        else:
+            extents[image] = (max(cx for cx, _ in sizes), max(cy for _, cy in sizes))
+    return extents
+
+
+def downscale_image(data, extent, dpi):
+    """
+    표시 크기에 비해 과도하게 큰 JPEG/PNG 이미지를 dpi 기준 크기로 축소
+
+    가로세로 비율은 유지하고 형식(JPEG/PNG)과 ICC 프로필도 유지한다.
+
+    Args:
+        data: 이미지 바이트
+        extent: 표시 크기 (cx, cy) EMU
+        dpi: 기준 해상도
+
+    Returns:
+        축소한 이미지 바이트 (축소 대상이 아니거나 결과가 더 크면 None)
+    """
+    try:
+        img = Image.open(io.BytesIO(data))
+    except OSError:   # EMF/WMF/SVG 등 Pillow가 읽지 못하는 형식
+        return None
+
+    with img:
+        if img.format not in ('JPEG', 'PNG') or getattr(img, 'is_animated', False):
+            return None
+        if img.format == 'JPEG' and img.getexif().get(_EXIF_ORIENTATION, 1) != 1:
+            return None
+
+        need_width = extent[0] / pkg.EMU_PER_INCH * dpi
+        need_height = extent[1] / pkg.EMU_PER_INCH * dpi
+        scale = max(need_width / img.width, need_height / img.height)
+        if scale * DOWNSCALE_THRESHOLD >= 1:
+            return None
+
+        image_format = img.format
+        options = {'optimize': True}
+        if img.info.get('icc_profile'):
+            options['icc_profile'] = img.info['icc_profile']
+        if image_format == 'JPEG':
+            options['quality'] = JPEG_QUALITY
+        elif img.mode in ('1', 'P'):   # 팔레트 이미지는 보간 축소를 위해 변환
+            img = img.convert('RGBA')
+
+        size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        buffer = io.BytesIO()
+        img.resize(size, Image.LANCZOS).save(buffer, image_format, **options)
+
+    result = buffer.getvalue()
+    return result if len(result) < len(data) else None
+
+
+# ============================================================
+# 최적화
+# ============================================================
+
+def _is_xml(name):
+    return name.endswith(('.xml', '.rels'))
+
+
+def optimize_pptx(input_pptx, output=None, prune_layouts=True, dpi=DEFAULT_DPI,
+                  compresslevel=DEFAULT_COMPRESS_LEVEL, verbose=True):
+    """
+    PPTX 출력 크기 최적화
+
+    - prune_layouts: 슬라이드가 쓰지 않는 레이아웃/마스터를 제거하고, 그 결과 패키지
+      루트에서 도달할 수 없게 된 파트(테마/미디어 등)도 제거한다. 출력의 slide_layouts
+      인덱스가 입력과 달라질 수 있다. 슬라이드가 없으면 정리하지 않는다.
+    - dpi: 표시 크기 기준으로 DOWNSCALE_THRESHOLD배 이상 큰 이미지를 이 해상도로 축소
+      (파트 이름/형식은 유지, None이면 이미지는 그대로)
+    - compresslevel: XML/rels 파트를 이 수준으로 다시 deflate (None이면 원본 압축 그대로
+      복사, 미디어는 항상 원본 압축 방식 유지)
+
+    Args:
+        input_pptx: 입력 파일
+        output: 출력 파일 경로 (None이면 입력 파일을 제자리에서 교체)
+        verbose: 결과 출력 여부
+
+    Returns:
+        {'input_bytes', 'output_bytes', 'layouts_removed', 'masters_removed',
+         'parts_removed', 'images_downscaled', 'image_bytes_saved'}
+    """
+    output = output or input_pptx
+    stats = {'input_bytes': os.path.getsize(input_pptx), 'output_bytes': 0,
+             'layouts_removed': 0, 'masters_removed': 0, 'parts_removed': 0,
+             'images_downscaled': 0, 'image_bytes_saved': 0}
+
+    tmp_file = f'{output}.{os.getpid()}.tmp'
+    try:
+        with zipfile.ZipFile(input_pptx, 'r') as zin:
+            pres_name = pkg.main_document_partname(zin)
+            pres = pkg.parse_xml(zin.read(pres_name))
+            sld_sz = pres.find('p:sldSz', pkg.NS)
+            slide_size = (int(sld_sz.get('cx')), int(sld_sz.get('cy')))
+
+            layouts, masters = used_layouts(zin, pres_name)
+            prune = prune_layouts and bool(layouts)
+
+            def keep_rel(partname, rel):
+                if partname == pres_name and rel['type'] == pkg.RT_SLIDE_MASTER:
+                    return pkg.resolve_target(partname, rel['target']) in masters
+                if partname in masters and rel['type'] == pkg.RT_SLIDE_LAYOUT:
+                    return pkg.resolve_target(partname, rel['target']) in layouts
+                return True
+
+            parts = pkg.walk_parts(zin, keep_rel if prune else None)
+
+            # 교체할 멤버 (이름 -> 바이트)와 제외할 멤버
+            rewritten = {}
+            removed = set()
+            if prune:
+                stats['masters_removed'] = _prune_id_list(
+                    pres, 'p:sldMasterIdLst/p:sldMasterId', parts[pres_name])
+                rewritten[pres_name] = pkg.serialize_xml(pres)
+                rewritten[pkg.rels_name(pres_name)] = pkg.rels_xml(parts[pres_name])
+                for master in masters:
+                    master_xml = pkg.parse_xml(zin.read(master))
+                    stats['layouts_removed'] += _prune_id_list(
+                        master_xml, 'p:sldLayoutIdLst/p:sldLayoutId', parts[master])
+                    rewritten[master] = pkg.serialize_xml(master_xml)
+                    rewritten[pkg.rels_name(master)] = pkg.rels_xml(parts[master])
+
+                kept = {pkg.CONTENT_TYPES, '_rels/.rels'} | set(parts) | {pkg.rels_name(n) for n in parts}
+                removed = {name for name in zin.NameToInfo if name not in kept}
+                stats['parts_removed'] = sum(1 for name in removed if not name.endswith('.rels'))
+
+                content_types = pkg.parse_xml(zin.read(pkg.CONTENT_TYPES))
+                for override in content_types.findall('ct:Override', pkg.NS):
+                    if override.get('PartName').lstrip('/') in removed:
+                        content_types.remove(override)
+                rewritten[pkg.CONTENT_TYPES] = pkg.serialize_xml(content_types)
+
+            if dpi:
+                for image, extent in image_extents(zin, parts, slide_size).items():
+                    if extent is None or image in removed or image not in zin.NameToInfo:
+                        continue
+                    data = zin.read(image)
+                    smaller = downscale_image(data, extent, dpi)
+                    if smaller is not None:
+                        rewritten[image] = smaller
+                        stats['images_downscaled'] += 1
+                        stats['image_bytes_saved'] += len(data) - len(smaller)
+
+            with zipfile.ZipFile(tmp_file, 'w', zipfile.ZIP_DEFLATED) as zout:
+                for info in zin.infolist():
+                    name = info.filename
+                    if name in removed:
+                        continue
+                    xml = _is_xml(name)
+                    if name not in rewritten and (not xml or compresslevel is None):
+                        pkg.copy_member(zin, info, zout)
+                        continue
+
+                    data = rewritten[name] if name in rewritten else zin.read(name)
+                    out_info = zipfile.ZipInfo(name, info.date_time)
+                    out_info.external_attr = info.external_attr
+                    if xml:
+                        zout.writestr(out_info, data, zipfile.ZIP_DEFLATED, compresslevel)
+                    else:
+                        zout.writestr(out_info, data, info.compress_type)
+
+        os.replace(tmp_file, output)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+    stats['output_bytes'] = os.path.getsize(output)
+    if verbose:
+        print_optimize_stats(output, stats)
+    return stats
+
+
+def print_optimize_stats(output, stats):
+    """최적화 결과 출력"""
+    before, after = stats['input_bytes'], stats['output_bytes']
+    print(f"최적화: {output}")
+    print(f"  레이아웃 {stats['layouts_removed']}개, 마스터 {stats['masters_removed']}개 제거 "
+          f"(제거된 파트 {stats['parts_removed']}개)")
+    print(f"  이미지 {stats['images_downscaled']}개 축소 ({stats['image_bytes_saved'] / 1024:.0f}KB 절감)")
+    print(f"  크기: {before / 1024:.0f}KB -> {after / 1024:.0f}KB "
+          f"({(1 - after / before) * 100 if before else 0:.1f}% 감소)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PPTX 출력 크기 최적화')
+    parser.add_argument('input', help='입력 PPTX 파일')
+    parser.add_argument('-o', '--output', help='출력 파일 (기본: 입력 파일 교체)')
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI,
+                        help=f'이미지 축소 기준 해상도 (기본: {DEFAULT_DPI})')
+    parser.add_argument('--compress-level', type=int, default=DEFAULT_COMPRESS_LEVEL, choices=range(10),
+                        metavar='0-9', help=f'XML 파트 deflate 압축 수준 (기본: {DEFAULT_COMPRESS_LEVEL})')
+    parser.add_argument('--keep-layouts', action='store_true', help='사용하지 않는 레이아웃/마스터 유지')
+    parser.add_argument('--no-images', action='store_true', help='이미지 축소 안 함')
+    args = parser.parse_args()
+
+    optimize_pptx(args.input, args.output, prune_layouts=not args.keep_layouts,
+                  dpi=None if args.no_images else args.dpi, compresslevel=args.compress_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,762 @@
+"""
+PPTX(OPC) 패키지 저수준 처리 모듈
+
+python-pptx 객체 모델을 만들지 않고 ZIP 멤버(파트) 단위로 읽고 쓴다.
+수정이 필요한 XML 파트만 파싱하고, 나머지 파트(미디어, 마스터, 테마 등)는
+원본 ZIP에서 출력 ZIP으로 그대로 스트리밍 복사한다.
+"""
+
+import hashlib
+from functools import cached_property
+import posixpath
+import re
+import shutil
+import zipfile
+from lxml import etree
+
+# ============================================================
+# 상수
+# ============================================================
+
+NS = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+    'ct': 'http://schemas.openxmlformats.org/package/2006/content-types',
+}
+
+_RT_BASE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+RT_OFFICE_DOCUMENT = _RT_BASE + 'officeDocument'
+RT_SLIDE = _RT_BASE + 'slide'
+RT_SLIDE_LAYOUT = _RT_BASE + 'slideLayout'
+RT_SLIDE_MASTER = _RT_BASE + 'slideMaster'
+RT_NOTES_SLIDE = _RT_BASE + 'notesSlide'
+RT_IMAGE = _RT_BASE + 'image'
+
+# 다른 덱으로 슬라이드를 복사할 때 따라가지 않는 관계 (새 슬라이드가 자체적으로 가지거나 의미 없음)
+SLIDE_LOCAL_RELTYPES = {RT_SLIDE, RT_SLIDE_LAYOUT, RT_SLIDE_MASTER, RT_NOTES_SLIDE}
+
+CT_SLIDE = 'application/vnd.openxmlformats-officedocument.presentationml.slide+xml'
+
+CONTENT_TYPES = '[Content_Types].xml'
+
+MEDIA_PREFIX = 'ppt/media/'
+
+# shape로 취급되는 spTree 자식 태그 (python-pptx와 동일)
+SHAPE_TAGS = {f'{{{NS["p"]}}}{tag}' for tag in
+              ('sp', 'grpSp', 'graphicFrame', 'cxnSp', 'pic', 'contentPart')}
+
+# 새 슬라이드 XML (python-pptx의 CT_Slide.new()와 동일한 골격)
+_NEW_SLIDE_XML = (
+    '<p:sld xmlns:a="%s" xmlns:p="%s" xmlns:r="%s">'
+    '<p:cSld><p:spTree>'
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    '<p:grpSpPr/>'
+    '</p:spTree></p:cSld>'
+    '<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr>'
+    '</p:sld>' % (NS['a'], NS['p'], NS['r'])
+).encode()
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# 관계 ID를 담는 r: 네임스페이스 속성 접두어 (r:embed, r:link, r:id, r:pict, r:dm ...)
+R_ATTR_PREFIX = '{%s}' % NS['r']
+
+
+# ============================================================
+# 경로/XML 유틸
+# ============================================================
+
+def qn(tag):
+    """'p:sld' 형식의 태그를 Clark 표기('{ns}sld')로 변환"""
+    prefix, local = tag.split(':')
+    return f'{{{NS[prefix]}}}{local}'
+
+
+def rels_name(partname):
+    """파트에 대응하는 rels 파트 이름 ('ppt/slides/slide1.xml' -> 'ppt/slides/_rels/slide1.xml.rels')"""
+    directory, filename = posixpath.split(partname)
+    return posixpath.join(directory, '_rels', filename + '.rels')
+
+
+def resolve_target(partname, target):
+    """rels의 상대 Target을 ZIP 멤버 이름으로 변환"""
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(partname), target))
+
+
+def relative_target(from_partname, to_partname):
+    """from 파트 기준 to 파트의 상대 경로 (rels Target용)"""
+    return posixpath.relpath(to_partname, posixpath.dirname(from_partname))
+
+
+def parse_xml(data):
+    """XML 바이트 파싱"""
+    return etree.fromstring(data)
+
+
+def serialize_xml(root):
+    """XML 직렬화 (python-pptx 저장 형식과 동일한 선언 포함)"""
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def new_slide_xml():
+    """빈 슬라이드 XML 루트 생성"""
+    return parse_xml(_NEW_SLIDE_XML)
+
+
+def strip_to_shapes(sld):
+    """
+    소스 슬라이드 XML을 '빈 슬라이드 + 원본 shape' 형태로 제자리 변환
+
+    add_slide() 후 shape를 deepcopy하는 것과 같은 결과를 만들되,
+    shape 요소를 다른 문서로 옮기지 않아 큰 슬라이드에서도 빠르다.
+    """
+    template = new_slide_xml()
+    sld.attrib.clear()
+    for child in list(sld):
+        if child.tag != qn('p:cSld'):
+            sld.remove(child)
+    sld.append(template.find('p:clrMapOvr', NS))
+
+    c_sld = sld.find('p:cSld', NS)
+    c_sld.attrib.clear()
+    for child in list(c_sld):
+        if child.tag != qn('p:spTree'):
+            c_sld.remove(child)
+
+    sp_tree = c_sld.find('p:spTree', NS)
+    for child in list(sp_tree):
+        if child.tag not in SHAPE_TAGS:
+            sp_tree.remove(child)
+    template_tree = template.find('p:cSld/p:spTree', NS)
+    sp_tree.insert(0, template_tree.find('p:grpSpPr', NS))
+    sp_tree.insert(0, template_tree.find('p:nvGrpSpPr', NS))
+    return sld
+
+
+def parse_member(zf, partname):
+    """ZIP 멤버를 바이트로 읽지 않고 스트림에서 바로 파싱"""
+    with zf.open(partname) as f:
+        return etree.parse(f).getroot()
+
+
+_C_SLD = qn('p:cSld')
+_SP_TREE = qn('p:spTree')
+
+
+def parse_slide_shapes(zf, partname):
+    """
+    슬라이드 파트를 iterparse로 읽어 strip_to_shapes(parse_xml(...))와 같은 트리 반환
+
+    shape가 아닌 부분(배경, timing, transition, extLst 등)은 요소가 끝나는 즉시 트리에서
+    떼어내므로 파트 바이트 전체나 버릴 하위 트리를 끝까지 메모리에 두지 않는다.
+    """
+    root = None
+    depth = 0
+    with zf.open(partname) as f:
+        for event, elem in etree.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            parent = elem.getparent()
+            if depth == 1:
+                keep = elem.tag == _C_SLD
+            elif depth == 2 and parent.tag == _C_SLD:
+                keep = elem.tag == _SP_TREE
+            elif depth == 3 and parent.tag == _SP_TREE and parent.getparent().tag == _C_SLD:
+                keep = elem.tag in SHAPE_TAGS
+            else:
+                continue
+            if not keep:
+                parent.remove(elem)
+    return strip_to_shapes(root)
+
+
+# ============================================================
+# 관계(rels) / 콘텐츠 타입
+# ============================================================
+
+def read_rels(zf, partname):
+    """
+    파트의 관계 목록 읽기
+
+    Returns:
+        [{'id', 'type', 'target', 'external'}] (rels 파트가 없으면 빈 리스트)
+    """
+    name = rels_name(partname) if partname else '_rels/.rels'
+    try:
+        root = parse_xml(zf.read(name))
+    except KeyError:
+        return []
+
+    rels = []
+    for rel in root.iterfind('rel:Relationship', NS):
+        rels.append({
+            'id': rel.get('Id'),
+            'type': rel.get('Type'),
+            'target': rel.get('Target'),
+            'external': rel.get('TargetMode') == 'External',
+        })
+    return rels
+
+
+def rels_xml(rels):
+    """관계 목록을 rels XML 바이트로 변환"""
+    root = etree.Element(f'{{{NS["rel"]}}}Relationships', nsmap={None: NS['rel']})
+    for rel in rels:
+        elem = etree.SubElement(root, f'{{{NS["rel"]}}}Relationship')
+        elem.set('Id', rel['id'])
+        elem.set('Type', rel['type'])
+        elem.set('Target', rel['target'])
+        if rel.get('external'):
+            elem.set('TargetMode', 'External')
+    return serialize_xml(root)
+
+
+def next_rel_id(rels):
+    """사용되지 않은 다음 rId"""
+    used = {rel['id'] for rel in rels}
+    n = len(used) + 1
+    for i in range(1, n + 1):
+        if f'rId{i}' not in used:
+            return f'rId{i}'
+    return f'rId{n}'
+
+
+def add_override(content_types, partname, content_type):
+    """[Content_Types].xml 루트에 Override 추가"""
+    elem = etree.SubElement(content_types, f'{{{NS["ct"]}}}Override')
+    elem.set('PartName', '/' + partname)
+    elem.set('ContentType', content_type)
+    return elem
+
+
+def add_default(content_types, extension, content_type):
+    """[Content_Types].xml 루트에 확장자 Default 추가 (Override보다 앞에 위치)"""
+    elem = etree.Element(f'{{{NS["ct"]}}}Default')
+    elem.set('Extension', extension)
+    elem.set('ContentType', content_type)
+    content_types.insert(0, elem)
+    return elem
+
+
+def content_type_map(zf):
+    """
+    패키지의 콘텐츠 타입 매핑
+
+    Returns:
+        {'defaults': {확장자: 타입}, 'overrides': {파트 이름: 타입}}
+    """
+    root = parse_xml(zf.read(CONTENT_TYPES))
+    return {
+        'defaults': {d.get('Extension').lower(): d.get('ContentType')
+                     for d in root.iterfind('ct:Default', NS)},
+        'overrides': {o.get('PartName').lstrip('/'): o.get('ContentType')
+                      for o in root.iterfind('ct:Override', NS)},
+    }
+
+
+def content_type_for(ct_map, partname):
+    """파트의 콘텐츠 타입 (Override 우선, 없으면 확장자 Default)"""
+    if partname in ct_map['overrides']:
+        return ct_map['overrides'][partname]
+    return ct_map['defaults'].get(posixpath.splitext(partname)[1][1:].lower())
+
+
+# ============================================================
+# 프레젠테이션 구조 탐색
+# ============================================================
+
+def main_document_partname(zf):
+    """패키지 루트 rels에서 presentation.xml 위치 찾기"""
+    for rel in read_rels(zf, None):
+        if rel['type'] == RT_OFFICE_DOCUMENT:
+            return resolve_target('', rel['target'])
+    return 'ppt/presentation.xml'
+
+
+def rel_targets(zf, partname, rel_type=None):
+    """rId -> 대상 파트 이름 매핑 (외부 링크 제외)"""
+    return {
+        rel['id']: resolve_target(partname, rel['target'])
+        for rel in read_rels(zf, partname)
+        if not rel['external'] and (rel_type is None or rel['type'] == rel_type)
+    }
+
+
+def slide_partnames(zf, pres_partname=None):
+    """프레젠테이션의 슬라이드 파트 이름 (표시 순서)"""
+    pres_partname = pres_partname or main_document_partname(zf)
+    pres = parse_xml(zf.read(pres_partname))
+    targets = rel_targets(zf, pres_partname)
+    return [targets[sld.get(qn('r:id'))]
+            for sld in pres.iterfind('p:sldIdLst/p:sldId', NS)]
+
+
+def master_partnames(zf, pres_partname=None):
+    """슬라이드 마스터 파트 이름 (표시 순서)"""
+    pres_partname = pres_partname or main_document_partname(zf)
+    pres = parse_xml(zf.read(pres_partname))
+    targets = rel_targets(zf, pres_partname)
+    return [targets[m.get(qn('r:id'))]
+            for m in pres.iterfind('p:sldMasterIdLst/p:sldMasterId', NS)]
+
+
+def layout_partnames(zf, master_partname):
+    """마스터에 속한 레이아웃 파트 이름 (python-pptx slide_layouts 순서)"""
+    master = parse_xml(zf.read(master_partname))
+    targets = rel_targets(zf, master_partname)
+    return [targets[lyt.get(qn('r:id'))]
+            for lyt in master.iterfind('p:sldLayoutIdLst/p:sldLayoutId', NS)]
+
+
+def part_name(zf, partname):
+    """슬라이드/레이아웃 파트의 cSld name 속성"""
+    root = parse_xml(zf.read(partname))
+    c_sld = root.find('p:cSld', NS)
+    return c_sld.get('name', '') if c_sld is not None else ''
+
+
+def slide_id_list(pres):
+    """presentation.xml의 p:sldIdLst (없으면 스키마 순서에 맞는 위치에 생성)"""
+    sld_id_lst = pres.find('p:sldIdLst', NS)
+    if sld_id_lst is None:
+        sld_id_lst = etree.Element(qn('p:sldIdLst'))
+        anchor = None
+        for tag in ('p:sldMasterIdLst', 'p:notesMasterIdLst', 'p:handoutMasterIdLst'):
+            found = pres.find(tag, NS)
+            if found is not None:
+                anchor = found
+        anchor.addnext(sld_id_lst)
+    return sld_id_lst
+
+
+# ============================================================
+# shape 조회
+# ============================================================
+
+EMU_PER_INCH = 914400
+
+
+def iter_shape_elms(sp_tree):
+    """spTree의 shape 요소 (python-pptx shapes와 같은 대상)"""
+    return (child for child in sp_tree if child.tag in SHAPE_TAGS)
+
+
+def shape_ph(shape):
+    """shape의 p:ph 요소 (placeholder가 아니면 None)"""
+    return shape.find('./*[1]/p:nvPr/p:ph', NS)
+
+
+def shape_xfrm(shape):
+    """
+    shape 위치/크기 (EMU)
+
+    Returns:
+        {'x', 'y', 'cx', 'cy'} (xfrm이 없는 값은 None - 상속 대상)
+    """
+    xfrm = None
+    for path in ('p:spPr/a:xfrm', 'p:grpSpPr/a:xfrm', 'p:xfrm'):
+        xfrm = shape.find(path, NS)
+        if xfrm is not None:
+            break
+    off = xfrm.find('a:off', NS) if xfrm is not None else None
+    ext = xfrm.find('a:ext', NS) if xfrm is not None else None
+
+    def value(elem, attr):
+        return int(elem.get(attr)) if elem is not None and elem.get(attr) is not None else None
+
+    return {'x': value(off, 'x'), 'y': value(off, 'y'), 'cx': value(ext, 'cx'), 'cy': value(ext, 'cy')}
+
+
+def paragraph_text(para):
+    """a:p 텍스트 (python-pptx paragraph.text와 동일 - 줄바꿈 a:br은 '\\v')"""
+    parts = []
+    for child in para:
+        if child.tag == qn('a:br'):
+            parts.append('\v')
+        elif child.tag in (qn('a:r'), qn('a:fld')):
+            parts.append(child.findtext('a:t', '', NS))
+    return ''.join(parts)
+
+
+def shape_text(shape):
+    """shape의 텍스트 프레임 텍스트 (문단은 '\\n'으로 연결, 텍스트 프레임이 없으면 '')"""
+    return '\n'.join(paragraph_text(para) for para in shape.iterfind('p:txBody/a:p', NS))
+
+
+# ============================================================
+# 변경 감지
+# ============================================================
+
+def part_fingerprint(zf, partname):
+    """
+    파트와 그 파트가 참조하는 파트 전체의 내용 지문 (SHA-256 hex)
+
+    파트 이름은 넣지 않는다 - 슬라이드를 지우거나 순서를 바꿔 slideN.xml/imageN.png 번호가
+    바뀌어도 내용이 같으면 지문이 같다. XML 파트는 정규화(C14N)한 내용을 해시하고(다시 저장해
+    XML 선언/줄바꿈만 바뀐 파트는 같은 지문), 관계는 (rId, 종류, 대상의 지문)으로 넣는다.
+    관계로 연결된 XML이 아닌 파트(미디어 등, 재귀)는 압축을 풀지 않도록 ZIP 중앙 디렉터리의
+    CRC-32와 크기를 내용 대신 사용한다.
+    슬라이드/레이아웃/노트 관계는 따라가지 않는다 (슬라이드 복사 시 버려지는 관계).
+    """
+    return _content_fingerprint(zf, partname, {}, set())
+
+
+def _content_fingerprint(zf, name, memo, visiting):
+    if name in memo:
+        return memo[name]
+    hasher = hashlib.sha256()
+    if name.endswith('.xml'):
+        hasher.update(etree.tostring(parse_member(zf, name), method='c14n'))
+    else:
+        info = zf.getinfo(name)
+        hasher.update(b'%d:%d' % (info.CRC, info.file_size))
+
+    visiting.add(name)
+    for rel in sorted(read_rels(zf, name), key=lambda rel: rel['id']):
+        if rel['type'] in SLIDE_LOCAL_RELTYPES:
+            continue
+        if rel['external']:
+            target = 'external:' + rel['target']
+        else:
+            target = resolve_target(name, rel['target'])
+            if target not in zf.NameToInfo:
+                continue    # 대상 없는 관계 (다시 저장하면 사라짐)
+            if target in visiting:
+                target = 'cycle'
+            else:
+                target = _content_fingerprint(zf, target, memo, visiting)
+        hasher.update(f"{rel['id']}\0{rel['type']}\0{target}\n".encode())
+    visiting.discard(name)
+
+    memo[name] = hasher.hexdigest()
+    return memo[name]
+
+
+def reachable_parts(zf, partname, exclude=()):
+    """파트에서 관계로 도달할 수 있는 파트 이름 (자기 자신과 exclude 제외, 외부 링크 제외)"""
+    found = set()
+    pending = [partname]
+    while pending:
+        name = pending.pop()
+        for rel in read_rels(zf, name):
+            target = resolve_target(name, rel['target'])
+            if rel['external'] or target in found or target in exclude or target == partname:
+                continue
+            if target in zf.NameToInfo:
+                found.add(target)
+                pending.append(target)
+    return found
+
+
+def walk_parts(zf, keep_rel=None):
+    """
+    패키지 루트에서 관계 그래프를 따라 도달 가능한 파트 (외부 링크 제외)
+
+    Args:
+        keep_rel: keep_rel(파트 이름, 관계)가 False인 관계는 버리고 따라가지 않음
+                  (None이면 모든 관계 유지)
+
+    Returns:
+        {파트 이름: 유지할 관계 목록} (패키지 관계 _rels/.rels는 제외)
+    """
+    parts = {}
+    pending = [None]
+    while pending:
+        partname = pending.pop()
+        rels = [rel for rel in read_rels(zf, partname) if keep_rel is None or keep_rel(partname, rel)]
+        if partname is not None:
+            parts[partname] = rels
+        for rel in rels:
+            target = resolve_target(partname or '', rel['target'])
+            if not rel['external'] and target not in parts and target in zf.NameToInfo:
+                parts[target] = None
+                pending.append(target)
+    return parts
+
+
+# ============================================================
+# 지연 파싱 패키지 (읽기 전용)
+# ============================================================
+
+class LazyPackage:
+    """
+    PPTX 패키지를 한 번만 열고, 파트는 처음 접근할 때 한 번만 파싱해 캐시하는 읽기 전용 뷰
+
+    여러 분석(기본 정보/레이아웃/테마)이 같은 인스턴스를 공유하면 파일 열기와
+    XML 파싱이 파트당 한 번으로 줄어든다.
+    cache=False(저메모리 모드)이면 presentation.xml 외의 파트는 캐시하지 않고 접근할 때마다
+    스트림에서 파싱하므로, 사용이 끝난 트리는 바로 해제된다.
+    """
+
+    def __init__(self, path, cache=True):
+        self.path = path
+        self.zf = zipfile.ZipFile(path, 'r')
+        self.cache = cache
+        self._xml = {}
+        self._rel_targets = {}
+
+    def close(self):
+        self.zf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def namelist(self):
+        return self.zf.namelist()
+
+    def read(self, partname):
+        return self.zf.read(partname)
+
+    def xml(self, partname):
+        """파트 XML 루트 (캐시)"""
+        if partname in self._xml:
+            return self._xml[partname]
+        root = parse_member(self.zf, partname)
+        if self.cache or partname == self.main_partname:
+            self._xml[partname] = root
+        return root
+
+    def rel_targets(self, partname):
+        """rId -> 대상 파트 이름 (캐시)"""
+        if partname not in self._rel_targets:
+            self._rel_targets[partname] = rel_targets(self.zf, partname)
+        return self._rel_targets[partname]
+
+    @cached_property
+    def main_partname(self):
+        return main_document_partname(self.zf)
+
+    @property
+    def presentation(self):
+        return self.xml(self.main_partname)
+
+    def _id_list(self, partname, path):
+        targets = self.rel_targets(partname)
+        return [targets[elem.get(qn('r:id'))] for elem in self.xml(partname).iterfind(path, NS)]
+
+    def slide_partnames(self):
+        return self._id_list(self.main_partname, 'p:sldIdLst/p:sldId')
+
+    def master_partnames(self):
+        return self._id_list(self.main_partname, 'p:sldMasterIdLst/p:sldMasterId')
+
+    def layout_partnames(self, master_partname):
+        return self._id_list(master_partname, 'p:sldLayoutIdLst/p:sldLayoutId')
+
+    def part_name(self, partname):
+        """슬라이드/레이아웃 파트의 cSld name 속성"""
+        c_sld = self.xml(partname).find('p:cSld', NS)
+        return c_sld.get('name', '') if c_sld is not None else ''
+
+    def sp_tree(self, partname):
+        return self.xml(partname).find('p:cSld/p:spTree', NS)
+
+
+# ============================================================
+# ZIP 스트리밍
+# ============================================================
+
+def copy_member(zin, info, zout, name=None):
+    """ZIP 멤버를 파싱 없이 청크 단위로 복사 (메모리 사용량 일정)"""
+    out_info = zipfile.ZipInfo(name or info.filename, info.date_time)
+    out_info.compress_type = info.compress_type
+    out_info.external_attr = info.external_attr
+    with zin.open(info) as src, zout.open(out_info, 'w', force_zip64=info.file_size > 0x7FFFFFFF) as dst:
+        shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+
+def member_digest(zin, name):
+    """ZIP 멤버 내용의 SHA-256 hex (청크 단위로 읽음)"""
+    hasher = hashlib.sha256()
+    with zin.open(name) as src:
+        while True:
+            chunk = src.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def write_member(zout, name, data):
+    """새 ZIP 멤버 쓰기 (deflate 압축)"""
+    zout.writestr(name, data, compress_type=zipfile.ZIP_DEFLATED)
+
+
+# ============================================================
+# 관계 대상 파트 복사 (콘텐츠 해시 기반 미디어 공유)
+# ============================================================
+
+class ZipPartStore:
+    """
+    슬라이드가 참조하는 파트를 다른 패키지에서 출력 ZIP으로 복사하는 저장소
+
+    미디어 파트(ppt/media/)는 SHA-256 콘텐츠 해시로 키를 잡아 같은 내용은 출력에
+    한 번만 기록하고, 그 미디어를 참조하는 모든 슬라이드가 같은 파트를 공유한다.
+    차트/OLE 등 나머지 파트는 참조하는 슬라이드마다 새 이름으로 복사한다.
+    """
+
+    def __init__(self, zout, content_types, names):
+        """
+        Args:
+            zout: 출력 ZipFile (쓰기 모드)
+            content_types: 출력 [Content_Types].xml 루트 (복사한 파트의 타입이 추가됨)
+            names: 출력 ZIP에 이미 있거나 예약된 멤버 이름
+        """
+        self.zout = zout
+        self.content_types = content_types
+        self.names = set(names)
+        self.media = {}           # SHA-256 -> 출력 파트 이름
+        self._source_media = {}   # (원본 파일, 파트 이름) -> 출력 파트 이름
+        self._ct_maps = {}
+        self._counters = {}
+        self._defaults = {d.get('Extension').lower()
+                          for d in content_types.iterfind('ct:Default', NS)}
+
+    def add_media(self, partname, digest):
+        """출력에 이미 기록된 미디어 등록 (기본 양식의 미디어와도 공유하기 위함)"""
+        self.media.setdefault(digest, partname)
+
+    def copy_relationships(self, zin, src_partname, root, dest_partname, dest_rels):
+        """
+        XML 요소 트리의 r:* 속성이 참조하는 관계를 대상 파트로 옮긴다.
+
+        원본 관계의 대상 파트를 복사(미디어는 공유)하고, 트리의 rId를 dest_rels 기준
+        새 rId로 바꾼다. 슬라이드/레이아웃/노트 관계는 따라가지 않고 속성을 제거한다.
+
+        Args:
+            zin: 원본 ZipFile
+            src_partname: 원본 파트 이름 (관계 조회용)
+            root: rId를 다시 쓸 XML 요소 (제자리 수정)
+            dest_partname: 대상 파트 이름
+            dest_rels: 대상 파트의 관계 목록 (새 관계가 추가됨)
+        """
+        src_rels = {rel['id']: rel for rel in read_rels(zin, src_partname)}
+        rid_map = {}
+        for elem in root.iter(etree.Element):
+            for attr, value in list(elem.attrib.items()):
+                if not attr.startswith(R_ATTR_PREFIX):
+                    continue
+                if value not in rid_map:
+                    rid_map[value] = self._copy_rel(zin, src_partname, src_rels.get(value),
+                                                    dest_partname, dest_rels)
+                if rid_map[value] is None:
+                    del elem.attrib[attr]
+                else:
+                    elem.set(attr, rid_map[value])
+
+    def _copy_rel(self, zin, src_partname, rel, dest_partname, dest_rels):
+        """관계 하나를 대상 파트로 옮기고 새 rId 반환 (옮길 수 없으면 None)"""
+        if rel is None or rel['type'] in SLIDE_LOCAL_RELTYPES:
+            return None
+        if rel['external']:
+            target = rel['target']
+        else:
+            copied = self.copy_part(zin, resolve_target(src_partname, rel['target']))
+            if copied is None:
+                return None
+            target = relative_target(dest_partname, copied)
+
+        for existing in dest_rels:
+            if (existing['type'], existing['target'], existing['external']) == \
+                    (rel['type'], target, rel['external']):
+                return existing['id']
+        rel_id = next_rel_id(dest_rels)
+        dest_rels.append({'id': rel_id, 'type': rel['type'], 'target': target,
+                          'external': rel['external']})
+        return rel_id
+
+    def copy_part(self, zin, partname, _copied=None):
+        """
+        원본 파트를 출력 ZIP으로 복사하고 출력 파트 이름 반환
+
+        미디어는 콘텐츠 해시로 중복을 제거한다. 그 외 파트는 자신의 관계까지
+        재귀적으로 복사하며, 파트 내용(rId 포함)은 변경하지 않는다.
+        """
+        if partname not in zin.NameToInfo:
+            return None
+
+        if partname.startswith(MEDIA_PREFIX):
+            key = (zin.filename, partname)
+            if key not in self._source_media:
+                digest = member_digest(zin, partname)
+                if digest not in self.media:
+                    self.media[digest] = self._write_copy(zin, partname)
+                self._source_media[key] = self.media[digest]
+            return self._source_media[key]
+
+        _copied = {} if _copied is None else _copied
+        if partname in _copied:
+            return _copied[partname]
+        out_name = self._write_copy(zin, partname)
+        _copied[partname] = out_name
+
+        rels = []
+        for rel in read_rels(zin, partname):
+            if rel['external']:
+                rels.append(rel)
+                continue
+            child = self.copy_part(zin, resolve_target(partname, rel['target']), _copied)
+            if child is not None:
+                rels.append(dict(rel, target=relative_target(out_name, child)))
+        if rels:
+            write_member(self.zout, rels_name(out_name), rels_xml(rels))
+        return out_name
+
+    def copy_existing(self, zin, partname):
+        """
+        파트를 같은 이름으로 복사 (rels 파트가 있으면 함께)
+
+        이전 출력에서 파트를 재사용할 때 사용한다. 이름은 생성 시 names에 예약되어 있어야 한다.
+        """
+        copy_member(zin, zin.getinfo(partname), self.zout)
+        if rels_name(partname) in zin.NameToInfo:
+            copy_member(zin, zin.getinfo(rels_name(partname)), self.zout)
+        self._add_content_type(zin, partname, partname)
+
+    def _write_copy(self, zin, partname):
+        """파트를 새 이름으로 기록하고 콘텐츠 타입 등록"""
+        out_name = self._next_name(partname)
+        copy_member(zin, zin.getinfo(partname), self.zout, name=out_name)
+        self._add_content_type(zin, partname, out_name)
+        return out_name
+
+    def _add_content_type(self, zin, partname, out_name):
+        """원본 파트의 콘텐츠 타입을 출력 파트에 등록 (Override 또는 확장자 Default)"""
+        if id(zin) not in self._ct_maps:
+            self._ct_maps[id(zin)] = content_type_map(zin)
+        ct_map = self._ct_maps[id(zin)]
+        content_type = content_type_for(ct_map, partname)
+        extension = posixpath.splitext(out_name)[1][1:].lower()
+        if partname in ct_map['overrides']:
+            add_override(self.content_types, out_name, content_type)
+        elif extension not in self._defaults and content_type:
+            add_default(self.content_types, extension, content_type)
+            self._defaults.add(extension)
+
+    def _next_name(self, partname):
+        """'ppt/media/image3.png' -> 출력에서 사용되지 않은 'ppt/media/imageN.png'"""
+        prefix, _, suffix = re.fullmatch(r'(.*?)(\d*)(\.[^./]*)?', partname).groups()
+        suffix = suffix or ''
+        key = (prefix, suffix)
+        if key not in self._counters:
+            pattern = re.compile(re.escape(prefix) + r'(\d+)' + re.escape(suffix))
+            self._counters[key] = max((int(m.group(1)) for m in map(pattern.fullmatch, self.names) if m),
+                                      default=0)
+        n = self._counters[key] + 1
+        while f'{prefix}{n}{suffix}' in self.names:
+            n += 1
+        self._counters[key] = n
+        name = f'{prefix}{n}{suffix}'
+        self.names.add(name)
+        return name
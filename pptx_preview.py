@@ -0,0 +1,637 @@
+#!/usr/bin/env python3
+"""
+슬라이드 미리보기 내보내기 (SVG/HTML, 슬라이드별 내용 해시 캐시)
+
+병합/생성한 덱을 PowerPoint로 열지 않고 검토할 수 있도록 슬라이드마다 shape 위치/크기,
+도형 채우기/테두리, 텍스트(pptx_textfit으로 줄바꿈), 표 격자를 가벼운 SVG로 그리고
+index.html에 모아 보여준다. 그림/차트/미디어는 이름을 적은 상자로 표시한다.
+placeholder 위치/크기와 글자 크기는 레이아웃 -> 마스터 순으로 상속값을 찾는다
+(analyze_layout과 같은 기준).
+
+미리보기는 슬라이드 XML, 레이아웃/마스터/테마 XML, 슬라이드 크기, PREVIEW_VERSION의 SHA-256을
+키로 디스크에 캐시한다. 슬라이드 몇 장만 고친 덱을 다시 내보내면 바뀐 슬라이드만 다시 그리고,
+출력 폴더에서도 키가 바뀐 파일만 다시 쓴다. 다시 그릴 슬라이드가 많으면 프로세스 풀에 나눈다.
+
+사용법:
+    python pptx_preview.py jjiban_presentation.pptx                 # -> jjiban_presentation_preview/
+    python pptx_preview.py 결과.pptx -o previews --workers 4
+    python pptx_preview.py 결과.pptx --no-cache                    # 캐시 무시하고 모두 다시 그리기
+
+출력:
+    <출력>/slide_001.svg ...   슬라이드별 미리보기
+    <출력>/index.html          전체 슬라이드 목록
+    <출력>/previews.json       슬라이드별 캐시 키 (다음 내보내기에서 바뀐 파일만 쓰기 위해 사용)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape, quoteattr
+import argparse
+import colorsys
+import hashlib
+import json
+import os
+import sys
+import time
+
+import pptx_package as pkg
+from pptx_merge import analyze_theme
+from pptx_textfit import DEFAULT_INSETS, LINE_SPACING, TextFitter
+
+# 미리보기 형식이 바뀌면 올린다 (이전 캐시는 자동으로 무시됨)
+PREVIEW_VERSION = '1'
+
+PREVIEW_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'gendoc', 'previews')
+
+MANIFEST_FILE = 'previews.json'
+
+# 다시 그릴 슬라이드가 이보다 많을 때만 프로세스 풀 사용 (풀 시작 비용)
+PARALLEL_MIN_SLIDES = 16
+
+EMU_PER_PX = 9525    # 96 DPI
+PX_PER_PT = 96 / 72
+
+DEFAULT_TITLE_SIZE = 28
+DEFAULT_TEXT_SIZE = 18
+DEFAULT_TABLE_SIZE = 12
+
+_TITLE_TYPES = ('title', 'ctrTitle')
+
+# placeholder 종류 -> 마스터에서 상속하는 placeholder 종류 (pptx_merge._layout_placeholders와 같은 기준)
+_MASTER_PLACEHOLDER = {
+    'body': 'body', 'chart': 'body', 'clipArt': 'body', 'ctrTitle': 'title', 'dgm': 'body', 'dt': 'dt',
+    'ftr': 'ftr', 'media': 'body', 'obj': 'body', 'pic': 'body', 'sldNum': 'sldNum', 'subTitle': 'body',
+    'tbl': 'body', 'title': 'title',
+}
+
+# schemeClr 별칭 -> 테마 색 슬롯
+_SCHEME_ALIASES = {'bg1': 'lt1', 'tx1': 'dk1', 'bg2': 'lt2', 'tx2': 'dk2'}
+
+_ALIGN = {'ctr': 'middle', 'r': 'end', 'just': 'start', 'dist': 'start'}
+
+_A_BR = pkg.qn('a:br')
+_A_R = pkg.qn('a:r')
+_A_FLD = pkg.qn('a:fld')
+_P_SP = pkg.qn('p:sp')
+_P_PIC = pkg.qn('p:pic')
+_P_GRP = pkg.qn('p:grpSp')
+_P_CXN = pkg.qn('p:cxnSp')
+_P_FRAME = pkg.qn('p:graphicFrame')
+
+
+def _px(emu):
+    return round(emu / EMU_PER_PX, 2)
+
+
+# ============================================================
+# 슬라이드 렌더링
+# ============================================================
+
+class SlideRenderer:
+    """
+    패키지 하나의 슬라이드를 SVG로 그리기
+
+    레이아웃별 상속 정보(placeholder 위치/크기, 기본 글자 크기)는 한 번만 계산해 둔다.
+    """
+
+    def __init__(self, package, themes=None):
+        """
+        Args:
+            package: open_analysis() 결과 (pptx_package.LazyPackage)
+            themes: analyze_theme() 결과 (None이면 package에서 분석)
+        """
+        self.package = package
+        themes = analyze_theme(package, verbose=False) if themes is None else themes
+        self.width, self.height = slide_size(package)
+
+        self.colors = {}
+        fonts = {}
+        for theme in themes[:1]:
+            for color in (theme.get('color_scheme') or {}).get('colors', []):
+                self.colors[color['slot']] = color['value']
+            for font in (theme.get('font_scheme') or {}).get('fonts', []):
+                fonts[font['slot']] = font
+        self.font_family = {major: _css_fonts(fonts.get('majorFont' if major else 'minorFont'))
+                            for major in (True, False)}
+        self.fitters = {major: TextFitter.from_theme(themes, major=major) for major in (True, False)}
+        self._inherited = {}
+
+    # ---------- 상속 정보 ----------
+
+    def inherited(self, layout_partname):
+        """
+        레이아웃의 placeholder 상속 정보
+
+        Returns:
+            {('idx', n) 또는 ('type', 종류): {'x', 'y', 'cx', 'cy', 'size'}}
+            (레이아웃에 없는 값은 마스터의 같은 종류 placeholder / txStyles에서)
+        """
+        if layout_partname in self._inherited:
+            return self._inherited[layout_partname]
+
+        masters = pkg.rel_targets(self.package.zf, layout_partname, pkg.RT_SLIDE_MASTER).values()
+        master = next(iter(masters), None)
+        master_info = {}
+        if master is not None:
+            master_root = self.package.xml(master)
+            styles = {'title': _style_size(master_root, 'p:titleStyle'),
+                      'body': _style_size(master_root, 'p:bodyStyle')}
+            other = _style_size(master_root, 'p:otherStyle')
+            for shape in pkg.iter_shape_elms(self.package.sp_tree(master)):
+                ph = pkg.shape_ph(shape)
+                if ph is not None:
+                    ph_type = ph.get('type', 'obj')
+                    info = pkg.shape_xfrm(shape)
+                    info['size'] = _list_style_size(shape) or styles.get(ph_type) or other
+                    master_info.setdefault(ph_type, info)
+
+        inherited = {}
+        for shape in pkg.iter_shape_elms(self.package.sp_tree(layout_partname)):
+            ph = pkg.shape_ph(shape)
+            if ph is None:
+                continue
+            ph_type = ph.get('type', 'obj')
+            info = pkg.shape_xfrm(shape)
+            info['size'] = _list_style_size(shape)
+            base = master_info.get(_MASTER_PLACEHOLDER.get(ph_type), {})
+            info = {k: v if v is not None else base.get(k) for k, v in info.items()}
+            inherited.setdefault(('type', ph_type), info)
+            if ph.get('idx') is not None:
+                inherited.setdefault(('idx', ph.get('idx')), info)
+        # 레이아웃에 없는 종류는 마스터 값
+        for ph_type, info in master_info.items():
+            inherited.setdefault(('type', ph_type), info)
+
+        self._inherited[layout_partname] = inherited
+        return inherited
+
+    # ---------- SVG ----------
+
+    def render(self, partname):
+        """슬라이드 하나의 SVG 문자열"""
+        layout = next(iter(pkg.rel_targets(self.package.zf, partname, pkg.RT_SLIDE_LAYOUT).values()), None)
+        inherited = self.inherited(layout) if layout is not None else {}
+        out = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {_px(self.width)} {_px(self.height)}" '
+               f'width="{_px(self.width)}" height="{_px(self.height)}" '
+               f'font-family={quoteattr(self.font_family[False])}>',
+               f'<rect width="100%" height="100%" fill="#{self.colors.get("lt1", "ffffff")}"/>']
+        self._render_tree(self.package.sp_tree(partname), inherited, (1.0, 1.0, 0.0, 0.0), out)
+        out.append('</svg>')
+        return '\n'.join(out)
+
+    def _render_tree(self, sp_tree, inherited, transform, out):
+        for elm in pkg.iter_shape_elms(sp_tree):
+            geometry = pkg.shape_xfrm(elm)
+            ph = pkg.shape_ph(elm)
+            ph_type = ph.get('type', 'obj') if ph is not None else None
+            if ph is not None:
+                # idx가 있으면 레이아웃의 같은 idx, 없으면 같은 종류 placeholder
+                base = inherited.get(('idx', ph.get('idx'))) or inherited.get(('type', ph_type), {})
+                geometry = {k: v if v is not None else base.get(k) for k, v in geometry.items()}
+                geometry['size'] = base.get('size')
+            if None in (geometry['x'], geometry['y'], geometry['cx'], geometry['cy']):
+                continue
+            x, y, cx, cy = _apply(transform, geometry)
+
+            if elm.tag == _P_GRP:
+                self._render_tree(elm, inherited, _group_transform(elm, transform), out)
+            elif elm.tag == _P_CXN:
+                self._render_connector(elm, x, y, cx, cy, out)
+            elif elm.tag == _P_PIC:
+                self._render_box(out, x, y, cx, cy, '그림', _shape_name(elm))
+            elif elm.tag == _P_FRAME:
+                table = elm.find('a:graphic/a:graphicData/a:tbl', pkg.NS)
+                if table is not None:
+                    self._render_table(table, x, y, cx, cy, transform, out)
+                else:
+                    self._render_box(out, x, y, cx, cy, '개체', _shape_name(elm))
+            else:
+                self._render_shape(elm, x, y, cx, cy, ph_type, geometry.get('size'), out)
+
+    def _rotation(self, elm, x, y, cx, cy):
+        xfrm = elm.find('p:spPr/a:xfrm', pkg.NS)
+        rot = int(xfrm.get('rot', 0)) / 60000 if xfrm is not None else 0
+        return f' transform="rotate({rot:g} {_px(x + cx / 2)} {_px(y + cy / 2)})"' if rot else ''
+
+    def _render_shape(self, elm, x, y, cx, cy, ph_type, size, out):
+        sp_pr = elm.find('p:spPr', pkg.NS)
+        fill = self.color(sp_pr.find('a:solidFill', pkg.NS)) if sp_pr is not None else None
+        line = sp_pr.find('a:ln', pkg.NS) if sp_pr is not None else None
+        stroke = self.color(line.find('a:solidFill', pkg.NS)) if line is not None else None
+        if fill is None and sp_pr is not None and sp_pr.find('a:noFill', pkg.NS) is None:
+            fill = self.color(elm.find('p:style/a:fillRef', pkg.NS))
+        if stroke is None and (line is None or line.find('a:noFill', pkg.NS) is None):
+            stroke = self.color(elm.find('p:style/a:lnRef', pkg.NS))
+        stroke_width = _px(int(line.get('w'))) if line is not None and line.get('w') else 1
+
+        attrs = f'fill="{fill or "none"}"'
+        if stroke:
+            attrs += f' stroke="{stroke}" stroke-width="{stroke_width}"'
+        elif ph_type is not None and not fill:
+            # 채우기/테두리가 없는 placeholder는 위치만 점선으로 표시
+            attrs += ' stroke="#c0c0c0" stroke-width="1" stroke-dasharray="4 3"'
+
+        out.append(f'<g{self._rotation(elm, x, y, cx, cy)}>')
+        geom = elm.find('p:spPr/a:prstGeom', pkg.NS)
+        preset = geom.get('prst') if geom is not None else 'rect'
+        if preset == 'ellipse':
+            out.append(f'<ellipse cx="{_px(x + cx / 2)}" cy="{_px(y + cy / 2)}" rx="{_px(cx / 2)}" '
+                       f'ry="{_px(cy / 2)}" {attrs}/>')
+        else:
+            radius = f' rx="{_px(min(cx, cy) / 6)}"' if preset in ('roundRect', 'round2SameRect') else ''
+            out.append(f'<rect x="{_px(x)}" y="{_px(y)}" width="{_px(cx)}" height="{_px(cy)}"{radius} {attrs}/>')
+
+        tx_body = elm.find('p:txBody', pkg.NS)
+        if tx_body is not None:
+            major = ph_type in _TITLE_TYPES
+            default_size = size or (DEFAULT_TITLE_SIZE if major else DEFAULT_TEXT_SIZE)
+            self._render_text(tx_body, x, y, cx, cy, default_size, major, out)
+        out.append('</g>')
+
+    def _render_connector(self, elm, x, y, cx, cy, out):
+        xfrm = elm.find('p:spPr/a:xfrm', pkg.NS)
+        x1, x2 = (x + cx, x) if xfrm is not None and xfrm.get('flipH') == '1' else (x, x + cx)
+        y1, y2 = (y + cy, y) if xfrm is not None and xfrm.get('flipV') == '1' else (y, y + cy)
+        line = elm.find('p:spPr/a:ln', pkg.NS)
+        stroke = (self.color(line.find('a:solidFill', pkg.NS)) if line is not None else None) \
+            or self.color(elm.find('p:style/a:lnRef', pkg.NS)) or '#000000'
+        out.append(f'<line x1="{_px(x1)}" y1="{_px(y1)}" x2="{_px(x2)}" y2="{_px(y2)}" stroke="{stroke}"/>')
+
+    def _render_box(self, out, x, y, cx, cy, kind, name):
+        """그림/차트 등 그리지 않는 개체 자리 표시"""
+        out.append(f'<rect x="{_px(x)}" y="{_px(y)}" width="{_px(cx)}" height="{_px(cy)}" fill="#eeeeee" '
+                   f'stroke="#999999"/>')
+        out.append(f'<text x="{_px(x + cx / 2)}" y="{_px(y + cy / 2)}" text-anchor="middle" '
+                   f'dominant-baseline="middle" font-size="12" fill="#666666">{escape(f"{kind}: {name}")}</text>')
+
+    def _render_table(self, table, x, y, cx, cy, transform, out):
+        sx, sy = transform[0], transform[1]
+        widths = [int(col.get('w', 0)) * sx for col in table.iterfind('a:tblGrid/a:gridCol', pkg.NS)]
+        row_y = y
+        for row in table.iterfind('a:tr', pkg.NS):
+            row_height = int(row.get('h', 0)) * sy
+            col_x = x
+            for width, cell in zip(widths, row.iterfind('a:tc', pkg.NS)):
+                fill = self.color(cell.find('a:tcPr/a:solidFill', pkg.NS))
+                out.append(f'<rect x="{_px(col_x)}" y="{_px(row_y)}" width="{_px(width)}" '
+                           f'height="{_px(row_height)}" fill="{fill or "none"}" stroke="#808080"/>')
+                tx_body = cell.find('a:txBody', pkg.NS)
+                if tx_body is not None and cell.get('hMerge') != '1' and cell.get('vMerge') != '1':
+                    self._render_text(tx_body, col_x, row_y, width, row_height, DEFAULT_TABLE_SIZE, False, out)
+                col_x += width
+            row_y += row_height
+
+    def _render_text(self, tx_body, x, y, cx, cy, default_size, major, out):
+        """텍스트 프레임 (문단별 정렬/글자 크기/굵게/색, 상자 폭 기준 줄바꿈)"""
+        body_pr = tx_body.find('a:bodyPr', pkg.NS)
+        insets = tuple(int(body_pr.get(attr, default)) if body_pr is not None else default
+                       for attr, default in zip(('lIns', 'tIns', 'rIns', 'bIns'), DEFAULT_INSETS))
+        wrap = body_pr is None or body_pr.get('wrap') != 'none'
+        fitter = self.fitters[major]
+
+        lines = []
+        for para in tx_body.iterfind('a:p', pkg.NS):
+            run_pr = para.find('a:r/a:rPr', pkg.NS)
+            if run_pr is None:
+                run_pr = para.find('a:endParaRPr', pkg.NS)
+            size = int(run_pr.get('sz')) / 100 if run_pr is not None and run_pr.get('sz') else default_size
+            bold = run_pr is not None and run_pr.get('b') == '1'
+            color = (self.color(run_pr.find('a:solidFill', pkg.NS)) if run_pr is not None else None) \
+                or f'#{self.colors.get("dk1", "000000")}'
+            ppr = para.find('a:pPr', pkg.NS)
+            align = _ALIGN.get(ppr.get('algn') if ppr is not None else None, 'start')
+            indent = int(ppr.get('lvl', 0)) * 457200 if ppr is not None else 0
+
+            text = ''.join('\n' if child.tag == _A_BR else child.findtext('a:t', '', pkg.NS)
+                           for child in para if child.tag in (_A_BR, _A_R, _A_FLD))
+            for part in text.split('\n'):
+                wrapped = fitter.wrap(part, cx - indent, size, bold, insets) if wrap and part else [part]
+                lines += [(line, size, bold, color, align, indent) for line in wrapped]
+
+        text_height = sum(size * LINE_SPACING for _, size, *_ in lines) * EMU_PER_PX * PX_PER_PT
+        anchor = body_pr.get('anchor', 't') if body_pr is not None else 't'
+        top = y + insets[1]
+        if anchor == 'ctr':
+            top = y + (cy - text_height) / 2
+        elif anchor == 'b':
+            top = y + cy - insets[3] - text_height
+
+        if not any(line for line, *_ in lines):
+            return
+        out.append(f'<text font-family={quoteattr(self.font_family[major])}>')
+        for line, size, bold, color, align, indent in lines:
+            top += size * LINE_SPACING * PX_PER_PT * EMU_PER_PX
+            if not line:
+                continue
+            if align == 'middle':
+                line_x = x + (insets[0] + indent + cx - insets[2]) / 2
+            elif align == 'end':
+                line_x = x + cx - insets[2]
+            else:
+                line_x = x + insets[0] + indent
+            weight = ' font-weight="bold"' if bold else ''
+            out.append(f'<tspan x="{_px(line_x)}" y="{_px(top - size * 0.25 * PX_PER_PT * EMU_PER_PX)}" '
+                       f'font-size="{size * PX_PER_PT:.4g}" fill="{color}" text-anchor="{align}"{weight}>'
+                       f'{escape(line)}</tspan>')
+        out.append('</text>')
+
+    def color(self, fill):
+        """a:solidFill / p:style 참조의 색 (#rrggbb, 없으면 None) - lumMod/lumOff 반영"""
+        if fill is None:
+            return None
+        value = None
+        clr = fill.find('a:srgbClr', pkg.NS)
+        if clr is not None:
+            value = clr.get('val')
+        else:
+            clr = fill.find('a:schemeClr', pkg.NS)
+            if clr is not None:
+                value = self.colors.get(_SCHEME_ALIASES.get(clr.get('val'), clr.get('val')))
+        if not value or len(value) != 6:
+            return None
+
+        lum_mod = clr.find('a:lumMod', pkg.NS)
+        lum_off = clr.find('a:lumOff', pkg.NS)
+        if lum_mod is not None or lum_off is not None:
+            r, g, b = (int(value[i:i + 2], 16) / 255 for i in (0, 2, 4))
+            h, l, s = colorsys.rgb_to_hls(r, g, b)
+            l = l * (int(lum_mod.get('val')) / 100000 if lum_mod is not None else 1)
+            l = min(1.0, l + (int(lum_off.get('val')) / 100000 if lum_off is not None else 0))
+            value = ''.join(f'{round(c * 255):02x}' for c in colorsys.hls_to_rgb(h, l, s))
+        return f'#{value.lower()}'
+
+
+def slide_size(package):
+    """슬라이드 크기 (EMU, sldSz가 없으면 16:9 기본값)"""
+    sld_sz = package.presentation.find('p:sldSz', pkg.NS)
+    if sld_sz is None:
+        return 12192000, 6858000
+    return int(sld_sz.get('cx')), int(sld_sz.get('cy'))
+
+
+def _css_fonts(font):
+    """테마 글꼴 -> CSS font-family 목록"""
+    names = [font['ea'], font['latin']] if font else []
+    names = [name for name in dict.fromkeys(names) if name]
+    return ', '.join([f"'{name}'" for name in names] + ["'Malgun Gothic'", 'sans-serif'])
+
+
+def _style_size(master_root, style):
+    """마스터 txStyles 1수준 기본 글자 크기 (pt, 없으면 None)"""
+    rpr = master_root.find(f'p:txStyles/{style}/a:lvl1pPr/a:defRPr', pkg.NS)
+    return int(rpr.get('sz')) / 100 if rpr is not None and rpr.get('sz') else None
+
+
+def _list_style_size(shape):
+    """shape lstStyle 1수준 기본 글자 크기 (pt, 없으면 None)"""
+    rpr = shape.find('p:txBody/a:lstStyle/a:lvl1pPr/a:defRPr', pkg.NS)
+    return int(rpr.get('sz')) / 100 if rpr is not None and rpr.get('sz') else None
+
+
+def _shape_name(elm):
+    c_nv_pr = elm.find('./*[1]/p:cNvPr', pkg.NS)
+    return c_nv_pr.get('name', '') if c_nv_pr is not None else ''
+
+
+def _apply(transform, geometry):
+    """(sx, sy, dx, dy) 변환 적용 -> (x, y, cx, cy)"""
+    sx, sy, dx, dy = transform
+    return (geometry['x'] * sx + dx, geometry['y'] * sy + dy, geometry['cx'] * sx, geometry['cy'] * sy)
+
+
+def _group_transform(grp, transform):
+    """그룹 shape 자식 좌표(chOff/chExt) -> 슬라이드 좌표 변환"""
+    xfrm = grp.find('p:grpSpPr/a:xfrm', pkg.NS)
+    if xfrm is None:
+        return transform
+    off, ext = xfrm.find('a:off', pkg.NS), xfrm.find('a:ext', pkg.NS)
+    ch_off, ch_ext = xfrm.find('a:chOff', pkg.NS), xfrm.find('a:chExt', pkg.NS)
+    if None in (off, ext, ch_off, ch_ext):
+        return transform
+    gsx = int(ext.get('cx')) / int(ch_ext.get('cx')) if int(ch_ext.get('cx')) else 1.0
+    gsy = int(ext.get('cy')) / int(ch_ext.get('cy')) if int(ch_ext.get('cy')) else 1.0
+    gdx = int(off.get('x')) - int(ch_off.get('x')) * gsx
+    gdy = int(off.get('y')) - int(ch_off.get('y')) * gsy
+    sx, sy, dx, dy = transform
+    return (sx * gsx, sy * gsy, sx * gdx + dx, sy * gdy + dy)
+
+
+# ============================================================
+# 캐시 키
+# ============================================================
+
+def slide_keys(package):
+    """
+    슬라이드별 미리보기 캐시 키 (SHA-256 hex, 슬라이드 순서)
+
+    슬라이드 XML + 레이아웃/마스터 XML + 테마 XML + 슬라이드 크기 + PREVIEW_VERSION.
+    레이아웃/마스터/테마 해시는 파트마다 한 번만 계산한다.
+    """
+    zf = package.zf
+    digests = {}
+
+    def digest(partname):
+        if partname not in digests:
+            digests[partname] = pkg.member_digest(zf, partname) if partname in zf.NameToInfo else ''
+        return digests[partname]
+
+    deck = [PREVIEW_VERSION, *slide_size(package)]
+    deck += [digest(name) for name in sorted(package.namelist()) if 'theme1.xml' in name]
+
+    keys = []
+    for partname in package.slide_partnames():
+        layout = next(iter(pkg.rel_targets(zf, partname, pkg.RT_SLIDE_LAYOUT).values()), None)
+        master = next(iter(pkg.rel_targets(zf, layout, pkg.RT_SLIDE_MASTER).values()), None) if layout else None
+        parts = [hashlib.sha256(zf.read(partname)).hexdigest(),
+                 digest(layout) if layout else '', digest(master) if master else '']
+        keys.append(hashlib.sha256(json.dumps(deck + parts).encode()).hexdigest())
+    return keys
+
+
+def _cache_file(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], key + '.svg')
+
+
+def _write_text(path, text):
+    """원자적 텍스트 파일 쓰기 (tmp -> os.replace)"""
+    tmp_file = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_file, path)
+
+
+# ============================================================
+# 병렬 렌더링
+# ============================================================
+
+_worker_renderer = None
+
+
+def _init_preview_worker(pptx_file, themes):
+    global _worker_renderer
+    _worker_renderer = SlideRenderer(pkg.LazyPackage(pptx_file), themes)
+
+
+def _render_worker(partname):
+    return _worker_renderer.render(partname)
+
+
+def render_slides(renderer, pptx_file, partnames, workers=None):
+    """
+    슬라이드 SVG 목록 (partnames 순서)
+
+    PARALLEL_MIN_SLIDES개 이상이고 workers가 1이 아니면 프로세스 풀에서 그린다
+    (worker마다 패키지를 한 번 열고 레이아웃 상속 정보를 재사용).
+    """
+    workers = min(workers or os.cpu_count() or 1, len(partnames))
+    if workers <= 1 or len(partnames) < PARALLEL_MIN_SLIDES:
+        return [renderer.render(partname) for partname in partnames]
+
+    themes = analyze_theme(renderer.package, verbose=False)
+    chunksize = max(1, len(partnames) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_preview_worker,
+                             initargs=(pptx_file, themes)) as executor:
+        return list(executor.map(_render_worker, partnames, chunksize=chunksize))
+
+
+# ============================================================
+# 내보내기
+# ============================================================
+
+def _index_html(title, slides, width, height):
+    items = '\n'.join(
+        f'<figure id="slide-{slide["index"] + 1}"><img src="{slide["file"]}" loading="lazy" '
+        f'width="{_px(width)}" height="{_px(height)}" alt="슬라이드 {slide["index"] + 1}">'
+        f'<figcaption>{slide["index"] + 1}. {escape(slide["layout"] or "")}</figcaption></figure>'
+        for slide in slides)
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<title>{escape(title)} 미리보기</title>
+<style>
+body {{ margin: 0; padding: 24px; background: #e5e5e5; font-family: 'Malgun Gothic', sans-serif; }}
+h1 {{ font-size: 18px; }}
+figure {{ margin: 0 0 24px; }}
+img {{ max-width: 100%; height: auto; background: #fff; box-shadow: 0 1px 4px rgba(0, 0, 0, .3); }}
+figcaption {{ font-size: 13px; color: #555; margin-top: 6px; }}
+</style>
+</head>
+<body>
+<h1>{escape(title)} ({len(slides)}장)</h1>
+{items}
+</body>
+</html>
+"""
+
+
+def export_previews(pptx_file, output_dir=None, workers=None, use_cache=True, cache_dir=PREVIEW_CACHE_DIR,
+                    verbose=True):
+    """
+    슬라이드 미리보기(SVG + index.html) 내보내기
+
+    Args:
+        pptx_file: PPTX 파일
+        output_dir: 출력 폴더 (None이면 <파일 이름>_preview)
+        workers: 다시 그릴 때 프로세스 수 (None이면 CPU 수, 1이면 순차)
+        use_cache: 캐시 사용 여부 (False이면 디스크 캐시와 출력 폴더의 previews.json을 무시하고
+                   모든 슬라이드를 다시 그려 쓴다 - 디스크 캐시에는 저장하지 않음)
+        cache_dir: 캐시 폴더
+        verbose: 결과 출력 여부
+
+    Returns:
+        {'output', 'slides', 'rendered', 'cached', 'written', 'seconds'}
+    """
+    start = time.perf_counter()
+    output_dir = output_dir or os.path.splitext(pptx_file)[0] + '_preview'
+    os.makedirs(output_dir, exist_ok=True)
+
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            previous = {slide['file']: slide['key'] for slide in json.load(f)['slides']}
+    except (OSError, ValueError, KeyError):
+        previous = {}
+
+    with pkg.LazyPackage(pptx_file) as package:
+        partnames = package.slide_partnames()
+        keys = slide_keys(package)
+        slides = []
+        for index, (partname, key) in enumerate(zip(partnames, keys)):
+            layout = next(iter(pkg.rel_targets(package.zf, partname, pkg.RT_SLIDE_LAYOUT).values()), None)
+            slides.append({'index': index, 'partname': partname, 'key': key, 'file': f'slide_{index + 1:03d}.svg',
+                           'layout': package.part_name(layout) if layout else None})
+
+        # 출력 폴더에 같은 키의 파일이 이미 있으면 읽을 필요도 없음 (use_cache=False이면 모두 다시)
+        stale = [slide for slide in slides if not use_cache or previous.get(slide['file']) != slide['key']
+                 or not os.path.exists(os.path.join(output_dir, slide['file']))]
+        svgs = {}
+        if use_cache:
+            for slide in stale:
+                try:
+                    with open(_cache_file(cache_dir, slide['key']), encoding='utf-8') as f:
+                        svgs[slide['key']] = f.read()
+                except OSError:
+                    pass
+        missing = list({slide['key']: slide for slide in stale if slide['key'] not in svgs}.values())
+
+        if missing:
+            renderer = SlideRenderer(package)
+            rendered = render_slides(renderer, pptx_file, [slide['partname'] for slide in missing], workers)
+            for slide, svg in zip(missing, rendered):
+                svgs[slide['key']] = svg
+                if use_cache:
+                    try:
+                        cache_file = _cache_file(cache_dir, slide['key'])
+                        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+                        _write_text(cache_file, svg)
+                    except OSError as e:
+                        print(f"Warning: 미리보기 캐시 저장 실패 ({e})", file=sys.stderr)
+
+        width, height = slide_size(package)
+
+    for slide in stale:
+        _write_text(os.path.join(output_dir, slide['file']), svgs[slide['key']])
+    if stale or not os.path.exists(os.path.join(output_dir, 'index.html')):
+        title = os.path.splitext(os.path.basename(pptx_file))[0]
+        _write_text(os.path.join(output_dir, 'index.html'), _index_html(title, slides, width, height))
+    manifest = {'file': os.path.basename(pptx_file), 'preview_version': PREVIEW_VERSION,
+                'slides': [{key: slide[key] for key in ('index', 'partname', 'layout', 'key', 'file')}
+                           for slide in slides]}
+    _write_text(os.path.join(output_dir, MANIFEST_FILE), json.dumps(manifest, ensure_ascii=False, indent=1))
+
+    # 슬라이드 수가 줄었으면 남은 파일 정리
+    for name in set(previous) - {slide['file'] for slide in slides}:
+        try:
+            os.remove(os.path.join(output_dir, name))
+        except OSError:
+            pass
+
+    rendered_keys = {slide['key'] for slide in missing}
+    stats = {'output': output_dir, 'slides': len(slides), 'rendered': len(missing),
+             'cached': sum(1 for slide in stale if slide['key'] not in rendered_keys),
+             'written': len(stale), 'seconds': round(time.perf_counter() - start, 3)}
+    if verbose:
+        print(f"✓ 미리보기: {output_dir}/index.html (슬라이드 {stats['slides']}장, 그림 {stats['rendered']}장, "
+              f"캐시 {stats['cached']}장, 쓰기 {stats['written']}장, {stats['seconds']:.2f}초)")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='슬라이드 미리보기 (SVG/HTML) 내보내기')
+    parser.add_argument('pptx_files', nargs='+', metavar='PPTX', help='PPTX 파일')
+    parser.add_argument('-o', '--output', help='출력 폴더 (파일이 하나일 때만, 기본: <파일 이름>_preview)')
+    parser.add_argument('--workers', type=int, help='다시 그릴 때 프로세스 수 (기본: CPU 수, 1이면 순차)')
+    parser.add_argument('--no-cache', action='store_true', help='캐시 무시하고 모두 다시 그리기')
+    parser.add_argument('--cache-dir', default=PREVIEW_CACHE_DIR, help=f'캐시 폴더 (기본: {PREVIEW_CACHE_DIR})')
+    args = parser.parse_args()
+
+    if args.output and len(args.pptx_files) > 1:
+        parser.error('-o는 파일이 하나일 때만 사용할 수 있습니다')
+    for pptx_file in args.pptx_files:
+        export_previews(pptx_file, args.output, workers=args.workers, use_cache=not args.no_cache,
+                        cache_dir=args.cache_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+병합 파이프라인 단계별 시간 측정
+
+merge_pptx/merge_pptx_stream에 Profiler를 넘기면 단계(기본 양식 열기, 소스 열기,
+placeholder 제거, shape 복사, 템플릿 변환, 템플릿 검색, 저장 등)마다 소요 시간과
+요소 수/기록 바이트를 구조화된 이벤트로 남긴다. 외부 프로파일러 없이 어떤 슬라이드나
+단계가 느린지 확인하는 용도다.
+
+    profiler = Profiler(hook=print)          # 이벤트가 끝날 때마다 hook(event) 호출
+    merge_pptx_stream(base, source, output, profiler=profiler)
+    profiler.print_summary()
+    profiler.write_trace('merge.trace.json')  # chrome://tracing, Perfetto, speedscope에서 열기
+
+이벤트 형식:
+    {'phase': 단계 이름, 'slide': 슬라이드 번호(1-based) 또는 None,
+     'start_us': 측정 시작 기준 시작 시각, 'duration_us': 소요 시간, 'thread': 스레드 ID,
+     'args': {요소 수, 바이트 등 단계별 값}}
+"""
+
+from contextlib import contextmanager, nullcontext
+import json
+import os
+import threading
+import time
+
+
+class Profiler:
+    """단계별 시간 측정기 (스레드 안전 - 이벤트 목록에 추가만 함)"""
+
+    enabled = True
+
+    def __init__(self, hook=None):
+        """
+        Args:
+            hook: 이벤트가 끝날 때마다 event dict로 호출되는 함수 (None이면 기록만)
+        """
+        self.hook = hook
+        self.events = []
+        self._origin = time.perf_counter_ns()
+
+    @contextmanager
+    def phase(self, name, slide=None, **args):
+        """
+        단계 측정 구간
+
+        with 블록에서 받은 dict에 값을 넣으면 이벤트 args에 기록된다.
+
+            with profiler.phase('save') as info:
+                prs.save(output)
+                info['bytes'] = os.path.getsize(output)
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            end = time.perf_counter_ns()
+            event = {
+                'phase': name,
+                'slide': slide,
+                'start_us': (start - self._origin) // 1000,
+                'duration_us': (end - start) // 1000,
+                'thread': threading.get_ident(),
+                'args': args,
+            }
+            self.events.append(event)
+            if self.hook is not None:
+                self.hook(event)
+
+    def summary(self):
+        """
+        단계별/슬라이드별 집계
+
+        Returns:
+            {'phases': {단계: {'count', 'total_ms', 'max_ms', 합계 args...}},
+             'slides': [{'slide', 'total_ms', 'phases': {단계: ms}}] (느린 순)}
+        """
+        phases = {}
+        slides = {}
+        for event in self.events:
+            ms = event['duration_us'] / 1000
+            stat = phases.setdefault(event['phase'], {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            stat['count'] += 1
+            stat['total_ms'] += ms
+            stat['max_ms'] = max(stat['max_ms'], ms)
+            for key, value in event['args'].items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    stat[key] = stat.get(key, 0) + value
+
+            if event['slide'] is not None:
+                slide = slides.setdefault(event['slide'], {'slide': event['slide'], 'total_ms': 0.0, 'phases': {}})
+                slide['total_ms'] += ms
+                slide['phases'][event['phase']] = slide['phases'].get(event['phase'], 0.0) + ms
+
+        for stat in phases.values():
+            stat['total_ms'] = round(stat['total_ms'], 3)
+            stat['max_ms'] = round(stat['max_ms'], 3)
+        for slide in slides.values():
+            slide['total_ms'] = round(slide['total_ms'], 3)
+            slide['phases'] = {name: round(ms, 3) for name, ms in slide['phases'].items()}
+        return {
+            'phases': phases,
+            'slides': sorted(slides.values(), key=lambda s: s['total_ms'], reverse=True),
+        }
+
+    def print_summary(self, top=10):
+        """단계별 합계와 가장 느린 슬라이드 top개 출력"""
+        summary = self.summary()
+        print("\n단계별 소요 시간:")
+        for name, stat in sorted(summary['phases'].items(), key=lambda item: -item[1]['total_ms']):
+            extra = ', '.join(f'{key} {value:,}' if isinstance(value, int) else f'{key} {value:,.1f}'
+                              for key, value in stat.items() if key not in ('count', 'total_ms', 'max_ms'))
+            print(f"  {name:<20} {stat['total_ms']:10.1f}ms  ({stat['count']}회, 최대 {stat['max_ms']:.1f}ms)"
+                  + (f"  [{extra}]" if extra else ''))
+
+        if summary['slides']:
+            print(f"\n느린 슬라이드 (상위 {min(top, len(summary['slides']))}개):")
+            for slide in summary['slides'][:top]:
+                detail = ', '.join(f'{name} {ms:.1f}' for name, ms in
+                                   sorted(slide['phases'].items(), key=lambda item: -item[1]))
+                print(f"  슬라이드 {slide['slide']:>4}: {slide['total_ms']:8.1f}ms  ({detail})")
+
+    def chrome_trace(self):
+        """Chrome trace 형식 (Trace Event Format, 'X' 이벤트) - speedscope/Perfetto에서도 열림"""
+        pid = os.getpid()
+        trace_events = []
+        for event in self.events:
+            args = dict(event['args'])
+            if event['slide'] is not None:
+                args['slide'] = event['slide']
+            name = event['phase'] if event['slide'] is None else f"{event['phase']} #{event['slide']}"
+            trace_events.append({
+                'name': name,
+                'cat': event['phase'],
+                'ph': 'X',
+                'ts': event['start_us'],
+                'dur': event['duration_us'],
+                'pid': pid,
+                'tid': event['thread'],
+                'args': args,
+            })
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_trace(self, path):
+        """Chrome trace JSON 파일로 저장"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+        return path
+
+
+class _NullProfiler:
+    """측정하지 않을 때 쓰는 Profiler (단계 구간이 아무 일도 하지 않음)"""
+
+    enabled = False
+
+    def phase(self, name, slide=None, **args):
+        return nullcontext(args)
+
+
+NULL_PROFILER = _NullProfiler()
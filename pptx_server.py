@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+PPTX 병합/분석/렌더링 상주 서버
+
+요청마다 인터프리터 시작, python-pptx/lxml import, 기본 양식 파싱 비용을 내지 않도록
+프로세스를 띄워 둔 채 HTTP로 작업을 받는다. 파싱한 기본 양식(load_base 결과)과 덱 명세
+컴파일러(DeckCompiler)는 메모리 상한이 있는 LRU 캐시에 보관하고, 파일이 바뀌면
+(수정 시각/크기 기준) 다시 읽는다.
+
+사용법:
+    python pptx_server.py --port 8765 --cache-mb 256
+    python pptx_merge.py --serve 127.0.0.1:8765
+
+API (요청/응답 본문은 JSON, PPTX 결과는 바이너리로 스트리밍):
+    POST /merge    {"base": 경로, "source": 경로, "layout": 8, "template": true} -> PPTX
+    POST /render   덱 명세 (deck_spec.py 형식, template은 서버 기준 경로) -> PPTX
+    POST /analyze  {"file": 경로, "layout": 8, "all_layouts": false, "theme": false} -> JSON
+    GET  /stats    캐시 상태 -> JSON
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import io
+import json
+import os
+import shutil
+import threading
+import time
+import zipfile
+
+from deck_spec import DeckCompiler
+from pptx_merge import analyze_report, load_base, merge_pptx_stream
+import pptx_package as pkg
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_MB = 256
+
+PPTX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+
+
+# ============================================================
+# 템플릿 캐시
+# ============================================================
+
+def _base_size(key, base):
+    """load_base() 결과의 메모리 사용량 추정치 (바이트)"""
+    size = len(base['pres_xml']) + len(base['content_types'])
+    size += sum(len(name) + 64 for name in base['names'])
+    size += sum(len(name) + 128 for name in base['media'])
+    return size
+
+
+@lru_cache(maxsize=256)
+def _package_size(path, mtime_ns, size):
+    """템플릿 패키지의 압축 해제 크기 - DeckCompiler가 파싱해 둘 수 있는 XML 양의 상한 추정치"""
+    with zipfile.ZipFile(path, 'r') as zf:
+        return sum(info.file_size for info in zf.infolist()
+                   if not info.filename.startswith(pkg.MEDIA_PREFIX))
+
+
+def _compiler_size(key, compiler):
+    """DeckCompiler 메모리 사용량 추정치 (파싱 XML 상한 + 캐시한 슬라이드 구성 PPTX)"""
+    return _package_size(*key[1:]) + compiler.skeleton_bytes
+
+
+class _Entry:
+    """캐시 항목 - 사용 중(refs > 0)인 항목은 제거하지 않음"""
+
+    def __init__(self):
+        self.value = None
+        self.nbytes = 0
+        self.refs = 0
+        self.error = None
+        self.ready = threading.Event()
+        self.lock = threading.Lock()    # 항목 값을 쓰는 작업 직렬화 (덱 컴파일)
+
+
+class TemplateCache:
+    """
+    파싱한 템플릿을 보관하는 LRU 캐시 (메모리 상한은 항목별 추정치의 합 기준)
+
+    키는 (종류, 절대 경로, 수정 시각, 크기)라 파일이 바뀌면 새 항목으로 다시 읽는다.
+    항목마다 잠금을 두어 같은 템플릿에 대한 상태 있는 작업(덱 컴파일)을 직렬화한다.
+
+    템플릿 읽기와 항목 닫기는 전역 잠금 밖에서 한다 (느린 템플릿 하나가 다른 템플릿
+    요청을 막지 않음). 같은 템플릿을 동시에 요청하면 한 번만 읽고 나머지는 기다린다.
+    사용 중인 항목은 제거하지 않으며, 항목 크기는 사용이 끝날 때마다 다시 추정한다
+    (DeckCompiler의 슬라이드 구성 캐시 포함).
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # 키 -> _Entry
+        self._lock = threading.Lock()
+
+    def base(self, path):
+        """스트리밍 병합용 기본 양식 (load_base 결과) - with 블록에서 (값, 항목 잠금)"""
+        return self.use('base', path, load_base, _base_size)
+
+    def compiler(self, path):
+        """덱 명세 컴파일러 - with 블록에서 (DeckCompiler, 항목 잠금 - 컴파일 중 보유)"""
+        return self.use('deck', path, DeckCompiler, _compiler_size)
+
+    @contextmanager
+    def use(self, kind, path, loader, sizer):
+        """
+        캐시된 템플릿 사용 (없으면 loader(path)로 읽어 저장)
+
+        with 블록 동안 항목이 제거/닫히지 않는다.
+
+        Args:
+            sizer: sizer(키, 값) -> 추정 크기 (바이트)
+
+        Yields:
+            (값, 항목 잠금)
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (kind, path, stat.st_mtime_ns, stat.st_size)
+        entry = self._acquire(key, loader, sizer)
+        try:
+            yield entry.value, entry.lock
+        finally:
+            self._release(key, entry, sizer)
+
+    def _acquire(self, key, loader, sizer):
+        with self._lock:
+            entry = self._entries.get(key)
+            loading = entry is None
+            if loading:
+                self.misses += 1
+                entry = self._entries[key] = _Entry()
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            entry.refs += 1
+
+        if not loading:
+            entry.ready.wait()
+            if entry.error is not None:
+                self._release(key, entry, sizer)
+                raise entry.error
+            return entry
+
+        try:
+            entry.value = loader(key[1])
+            entry.nbytes = sizer(key, entry.value)
+        except BaseException as e:
+            entry.error = e
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            entry.ready.set()
+            with self._lock:
+                entry.refs -= 1
+            raise
+        with self._lock:
+            self.total_bytes += entry.nbytes
+        entry.ready.set()
+        return entry
+
+    def _release(self, key, entry, sizer):
+        """사용 종료 - 크기 다시 추정 후 상한을 넘으면 사용 중이 아닌 오래된 항목 제거"""
+        nbytes = sizer(key, entry.value) if entry.error is None else 0
+        with self._lock:
+            entry.refs -= 1
+            if entry.error is None and self._entries.get(key) is entry:
+                self.total_bytes += nbytes - entry.nbytes
+                entry.nbytes = nbytes
+            victims = self._evict()
+        self._close(victims)
+
+    def _evict(self):
+        """상한을 넘으면 사용 중이 아닌 항목을 오래된 순서로 꺼냄 (전역 잠금 안에서 호출, 닫지는 않음)"""
+        victims = []
+        for key in list(self._entries):
+            if self.total_bytes <= self.max_bytes:
+                break
+            entry = self._entries[key]
+            if entry.refs == 0 and entry.ready.is_set():
+                del self._entries[key]
+                self.total_bytes -= entry.nbytes
+                victims.append(entry)
+        return victims
+
+    @staticmethod
+    def _close(entries):
+        for entry in entries:
+            if hasattr(entry.value, 'close'):
+                entry.value.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': [{'kind': key[0], 'path': key[1], 'bytes': entry.nbytes, 'in_use': entry.refs}
+                            for key, entry in self._entries.items() if entry.ready.is_set()],
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def close(self):
+        with self._lock:
+            entries = [entry for entry in self._entries.values() if entry.ready.is_set()]
+            self._entries.clear()
+            self.total_bytes = 0
+        self._close(entries)
+
+
+# ============================================================
+# 작업
+# ============================================================
+
+def run_merge(cache, job):
+    """병합 작업 (스트리밍 모드) -> PPTX 바이트 스트림"""
+    output = io.BytesIO()
+    with cache.base(job['base']) as (base, _):
+        merge_pptx_stream(base['path'], job['source'], output, job.get('layout'),
+                          job.get('template', True), base=base, verbose=False)
+    output.seek(0)
+    return output
+
+
+def run_render(cache, spec):
+    """덱 명세 렌더링 -> PPTX 바이트 스트림"""
+    output = io.BytesIO()
+    with cache.compiler(spec['template']) as (compiler, lock), lock:
+        prs = compiler.compile(spec)
+    prs.save(output)
+    output.seek(0)
+    return output
+
+
+def run_analyze(job):
+    """분석 작업 -> 보고서 dict (분석 결과는 pptx_merge의 파일 해시 캐시 사용)"""
+    return analyze_report(job['file'], job.get('layout'), job.get('all_layouts', False),
+                          job.get('theme', False), use_cache=job.get('cache', True))
+
+
+# ============================================================
+# HTTP
+# ============================================================
+
+class JobHandler(BaseHTTPRequestHandler):
+    """작업 요청 처리 (server.cache: TemplateCache)"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send_json(200, self.server.cache.stats())
+        else:
+            self._send_json(404, {'error': f'알 수 없는 경로: {self.path}'})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            job = json.loads(self.rfile.read(length) or b'{}')
+            if self.path == '/merge':
+                self._send_pptx(run_merge(self.server.cache, job))
+            elif self.path == '/render':
+                self._send_pptx(run_render(self.server.cache, job))
+            elif self.path == '/analyze':
+                self._send_json(200, run_analyze(job))
+            else:
+                self._send_json(404, {'error': f'알 수 없는 경로: {self.path}'})
+        except (KeyError, ValueError, IndexError, OSError) as e:
+            self._send_json(400, {'error': f'{type(e).__name__}: {e}'})
+        except Exception as e:
+            self._send_json(500, {'error': f'{type(e).__name__}: {e}'})
+        finally:
+            self.log_message('%s %.3f초', self.path, time.perf_counter() - start)
+
+    def _send_pptx(self, stream):
+        self.send_response(200)
+        self.send_header('Content-Type', PPTX_CONTENT_TYPE)
+        self.send_header('Content-Length', str(stream.getbuffer().nbytes))
+        self.end_headers()
+        shutil.copyfileobj(stream, self.wfile, pkg.COPY_CHUNK_SIZE)
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, cache_mb=DEFAULT_CACHE_MB):
+    """작업 서버 생성 (serve_forever()로 실행)"""
+    server = ThreadingHTTPServer((host, port), JobHandler)
+    server.daemon_threads = True
+    server.cache = TemplateCache(cache_mb * 1024 * 1024)
+    return server
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, cache_mb=DEFAULT_CACHE_MB):
+    """작업 서버 실행 (Ctrl+C로 종료)"""
+    server = make_server(host, port, cache_mb)
+    print(f"서버 시작: http://{host}:{server.server_address[1]} (템플릿 캐시 {cache_mb}MB)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n서버 종료")
+    finally:
+        server.server_close()
+        server.cache.close()
+
+
+def parse_address(address):
+    """'HOST:PORT', 'PORT', 'HOST' -> (host, port)"""
+    host, sep, port = address.rpartition(':')
+    if not sep:
+        return (DEFAULT_HOST, int(address)) if address.isdigit() else (address, DEFAULT_PORT)
+    return host or DEFAULT_HOST, int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PPTX 병합/분석/렌더링 상주 서버')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'바인드 주소 (기본: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'포트 (기본: {DEFAULT_PORT})')
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_MB,
+                        help=f'템플릿 캐시 메모리 상한 MB (기본: {DEFAULT_CACHE_MB})')
+    args = parser.parse_args()
+    serve(args.host, args.port, args.cache_mb)
+
+
+if __name__ == "__main__":
+    main()
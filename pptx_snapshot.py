@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+템플릿 스냅샷 (컴파일한 템플릿 정보 사이드카)
+
+병합/덱 생성 작업마다 기본 양식을 다시 열어 마스터/레이아웃/테마 XML을 파싱하고
+레이아웃 인덱스, placeholder 위치, 템플릿 슬라이드 구성을 다시 찾는 대신, 템플릿을 한 번
+컴파일해 <템플릿>.snapshot.json에 저장해 두고 이후 작업은 스냅샷만 읽는다.
+
+스냅샷 내용:
+    - 분석 결과 (analyze_pptx / analyze_all_layouts / analyze_theme)
+    - 슬라이드별 레이아웃, 제목, shape 목록 (이름, placeholder, 텍스트, 위치/크기, 토큰)
+    - 미디어 SHA-256 (load_base가 미디어를 다시 해시하지 않음)
+    - ZIP 멤버 오프셋 (중앙 디렉터리를 읽지 않고 멤버 하나만 바로 읽기)
+
+스냅샷은 템플릿 SHA-256으로 검증한다. 크기/수정 시각이 컴파일 때와 같으면 해시 계산을
+생략하고, 다르면 해시를 다시 계산해 내용이 같을 때만 사용한다. 검증에 실패하거나
+형식/TOOL_VERSION이 다른 스냅샷은 없는 것으로 취급한다 (각 도구는 템플릿을 직접 읽음).
+
+사용법:
+    python pptx_snapshot.py PPT기본양식.pptx PPT기본양식_병합.pptx    # 컴파일
+    python pptx_snapshot.py PPT기본양식_병합.pptx --check              # 스냅샷 유효 여부만 확인
+
+스냅샷을 사용하는 곳:
+    pptx_merge.load_base (스트리밍/일괄 병합, 상주 서버), deck_spec.DeckCompiler (create_presentation)
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zipfile
+import zlib
+
+import pptx_package as pkg
+from pptx_merge import (TOOL_VERSION, analyze_all_layouts, analyze_pptx, analyze_theme, file_sha256,
+                        open_analysis, slide_tokens_xml)
+
+SNAPSHOT_FORMAT = 1
+
+# 스냅샷 사이드카 파일 (<템플릿>.snapshot.json)
+SNAPSHOT_SUFFIX = '.snapshot.json'
+
+_TITLE_TYPES = ('title', 'ctrTitle')
+
+
+def snapshot_path(template_pptx):
+    return template_pptx + SNAPSHOT_SUFFIX
+
+
+# ============================================================
+# 컴파일
+# ============================================================
+
+def shape_map(sp_tree):
+    """
+    spTree의 shape 목록 (python-pptx slide.shapes 순서)
+
+    Returns:
+        [{'name', 'placeholder', 'text', 'x', 'y', 'cx', 'cy', 'tokens'}]
+        (placeholder는 p:ph type - 생략 시 'obj', placeholder가 아니면 None / 위치/크기는 EMU)
+    """
+    shapes = []
+    for elm in pkg.iter_shape_elms(sp_tree):
+        ph = pkg.shape_ph(elm)
+        c_nv_pr = elm.find('./*[1]/p:cNvPr', pkg.NS)
+        shapes.append({
+            'name': c_nv_pr.get('name', '') if c_nv_pr is not None else '',
+            'placeholder': ph.get('type', 'obj') if ph is not None else None,
+            'text': pkg.shape_text(elm),
+            **pkg.shape_xfrm(elm),
+            'tokens': slide_tokens_xml(elm),
+        })
+    return shapes
+
+
+def _slide_title(shapes):
+    """제목 placeholder 텍스트 (없으면 텍스트가 있는 첫 shape의 첫 줄)"""
+    for shape in shapes:
+        if shape['placeholder'] in _TITLE_TYPES and shape['text']:
+            return shape['text'].split('\n')[0]
+    for shape in shapes:
+        if shape['text'].strip():
+            return shape['text'].strip().split('\n')[0]
+    return ''
+
+
+def slide_maps(package):
+    """
+    슬라이드별 레이아웃/제목/shape 목록 (스냅샷의 'slides' 형식)
+
+    Args:
+        package: open_analysis() 결과
+
+    Returns:
+        [{'index', 'partname', 'layout', 'layout_index': [마스터, 레이아웃] 또는 None,
+          'name', 'title', 'tokens', 'shapes': shape_map() 결과}]
+    """
+    layout_index = {}
+    for master_index, master in enumerate(package.master_partnames()):
+        for index, layout in enumerate(package.layout_partnames(master)):
+            layout_index[layout] = [master_index, index]
+
+    slides = []
+    for index, partname in enumerate(package.slide_partnames()):
+        shapes = shape_map(package.sp_tree(partname))
+        layout = next(iter(pkg.rel_targets(package.zf, partname, pkg.RT_SLIDE_LAYOUT).values()), None)
+        slides.append({
+            'index': index,
+            'partname': partname,
+            'layout': layout,
+            'layout_index': layout_index.get(layout),
+            'name': package.part_name(partname),
+            'title': _slide_title(shapes),
+            'tokens': list(dict.fromkeys(token for shape in shapes for token in shape['tokens'])),
+            'shapes': shapes,
+        })
+    return slides
+
+
+def compile_template(template_pptx, output=None, verbose=True):
+    """
+    템플릿을 컴파일해 스냅샷 저장
+
+    Args:
+        template_pptx: 템플릿 PPTX
+        output: 스냅샷 파일 (None이면 <템플릿>.snapshot.json)
+        verbose: 결과 출력 여부
+
+    Returns:
+        스냅샷 파일 경로
+    """
+    start = time.perf_counter()
+    output = output or snapshot_path(template_pptx)
+    stat = os.stat(template_pptx)
+
+    with open_analysis(template_pptx) as package:
+        zf = package.zf
+        slides = slide_maps(package)
+        snapshot = {
+            'format': SNAPSHOT_FORMAT,
+            'tool_version': TOOL_VERSION,
+            'template': os.path.basename(template_pptx),
+            'sha256': file_sha256(template_pptx),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'main_partname': package.main_partname,
+            'masters': [{'partname': master, 'layouts': package.layout_partnames(master)}
+                        for master in package.master_partnames()],
+            'pres_rels': pkg.read_rels(zf, package.main_partname),
+            'pptx': analyze_pptx(package, verbose=False),
+            'layouts': analyze_all_layouts(package, verbose=False),
+            'theme': analyze_theme(package, verbose=False),
+            'slides': slides,
+            'media': {name: pkg.member_digest(zf, name)
+                      for name in zf.namelist() if name.startswith(pkg.MEDIA_PREFIX)},
+            # 이름 -> [로컬 헤더 오프셋, 압축 크기, 원래 크기, CRC-32, 압축 방식] (ZIP 순서)
+            'members': {info.filename: [info.header_offset, info.compress_size, info.file_size,
+                                        info.CRC, info.compress_type] for info in zf.infolist()},
+        }
+    snapshot['pptx']['file'] = snapshot['template']
+
+    tmp_file = f'{output}.{os.getpid()}.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_file, output)
+
+    if verbose:
+        tokens = sum(len(slide['tokens']) for slide in slides)
+        print(f"✓ 스냅샷: {output} (슬라이드 {len(slides)}개, 레이아웃 {len(snapshot['layouts'])}개, "
+              f"토큰 {tokens}개, 멤버 {len(snapshot['members'])}개, "
+              f"{os.path.getsize(output) / 1024:.0f}KB, {time.perf_counter() - start:.2f}초)")
+    return output
+
+
+# ============================================================
+# 로드
+# ============================================================
+
+class TemplateSnapshot:
+    """검증된 템플릿 스냅샷 (load_snapshot 결과)"""
+
+    def __init__(self, template_pptx, data):
+        self.path = template_pptx
+        self.data = data
+
+    @property
+    def slides(self):
+        return self.data['slides']
+
+    def slide_partnames(self):
+        return [slide['partname'] for slide in self.data['slides']]
+
+    def read_member(self, name):
+        """ZIP 멤버 하나를 기록된 오프셋에서 바로 읽기 (중앙 디렉터리를 읽지 않음)"""
+        offset, compress_size, file_size, crc, compress_type = self.data['members'][name]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            header = struct.unpack(zipfile.structFileHeader, f.read(zipfile.sizeFileHeader))
+            if header[0] != zipfile.stringFileHeader:
+                raise zipfile.BadZipFile(f'{self.path}: {name} 로컬 헤더가 스냅샷과 다름')
+            f.seek(header[10] + header[11], os.SEEK_CUR)
+            data = f.read(compress_size)
+        if compress_type == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -zlib.MAX_WBITS)
+        elif compress_type != zipfile.ZIP_STORED:
+            raise zipfile.BadZipFile(f'{self.path}: {name} 지원하지 않는 압축 방식 ({compress_type})')
+        if len(data) != file_size or zlib.crc32(data) != crc:
+            raise zipfile.BadZipFile(f'{self.path}: {name} CRC가 스냅샷과 다름')
+        return data
+
+    def base_info(self):
+        """pptx_merge.load_base()와 같은 기본 양식 정보 (미디어 해시/레이아웃 목록은 스냅샷에서)"""
+        pres_name = self.data['main_partname']
+        layouts = self.data['masters'][0]['layouts']
+        names = {layout['index']: layout['name'] for layout in self.data['layouts']
+                 if layout['master_index'] == 0}
+        return {
+            'path': self.path,
+            'pres_name': pres_name,
+            'pres_xml': self.read_member(pres_name),
+            'pres_rels': [dict(rel) for rel in self.data['pres_rels']],
+            'content_types': self.read_member(pkg.CONTENT_TYPES),
+            'slides': self.slide_partnames(),
+            'layouts': layouts,
+            'layout_names': [names[index] for index in range(len(layouts))],
+            'names': list(self.data['members']),
+            'media': dict(self.data['media']),
+        }
+
+
+def load_snapshot(template_pptx, snapshot_file=None):
+    """
+    템플릿의 스냅샷 읽기
+
+    Returns:
+        TemplateSnapshot (스냅샷이 없거나, 템플릿이 바뀌었거나, 형식/도구 버전이 다르면 None)
+    """
+    snapshot_file = snapshot_file or snapshot_path(template_pptx)
+    try:
+        with open(snapshot_file, encoding='utf-8') as f:
+            data = json.load(f)
+        stat = os.stat(template_pptx)
+    except (OSError, ValueError):
+        return None
+
+    if data.get('format') != SNAPSHOT_FORMAT or data.get('tool_version') != TOOL_VERSION:
+        return None
+    if (stat.st_size, stat.st_mtime_ns) != (data.get('size'), data.get('mtime_ns')):
+        # 수정 시각만 바뀐 경우(복사 등)는 내용 해시가 같으면 사용
+        if stat.st_size != data.get('size') or file_sha256(template_pptx) != data.get('sha256'):
+            return None
+    return TemplateSnapshot(template_pptx, data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='템플릿 스냅샷 컴파일 (<템플릿>.snapshot.json)')
+    parser.add_argument('templates', nargs='+', metavar='TEMPLATE', help='템플릿 PPTX')
+    parser.add_argument('--check', action='store_true', help='컴파일하지 않고 스냅샷 유효 여부만 확인')
+    args = parser.parse_args()
+
+    stale = False
+    for template in args.templates:
+        if args.check:
+            start = time.perf_counter()
+            snapshot = load_snapshot(template)
+            if snapshot is None:
+                stale = True
+                print(f"✗ {template}: 스냅샷 없음 또는 템플릿 변경됨")
+            else:
+                print(f"✓ {template}: 유효 (슬라이드 {len(snapshot.slides)}개, "
+                      f"로드 {(time.perf_counter() - start) * 1000:.1f}ms)")
+        else:
+            compile_template(template)
+
+    if stale:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+텍스트 맞춤 엔진 (글꼴 폭 캐시 기반 줄바꿈/글자 크기 계산)
+
+LLM이 만든 한글 텍스트가 고정 크기 상자(Inches(...))를 넘치는지 외부 렌더러 없이 계산한다.
+로컬 TTF/OTF/TTC 글꼴의 cmap/hmtx 테이블을 직접 읽어(fontTools 불필요) 글자별 advance
+폭을 구하고, 256자 단위 블록으로 LRU 캐시한다 (한글/한자처럼 범위가 넓은 글자도 쓰는
+블록만 읽음). 폭은 em 단위이므로 글꼴 하나의 표를 모든 글자 크기가 공유하고, 텍스트의
+단어 폭은 한 번만 계산해 여러 글자 크기 후보에 재사용한다.
+
+    fitter = TextFitter.from_theme(analyze_theme('PPT기본양식.pptx', verbose=False))
+    fitter.fit('긴 본문 ...', Inches(4), Inches(1.5), max_size=18)   # {'size', 'lines', 'fits', ...}
+    fitter.fit_many([{'text': ..., 'width': ..., 'height': ...}, ...])
+
+글꼴 찾기: GENDOC_FONT_DIRS(os.pathsep 구분) -> 시스템 글꼴 디렉터리 순서로 찾으며, 글꼴의
+name 테이블에 있는 모든 이름(한글 이름 포함, 예: '맑은 고딕', '본고딕')으로 찾을 수 있다.
+글꼴이나 글자가 없으면 동아시아 전각 1em / 그 외 0.55em 근사값을 사용한다.
+
+줄바꿈은 PowerPoint 기본 동작을 따른다: 공백에서 줄을 바꾸고(한글은 어절 단위), 한자/가나는
+글자마다 바꿀 수 있으며, 상자보다 긴 단어는 글자 단위로 자른다.
+
+사용법:
+    python pptx_textfit.py '측정할 텍스트' --width 4 --height 1.5 --max-size 18 --font '본고딕 Normal'
+    python pptx_textfit.py --list-fonts
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+import argparse
+import bisect
+import mmap
+import os
+import re
+import struct
+import sys
+import unicodedata
+
+EMU_PER_PT = 12700
+
+# PowerPoint 텍스트 상자 기본 여백 (bodyPr lIns/tIns/rIns/bIns, EMU)
+DEFAULT_INSETS = (91440, 45720, 91440, 45720)
+
+# 줄 간격 1.0(한 줄)일 때 줄 높이 / 글자 크기
+LINE_SPACING = 1.2
+
+DEFAULT_MAX_SIZE = 18
+DEFAULT_MIN_SIZE = 8
+SIZE_STEP = 0.5
+
+# 굵게 표시할 때 폭 보정 (굵은 글꼴 파일을 따로 찾지 않음)
+BOLD_WIDTH_FACTOR = 1.05
+
+# 글꼴별 글자 폭 블록(256자) 캐시 크기 - 한글 음절 전체가 약 44블록
+GLYPH_BLOCK_CACHE_SIZE = 2048
+_BLOCK_BITS = 8
+
+# TextFitter별 줄바꿈 단위(단어/글자) 폭 캐시 크기 (LRU)
+WIDTH_CACHE_SIZE = 8192
+
+# 글꼴을 찾지 못했을 때 시도할 글꼴 (앞에서부터)
+FALLBACK_FONTS = {
+    'latin': ['Malgun Gothic', 'Arial', 'Liberation Sans', 'DejaVu Sans'],
+    'ea': ['Malgun Gothic', 'Source Han Sans KR', 'Noto Sans CJK KR', 'NanumGothic', 'Apple SD Gothic Neo'],
+}
+
+# 근사 폭 (em) - 글꼴이 없을 때
+_APPROX_WIDE = 1.0
+_APPROX_NARROW = 0.55
+_APPROX_SPACE = 0.28
+
+_REGULAR_STYLES = ('regular', 'normal', 'book', 'roman')
+
+_FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc', '.otc')
+
+# 글자 단위 줄바꿈이 가능한 글자 (한자/가나/CJK 기호) - 한글은 어절 단위
+_CJK = '\u2e80-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uff0f'
+_BREAK_UNIT = re.compile(rf'\s+|[{_CJK}]|[^\s{_CJK}]+')
+
+
+def system_font_dirs():
+    """글꼴 디렉터리 목록 (GENDOC_FONT_DIRS 우선)"""
+    dirs = [d for d in os.environ.get('GENDOC_FONT_DIRS', '').split(os.pathsep) if d]
+    windir = os.environ.get('WINDIR')
+    if windir:
+        dirs.append(os.path.join(windir, 'Fonts'))
+        dirs.append(os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Microsoft', 'Windows', 'Fonts'))
+    dirs += ['/Library/Fonts', '/System/Library/Fonts', os.path.expanduser('~/Library/Fonts'),
+             '/usr/share/fonts', '/usr/local/share/fonts', os.path.expanduser('~/.fonts'),
+             os.path.expanduser('~/.local/share/fonts')]
+    return [d for d in dirs if os.path.isdir(d)]
+
+
+# ============================================================
+# 글꼴 파일 (cmap/hmtx/name 테이블 직접 읽기)
+# ============================================================
+
+class FontFile:
+    """
+    TTF/OTF 글꼴 하나 (TTC는 index로 선택)
+
+    파일은 mmap으로 열어 필요한 테이블만 읽는다. advance(ch)는 글자 폭(em)이며
+    글꼴에 없는 글자는 None이다.
+    """
+
+    def __init__(self, path, index=0):
+        self.path = path
+        self.index = index
+        with open(path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self._data
+
+        offset = 0
+        if data[:4] == b'ttcf':
+            count = struct.unpack_from('>L', data, 8)[0]
+            if index >= count:
+                raise IndexError(f'{path}: 글꼴 모음 인덱스 범위 초과 ({index})')
+            offset = struct.unpack_from('>L', data, 12 + 4 * index)[0]
+        num_tables = struct.unpack_from('>H', data, offset + 4)[0]
+        self._tables = {}
+        for i in range(num_tables):
+            tag, _, table_offset, length = struct.unpack_from('>4sLLL', data, offset + 12 + 16 * i)
+            self._tables[tag.decode('latin-1')] = (table_offset, length)
+
+        self.units_per_em = struct.unpack_from('>H', data, self._table('head') + 18)[0]
+        self._num_hmetrics = struct.unpack_from('>H', data, self._table('hhea') + 34)[0]
+        self._hmtx = self._table('hmtx')
+        self._load_cmap()
+
+    def _table(self, tag):
+        if tag not in self._tables:
+            raise ValueError(f'{self.path}: {tag} 테이블 없음')
+        return self._tables[tag][0]
+
+    def _load_cmap(self):
+        """유니코드 cmap 하위 테이블 선택 (format 12 우선, 없으면 format 4)"""
+        data = self._data
+        base = self._table('cmap')
+        subtables = {}
+        for i in range(struct.unpack_from('>H', data, base + 2)[0]):
+            platform, encoding, offset = struct.unpack_from('>HHL', data, base + 4 + 8 * i)
+            fmt = struct.unpack_from('>H', data, base + offset)[0]
+            subtables.setdefault((fmt, platform, encoding), base + offset)
+
+        for key in ((12, 3, 10), (12, 0, 4), (12, 0, 6), (4, 3, 1), (4, 0, 3), (4, 0, 4)):
+            if key in subtables:
+                offset = subtables[key]
+                break
+        else:
+            raise ValueError(f'{self.path}: 유니코드 cmap 없음')
+
+        self._cmap_format = key[0]
+        if key[0] == 12:
+            groups = struct.unpack_from('>L', data, offset + 12)[0]
+            self._groups = [struct.unpack_from('>LLL', data, offset + 16 + 12 * i) for i in range(groups)]
+            self._group_starts = [group[0] for group in self._groups]
+        else:
+            seg_count = struct.unpack_from('>H', data, offset + 6)[0] // 2
+            self._ends = struct.unpack_from(f'>{seg_count}H', data, offset + 14)
+            starts_at = offset + 16 + 2 * seg_count
+            self._starts = struct.unpack_from(f'>{seg_count}H', data, starts_at)
+            self._deltas = struct.unpack_from(f'>{seg_count}h', data, starts_at + 2 * seg_count)
+            self._range_offsets_at = starts_at + 4 * seg_count
+            self._range_offsets = struct.unpack_from(f'>{seg_count}H', data, self._range_offsets_at)
+
+    def glyph_id(self, code):
+        """코드 포인트의 글리프 번호 (없으면 0)"""
+        if self._cmap_format == 12:
+            i = bisect.bisect_right(self._group_starts, code) - 1
+            if i < 0:
+                return 0
+            start, end, glyph = self._groups[i]
+            return glyph + code - start if code <= end else 0
+
+        if code > 0xFFFF:
+            return 0
+        i = bisect.bisect_left(self._ends, code)
+        if i >= len(self._ends) or self._starts[i] > code:
+            return 0
+        range_offset = self._range_offsets[i]
+        if range_offset == 0:
+            return (code + self._deltas[i]) & 0xFFFF
+        address = self._range_offsets_at + 2 * i + range_offset + 2 * (code - self._starts[i])
+        glyph = struct.unpack_from('>H', self._data, address)[0]
+        return (glyph + self._deltas[i]) & 0xFFFF if glyph else 0
+
+    def glyph_advance(self, glyph):
+        """글리프 advance 폭 (em)"""
+        index = min(glyph, self._num_hmetrics - 1)
+        return struct.unpack_from('>H', self._data, self._hmtx + 4 * index)[0] / self.units_per_em
+
+    def advance(self, ch):
+        """글자 폭 (em, 글꼴에 없으면 None) - 256자 블록 단위 LRU 캐시"""
+        code = ord(ch)
+        return _block_advances(self, code >> _BLOCK_BITS)[code & ((1 << _BLOCK_BITS) - 1)]
+
+    def names(self):
+        """
+        name 테이블의 글꼴 이름 (family, family + style, full name - 모든 언어)
+
+        기본 굵기 글꼴이면 self.regular를 True로 설정한다.
+        """
+        if 'name' not in self._tables:
+            return set()
+        data = self._data
+        base = self._table('name')
+        count, string_offset = struct.unpack_from('>HH', data, base + 2)
+        found = {}
+        for i in range(count):
+            platform, encoding, language, name_id, length, offset = \
+                struct.unpack_from('>6H', data, base + 6 + 12 * i)
+            if name_id not in (1, 2, 4, 16, 17):
+                continue
+            raw = data[base + string_offset + offset:base + string_offset + offset + length]
+            if platform == 3 or platform == 0:
+                text = raw.decode('utf-16-be', errors='ignore')
+            elif platform == 1 and encoding == 0:
+                text = raw.decode('mac-roman', errors='ignore')
+            else:
+                continue
+            found.setdefault((platform, language), {})[name_id] = text
+
+        self.regular = any(by_id.get(2, '').lower() in _REGULAR_STYLES for by_id in found.values())
+        names = set()
+        for by_id in found.values():
+            for family_id, style_id in ((1, 2), (16, 17)):
+                family = by_id.get(family_id)
+                if family:
+                    names.add(family)
+                    if by_id.get(style_id):
+                        names.add(f'{family} {by_id[style_id]}')
+            if by_id.get(4):
+                names.add(by_id[4])
+        return {name.strip() for name in names if name.strip()}
+
+
+@lru_cache(maxsize=GLYPH_BLOCK_CACHE_SIZE)
+def _block_advances(font, block):
+    """글꼴의 256자 블록 글자 폭 (em, 없는 글자는 None)"""
+    advances = []
+    for code in range(block << _BLOCK_BITS, (block + 1) << _BLOCK_BITS):
+        glyph = font.glyph_id(code)
+        advances.append(font.glyph_advance(glyph) if glyph else None)
+    return tuple(advances)
+
+
+# ============================================================
+# 글꼴 찾기
+# ============================================================
+
+def _font_faces(path):
+    """글꼴 파일의 (경로, 인덱스) 목록 (TTC는 모든 글꼴)"""
+    with open(path, 'rb') as f:
+        header = f.read(12)
+    if header[:4] == b'ttcf':
+        return [(path, i) for i in range(struct.unpack_from('>L', header, 8)[0])]
+    return [(path, 0)]
+
+
+@lru_cache(maxsize=8)
+def font_catalog(dirs=None):
+    """
+    글꼴 이름(소문자) -> (경로, 인덱스)
+
+    Args:
+        dirs: 검색할 디렉터리 튜플 (None이면 system_font_dirs())
+    """
+    catalog = {}
+    regular = set()
+    for directory in dirs if dirs is not None else system_font_dirs():
+        for root, dirnames, filenames in os.walk(directory):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if not filename.lower().endswith(_FONT_EXTENSIONS):
+                    continue
+                try:
+                    for path, index in _font_faces(os.path.join(root, filename)):
+                        font = FontFile(path, index)
+                        for name in map(str.lower, font.names()):
+                            # 패밀리 이름만으로는 기본 굵기 글꼴을 찾음
+                            if name not in catalog or (font.regular and name not in regular):
+                                catalog[name] = (path, index)
+                                if font.regular:
+                                    regular.add(name)
+                except (OSError, ValueError, IndexError, struct.error):
+                    continue
+    return catalog
+
+
+@lru_cache(maxsize=64)
+def load_font(typeface):
+    """
+    글꼴 이름 또는 파일 경로로 FontFile 열기 (없으면 None)
+
+    'Malgun Gothic Bold', '본고딕 Medium'처럼 굵기가 붙은 이름은 전체 이름이 없으면
+    굵기를 뗀 이름으로 다시 찾는다.
+    """
+    if not typeface:
+        return None
+    if os.path.isfile(typeface):
+        return FontFile(typeface)
+
+    catalog = font_catalog()
+    key = typeface.strip().lower()
+    candidates = [key]
+    if ' ' in key:
+        candidates.append(key.rsplit(' ', 1)[0])
+    for candidate in candidates:
+        if candidate in catalog:
+            return FontFile(*catalog[candidate])
+    return None
+
+
+def _first_font(typefaces):
+    for typeface in typefaces:
+        font = load_font(typeface)
+        if font is not None:
+            return font
+    return None
+
+
+def is_east_asian(ch):
+    """동아시아 글꼴(ea)로 그리는 전각 글자 여부"""
+    return unicodedata.east_asian_width(ch) in 'WF'
+
+
+# ============================================================
+# 줄바꿈 / 글자 크기 맞춤
+# ============================================================
+
+class TextFitter:
+    """
+    글꼴 한 쌍(라틴/동아시아)에 대한 텍스트 폭 측정, 줄바꿈, 글자 크기 맞춤
+
+    PowerPoint처럼 전각 글자(한글/한자/가나)는 ea 글꼴, 나머지는 latin 글꼴로 잰다.
+    """
+
+    def __init__(self, latin=None, ea=None, line_spacing=LINE_SPACING, width_cache_size=WIDTH_CACHE_SIZE):
+        """
+        Args:
+            latin: 라틴 글꼴 이름 또는 파일 경로 (None이면 FALLBACK_FONTS)
+            ea: 동아시아 글꼴 이름 또는 파일 경로 (None이면 latin, 그다음 FALLBACK_FONTS)
+            line_spacing: 줄 높이 / 글자 크기
+            width_cache_size: 단위 폭 캐시에 보관할 최대 단위 수
+        """
+        self.latin = _first_font([latin] + FALLBACK_FONTS['latin'])
+        self.ea = _first_font([ea, latin] + FALLBACK_FONTS['ea'])
+        self.line_spacing = line_spacing
+        self.width_cache_size = width_cache_size
+        self._widths = OrderedDict()
+
+    @classmethod
+    def from_theme(cls, themes, major=False, **kwargs):
+        """
+        analyze_theme() 결과의 첫 번째 글꼴 스키마로 생성
+
+        Args:
+            major: True이면 제목 글꼴(majorFont), False이면 본문 글꼴(minorFont)
+        """
+        slot = 'majorFont' if major else 'minorFont'
+        for theme in themes or []:
+            for font in (theme.get('font_scheme') or {}).get('fonts', []):
+                if font['slot'] == slot:
+                    return cls(font['latin'], font['ea'], **kwargs)
+        return cls(**kwargs)
+
+    def char_width(self, ch):
+        """글자 폭 (em)"""
+        primary, secondary = (self.ea, self.latin) if is_east_asian(ch) else (self.latin, self.ea)
+        for font in (primary, secondary):
+            if font is not None:
+                width = font.advance(ch)
+                if width is not None:
+                    return width
+        if ch.isspace():
+            return _APPROX_SPACE
+        return _APPROX_WIDE if is_east_asian(ch) else _APPROX_NARROW
+
+    def unit_width(self, unit):
+        """줄바꿈 단위(단어/글자/공백) 폭 (em) - LRU 캐시"""
+        if unit in self._widths:
+            self._widths.move_to_end(unit)
+            return self._widths[unit]
+        width = self._widths[unit] = sum(self.char_width(ch) for ch in unit)
+        if len(self._widths) > self.width_cache_size:
+            self._widths.popitem(last=False)
+        return width
+
+    def text_width(self, text):
+        """텍스트 폭 (em) - 줄바꿈 단위 폭의 합 (줄/문단 전체는 캐시하지 않음)"""
+        return sum(self.unit_width(unit) for unit in _BREAK_UNIT.findall(text))
+
+    def _units(self, text):
+        """문단별 줄바꿈 단위 [(단위, 폭 em, 공백 여부)]"""
+        return [[(unit, self.unit_width(unit), unit.isspace()) for unit in _BREAK_UNIT.findall(paragraph)]
+                for paragraph in text.split('\n')]
+
+    def _wrap_units(self, units, limit):
+        """줄바꿈 단위를 limit(em) 폭으로 배치 -> 줄 목록"""
+        lines = []
+        line, width = '', 0.0
+        for unit, unit_width, space in units:
+            if space:
+                line += unit
+                width += unit_width
+                continue
+            if line.strip() and width + unit_width > limit:
+                lines.append(line.rstrip())
+                line, width = '', 0.0
+            if unit_width > limit:
+                # 상자보다 긴 단어는 글자 단위로 자름
+                for ch in unit:
+                    ch_width = self.char_width(ch)
+                    if line and width + ch_width > limit:
+                        lines.append(line.rstrip())
+                        line, width = '', 0.0
+                    line += ch
+                    width += ch_width
+                continue
+            if not line.strip():
+                line, width = '', 0.0
+            line += unit
+            width += unit_width
+        lines.append(line.rstrip())
+        return lines
+
+    def wrap(self, text, width, size, bold=False, insets=DEFAULT_INSETS):
+        """
+        텍스트 줄바꿈
+
+        Args:
+            width: 상자 폭 (EMU - python-pptx Length 그대로)
+            size: 글자 크기 (pt)
+
+        Returns:
+            줄 목록 ('\\n' 문단 구분 포함)
+        """
+        limit = self._limit(width, size, bold, insets)
+        return [line for units in self._units(text) for line in self._wrap_units(units, limit)]
+
+    def _limit(self, width, size, bold, insets):
+        usable = (width - insets[0] - insets[2]) / EMU_PER_PT
+        return usable / (size * (BOLD_WIDTH_FACTOR if bold else 1.0))
+
+    def fit(self, text, width, height, max_size=DEFAULT_MAX_SIZE, min_size=None, step=SIZE_STEP,
+            bold=False, insets=DEFAULT_INSETS):
+        """
+        상자에 들어가는 가장 큰 글자 크기
+
+        max_size부터 step 간격의 크기 후보를 이진 탐색한다 (크기가 작을수록 줄 수가 줄지 않음).
+        min_size에서도 넘치면 min_size와 fits=False를 반환한다.
+
+        Args:
+            width, height: 상자 크기 (EMU)
+            min_size: 최소 글자 크기 (None이면 DEFAULT_MIN_SIZE와 max_size 중 작은 값)
+
+        Returns:
+            {'size', 'lines': 줄 목록, 'line_count', 'height': 텍스트 높이 (EMU), 'fits'}
+
+        Raises:
+            ValueError: min_size가 max_size보다 크거나 step이 0 이하
+        """
+        if min_size is None:
+            min_size = min(DEFAULT_MIN_SIZE, max_size)
+        if min_size > max_size:
+            raise ValueError(f'min_size({min_size})가 max_size({max_size})보다 큼')
+        if step <= 0:
+            raise ValueError(f'step은 0보다 커야 함 ({step})')
+        paragraphs = self._units(text)
+        usable_height = (height - insets[1] - insets[3]) / EMU_PER_PT
+        sizes = []
+        size = max_size
+        while size >= min_size - 1e-9:
+            sizes.append(round(float(size), 2))
+            size -= step
+
+        def layout(size):
+            limit = self._limit(width, size, bold, insets)
+            lines = [line for units in paragraphs for line in self._wrap_units(units, limit)]
+            return lines, len(lines) * size * self.line_spacing
+
+        # 들어가는 가장 큰 크기 (sizes는 큰 순서)
+        low, high = 0, len(sizes) - 1
+        best = None
+        while low <= high:
+            mid = (low + high) // 2
+            lines, text_height = layout(sizes[mid])
+            if text_height <= usable_height and self._no_overflow(lines, width, sizes[mid], bold, insets):
+                best = (sizes[mid], lines, text_height)
+                high = mid - 1
+            else:
+                low = mid + 1
+
+        fits = best is not None
+        if not fits:
+            size = sizes[-1]
+            lines, text_height = layout(size)
+            best = (size, lines, text_height)
+        size, lines, text_height = best
+        return {'size': size, 'lines': lines, 'line_count': len(lines),
+                'height': round(text_height * EMU_PER_PT), 'fits': fits}
+
+    def _no_overflow(self, lines, width, size, bold, insets):
+        """글자 하나도 들어가지 않을 만큼 좁은 상자가 아닌지 확인"""
+        limit = self._limit(width, size, bold, insets)
+        return all(self.text_width(line) <= limit + 1e-9 for line in lines)
+
+    def fit_many(self, items):
+        """
+        여러 상자 일괄 맞춤 (글꼴 폭/단어 폭 캐시 공유)
+
+        Args:
+            items: [{'text', 'width', 'height', 'max_size', 'min_size', 'bold'}] (크기 EMU, 뒤 3개 선택)
+
+        Returns:
+            items 순서대로 fit() 결과
+        """
+        return [self.fit(item['text'], item['width'], item['height'],
+                         item.get('max_size', DEFAULT_MAX_SIZE), item.get('min_size'),
+                         bold=item.get('bold', False))
+                for item in items]
+
+
+@lru_cache(maxsize=16)
+def get_fitter(latin=None, ea=None):
+    """글꼴 쌍별로 공유하는 TextFitter (단어 폭 캐시 재사용)"""
+    return TextFitter(latin, ea)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='텍스트 상자 글자 크기 맞춤')
+    parser.add_argument('text', nargs='?', help='측정할 텍스트 (\\n은 문단 구분)')
+    parser.add_argument('--width', type=float, default=4.0, help='상자 폭 (inch)')
+    parser.add_argument('--height', type=float, default=1.0, help='상자 높이 (inch)')
+    parser.add_argument('--max-size', type=float, default=DEFAULT_MAX_SIZE, help='최대 글자 크기 (pt)')
+    parser.add_argument('--min-size', type=float, help=f'최소 글자 크기 (pt, 기본 {DEFAULT_MIN_SIZE})')
+    parser.add_argument('--font', help='글꼴 이름 또는 파일 (라틴/동아시아 공통)')
+    parser.add_argument('--ea-font', help='동아시아 글꼴 이름 또는 파일')
+    parser.add_argument('--bold', action='store_true', help='굵게')
+    parser.add_argument('--list-fonts', action='store_true', help='찾은 글꼴 이름 목록')
+    args = parser.parse_args()
+
+    if args.list_fonts:
+        for name, (path, index) in sorted(font_catalog().items()):
+            print(f"{name}\t{path}" + (f" #{index}" if index else ''))
+        return
+    if args.text is None:
+        parser.print_help()
+        sys.exit(1)
+
+    fitter = TextFitter(args.font, args.ea_font or args.font)
+    try:
+        result = fitter.fit(args.text.replace('\\n', '\n'), args.width * 914400, args.height * 914400,
+                            args.max_size, args.min_size, bold=args.bold)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"글꼴: {fitter.latin.path if fitter.latin else '(근사)'} / {fitter.ea.path if fitter.ea else '(근사)'}")
+    print(f"글자 크기: {result['size']}pt ({'맞음' if result['fits'] else '넘침'}, {result['line_count']}줄)")
+    for line in result['lines']:
+        print(f"  | {line}")
+
+
+if __name__ == "__main__":
+    main()
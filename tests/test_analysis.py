@@ -0,0 +1,51 @@
+"""--analyze 분석: 공유 LazyPackage가 python-pptx로 분석하던 이전 출력과 같은 텍스트를 냄"""
+
+import os
+
+import pytest
+from pptx import Presentation
+
+from conftest import REPO_DIR
+from pptx_merge import analyze_layout, analyze_pptx, open_analysis
+
+DECKS = [os.path.join(REPO_DIR, name) for name in ('PPT기본양식.pptx', 'PPT기본양식_병합.pptx')]
+
+
+def reference_pptx(pptx_file):
+    """이전 analyze_pptx 출력 (python-pptx)"""
+    prs = Presentation(pptx_file)
+    lines = ["=" * 60, f"파일: {pptx_file}", "=" * 60,
+             f"\n슬라이드 크기: {prs.slide_width.inches:.2f}\" x {prs.slide_height.inches:.2f}\"",
+             f"슬라이드 수: {len(prs.slides)}", f"슬라이드 마스터 수: {len(prs.slide_masters)}"]
+    for master in prs.slide_masters:
+        lines += [f"\n슬라이드 레이아웃 ({len(master.slide_layouts)}개):", "-" * 50]
+        for idx, layout in enumerate(master.slide_layouts):
+            lines.append(f"  [{idx:2d}] '{layout.name}' (placeholder: {len(list(layout.placeholders))}개)")
+    return '\n'.join(lines) + '\n'
+
+
+def reference_layout(pptx_file, layout_index):
+    """이전 analyze_layout 출력 (python-pptx - 상속된 위치/크기)"""
+    layout = Presentation(pptx_file).slide_layouts[layout_index]
+    placeholders = sorted(layout.placeholders, key=lambda ph: ph.top)
+    lines = ["=" * 60, f"레이아웃 [{layout_index}]: '{layout.name}'", "=" * 60,
+             f"\nPlaceholder ({len(placeholders)}개):", "-" * 50]
+    for ph in placeholders:
+        lines += [f"\n[{ph.placeholder_format.idx:2d}] {str(ph.placeholder_format.type).replace('PLACEHOLDER_', '')}",
+                  f"    위치: Y={ph.top.inches:.2f}\", X={ph.left.inches:.2f}\"",
+                  f"    크기: {ph.width.inches:.2f}\" x {ph.height.inches:.2f}\""]
+        text = ph.text_frame.text[:40] if ph.has_text_frame else ''
+        if text:
+            lines.append(f"    기본텍스트: '{text}'")
+    return '\n'.join(lines) + '\n'
+
+
+@pytest.mark.parametrize('deck', [d for d in DECKS if os.path.exists(d)])
+def test_shared_package_prints_previous_report(deck, capsys):
+    layout_count = len(Presentation(deck).slide_layouts)
+    with open_analysis(deck) as package:
+        analyze_pptx(package)
+        assert capsys.readouterr().out == reference_pptx(deck)
+        for index in range(layout_count):
+            analyze_layout(package, index)
+            assert capsys.readouterr().out == reference_layout(deck, index), index
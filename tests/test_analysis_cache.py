@@ -0,0 +1,43 @@
+"""analyze_report 캐시: 같은 파일은 열지 않고 캐시에서, 내용이 바뀌면 다시 분석"""
+
+import os
+import shutil
+
+import pytest
+
+from conftest import REPO_DIR
+import pptx_merge
+
+DECK = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+OTHER = os.path.join(REPO_DIR, 'PPT기본양식_병합.pptx')
+
+pytestmark = pytest.mark.skipif(not (os.path.exists(DECK) and os.path.exists(OTHER)), reason='샘플 PPTX 없음')
+
+
+def test_cache_hit_and_invalidation(tmp_path, monkeypatch):
+    monkeypatch.setattr(pptx_merge, 'ANALYSIS_CACHE_DIR', str(tmp_path / 'cache'))
+    deck = str(tmp_path / 'deck.pptx')
+    shutil.copy(DECK, deck)
+
+    first = pptx_merge.analyze_report(deck, layout_index=0, theme=True)
+    assert first['layout']['index'] == 0 and first['theme']
+
+    opened = []
+    real_open = pptx_merge.open_analysis
+    monkeypatch.setattr(pptx_merge, 'open_analysis', lambda *args: opened.append(args) or real_open(*args))
+    assert pptx_merge.analyze_report(deck, layout_index=0, theme=True) == first
+    assert opened == []
+
+    # 옵션이 다르면 다른 캐시 항목
+    pptx_merge.analyze_report(deck, layout_index=1)
+    assert len(opened) == 1
+
+    # 내용이 바뀌면 (같은 경로라도) 다시 분석
+    shutil.copy(OTHER, deck)
+    changed = pptx_merge.analyze_report(deck, layout_index=0, theme=True)
+    assert len(opened) == 2
+    assert changed['sha256'] != first['sha256']
+    assert changed['pptx']['slide_count'] != first['pptx']['slide_count']
+
+    assert pptx_merge.analyze_report(deck, layout_index=0, theme=True, use_cache=False) == changed
+    assert len(opened) == 3
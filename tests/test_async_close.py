@@ -0,0 +1,24 @@
+"""pptx_async: async with 종료가 실행 중인 작업을 기다리는 동안 이벤트 루프를 막지 않음"""
+
+import asyncio
+import threading
+import time
+
+from pptx_async import AsyncJobRunner
+
+
+def test_aexit_does_not_block_event_loop():
+    release = threading.Event()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        async with AsyncJobRunner(max_workers=1) as runner:
+            job = asyncio.ensure_future(runner._run(lambda report: release.wait(5), None, None))
+            await asyncio.sleep(0.05)   # 작업 스레드가 시작될 때까지
+            # 종료 대기 중에 루프가 돌아야 작업이 풀린다 (막히면 5초 뒤 타임아웃)
+            loop.call_later(0.1, release.set)
+        return await job
+
+    start = time.monotonic()
+    assert asyncio.run(main()) is True
+    assert time.monotonic() - start < 2
@@ -0,0 +1,38 @@
+"""merge_batch: worker 프로세스가 죽어도 나머지 작업은 끝나고 죽인 작업만 실패로 보고"""
+
+import multiprocessing
+import os
+
+import pytest
+
+from conftest import REPO_DIR
+import pptx_merge
+
+BASE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+SOURCE = os.path.join(REPO_DIR, 'PPT기본양식_병합.pptx')
+
+pytestmark = [
+    pytest.mark.skipif(not (os.path.exists(BASE) and os.path.exists(SOURCE)), reason='샘플 PPTX 없음'),
+    # worker가 부모 프로세스의 monkeypatch를 물려받아야 함
+    pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='fork 시작 방식 필요'),
+]
+
+_run_batch_job = pptx_merge._run_batch_job
+
+
+def _crashing_job(job):
+    if job['source'].endswith('crash.pptx'):
+        os._exit(1)   # 메모리 부족/segfault로 worker가 죽은 것처럼
+    return _run_batch_job(job)
+
+
+def test_worker_crash_fails_only_its_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(pptx_merge, '_run_batch_job', _crashing_job)
+    jobs = [{'source': SOURCE if n != 2 else str(tmp_path / 'crash.pptx'),
+             'output': str(tmp_path / f'out{n}.pptx'), 'layout': None} for n in range(5)]
+
+    results = pptx_merge.merge_batch(BASE, jobs, workers=2, apply_template=False)
+
+    assert [r['ok'] for r in results] == [True, True, False, True, True]
+    assert 'BrokenProcessPool' in results[2]['error']
+    assert all(os.path.exists(job['output']) for n, job in enumerate(jobs) if n != 2)
@@ -0,0 +1,40 @@
+"""pptx_bench: 합성 덱 크기, 측정 결과 형식, 회귀 비교"""
+
+import zipfile
+
+from pptx import Presentation
+
+from pptx_bench import compare_results, make_deck, run_benchmarks
+
+
+def test_make_deck_is_deterministic_and_sized(tmp_path):
+    first, second = str(tmp_path / 'a.pptx'), str(tmp_path / 'b.pptx')
+    make_deck(first, 3, shapes=4, paragraphs=2, media=2, media_px=64)
+    make_deck(second, 3, shapes=4, paragraphs=2, media=2, media_px=64)
+
+    prs = Presentation(first)
+    assert len(prs.slides) == 3
+    assert all(sum(1 for shape in slide.shapes if shape.has_text_frame) == 4 for slide in prs.slides)
+    assert all(len(shape.text_frame.paragraphs) == 2
+               for slide in prs.slides for shape in slide.shapes if shape.has_text_frame)
+    with zipfile.ZipFile(first) as a, zipfile.ZipFile(second) as b:
+        media = sorted(n for n in a.namelist() if n.startswith('ppt/media/'))
+        assert len(media) == 2
+        assert [a.read(n) for n in media] == [b.read(n) for n in media]
+
+
+def test_run_and_compare(tmp_path):
+    deck = {'shapes': 2, 'paragraphs': 1, 'media': 1, 'media_px': 32}
+    result = run_benchmarks([2], deck, names=['merge_stream', 'convert'], repeat=2,
+                            workdir=str(tmp_path), verbose=False)
+    assert [(r['bench'], r['slides'], len(r['seconds'])) for r in result['results']] == \
+        [('merge_stream', 2, 2), ('convert', 2, 2)]
+    assert result['meta']['deck'] == deck
+
+    baseline = {'results': [{'bench': 'merge', 'slides': 10, 'median': 1.0, 'peak_rss_mb': 100.0},
+                            {'bench': 'analyze', 'slides': 10, 'median': 1.0, 'peak_rss_mb': 100.0}]}
+    current = {'results': [{'bench': 'merge', 'slides': 10, 'median': 1.1, 'peak_rss_mb': 150.0},
+                           {'bench': 'analyze', 'slides': 10, 'median': 2.0, 'peak_rss_mb': None},
+                           {'bench': 'analyze', 'slides': 100, 'median': 9.0, 'peak_rss_mb': 900.0}]}
+    assert [(r['bench'], r['metric'], r['ratio']) for r in compare_results(current, baseline, threshold=0.2)] == \
+        [('merge', 'peak_rss_mb', 1.5), ('analyze', 'median', 2.0)]
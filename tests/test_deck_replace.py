@@ -0,0 +1,35 @@
+"""deck_spec "replace": 슬라이드 텍스트를 SlideIndex로 치환 (슬라이드 값이 전체 값보다 우선)"""
+
+import os
+
+import pytest
+
+from conftest import REPO_DIR
+from deck_spec import DeckCompiler, SlideIndex
+
+TEMPLATE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+
+pytestmark = pytest.mark.skipif(not os.path.exists(TEMPLATE), reason='샘플 PPTX 없음')
+
+
+def _slide_text(slide):
+    return '\n'.join(shape.text_frame.text for shape in slide.shapes if shape.has_text_frame)
+
+
+def test_replace_applies_deck_and_slide_replacements():
+    compiler = DeckCompiler(TEMPLATE)
+    index = SlideIndex(compiler.compile({'slides': [{'template': 7}]}).slides[0])
+    words = sorted({run.text.strip() for run in index.runs if run.text.strip()})
+    assert len(words) >= 2
+    first, second = words[0], words[1]
+
+    spec = {
+        'replace': {first: '<전체>', second: '<전체>'},
+        'slides': [
+            {'template': 7, 'replace': {second: '<슬라이드>'}},
+            {'template': 7},
+        ],
+    }
+    own, shared = (_slide_text(slide) for slide in compiler.compile(spec).slides)
+    assert '<전체>' in own and '<슬라이드>' in own
+    assert '<슬라이드>' not in shared and '<전체>' in shared
@@ -0,0 +1,37 @@
+"""generate_presentation.delete_slides: 복제한 슬라이드의 링크가 삭제한 슬라이드를 저장 파일에 남기지 않음"""
+
+import io
+import os
+import zipfile
+
+import pytest
+from pptx import Presentation
+
+from conftest import REPO_DIR
+from generate_presentation import duplicate_slide, keep_slides
+
+TEMPLATE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+
+pytestmark = pytest.mark.skipif(not os.path.exists(TEMPLATE), reason='샘플 PPTX 없음')
+
+
+def test_deleted_slides_are_not_saved_through_copied_links():
+    prs = Presentation(TEMPLATE)
+    template_count = len(prs.slides)
+    source, target = prs.slides[0], prs.slides[1]
+    source.shapes.add_textbox(0, 0, 100, 100).click_action.target_slide = target
+    target.notes_slide.notes_text_frame.text = '삭제할 슬라이드 노트'
+
+    copy = duplicate_slide(prs, 0)
+    keep_slides(prs, [template_count])
+    assert list(prs.slides) == [copy]
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    with zipfile.ZipFile(buffer) as zf:
+        names = zf.namelist()
+        assert [n for n in names if n.startswith('ppt/slides/slide')] == [copy.part.partname.lstrip('/')]
+        assert not [n for n in names if n.startswith('ppt/notesSlides/')]
+        rels = zf.read(copy.part.partname.lstrip('/').replace('slides/', 'slides/_rels/') + '.rels')
+        assert b'relationships/slide"' not in rels
+    assert len(Presentation(io.BytesIO(buffer.getvalue())).slides) == 1
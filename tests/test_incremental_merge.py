@@ -0,0 +1,86 @@
+"""증분 병합: 파트 번호가 바뀌어도 나머지 슬라이드는 재사용, 같은 내용의 슬라이드는 파트를 공유하지 않음"""
+
+import contextlib
+import io
+import os
+import zipfile
+
+import pytest
+from pptx import Presentation
+
+from conftest import REPO_DIR
+from generate_presentation import duplicate_slide, keep_slides
+import pptx_package as pkg
+from pptx_merge import merge_pptx_stream
+
+BASE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+SOURCE = os.path.join(REPO_DIR, '(원본)PPT템플릿_예시.pptx')
+
+pytestmark = pytest.mark.skipif(not (os.path.exists(BASE) and os.path.exists(SOURCE)), reason='샘플 PPTX 없음')
+
+
+def _without_first_slide(path, output):
+    """첫 슬라이드를 지우고 python-pptx로 다시 저장 (뒤 슬라이드 파트 번호가 바뀜)"""
+    prs = Presentation(path)
+    sld_id_lst = prs.slides._sldIdLst
+    first = sld_id_lst[0]
+    prs.part.drop_rel(first.rId)
+    sld_id_lst.remove(first)
+    prs.save(output)
+
+
+def _fingerprints(path):
+    with zipfile.ZipFile(path) as zf:
+        return [pkg.part_fingerprint(zf, name) for name in pkg.slide_partnames(zf)]
+
+
+def test_fingerprint_ignores_partnames(tmp_path):
+    edited = str(tmp_path / 'edited.pptx')
+    _without_first_slide(SOURCE, edited)
+    before, after = _fingerprints(SOURCE), _fingerprints(edited)
+    assert after == before[1:]
+
+
+def test_incremental_merge_reuses_unchanged_slides(tmp_path):
+    edited = str(tmp_path / 'edited.pptx')
+    _without_first_slide(SOURCE, edited)
+    output = str(tmp_path / 'merged.pptx')
+    merge_pptx_stream(BASE, SOURCE, output, incremental=True, verbose=False)
+
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        merge_pptx_stream(BASE, edited, output, incremental=True)
+    reused = len(_fingerprints(edited))
+    assert f'재사용 {reused}개, 변환 0개' in log.getvalue()
+
+
+def _with_duplicated_slide(path, output):
+    """첫 슬라이드(OLE 개체 포함)를 두 번 복제해 그 두 장만 남김 (지문이 같은 슬라이드 2장)"""
+    prs = Presentation(path)
+    count = len(prs.slides)
+    duplicate_slide(prs, 0)
+    duplicate_slide(prs, 0)
+    keep_slides(prs, [count, count + 1])
+    prs.save(output)
+
+
+def _slide_targets(path):
+    with zipfile.ZipFile(path) as zf:
+        return [sorted(rel['target'] for rel in pkg.read_rels(zf, name)
+                       if rel['type'] != pkg.RT_SLIDE_LAYOUT)
+                for name in pkg.slide_partnames(zf)]
+
+
+def test_incremental_merge_keeps_parts_of_identical_slides_separate(tmp_path):
+    source = str(tmp_path / 'duplicated.pptx')
+    _with_duplicated_slide(SOURCE, source)
+    assert len(set(_fingerprints(source))) == 1
+
+    full, output = str(tmp_path / 'full.pptx'), str(tmp_path / 'merged.pptx')
+    merge_pptx_stream(BASE, source, full, verbose=False)
+    merge_pptx_stream(BASE, source, output, incremental=True, verbose=False)
+    merge_pptx_stream(BASE, source, output, incremental=True, verbose=False)   # 두 장 모두 재사용
+
+    first, second = _slide_targets(output)[-2:]
+    assert not set(first) & set(second)
+    assert _slide_targets(output) == _slide_targets(full)
@@ -0,0 +1,36 @@
+"""pptx_library: 한글 한 음절 검색어는 검색되고, 색인 단어가 없는 검색어는 전체 결과 대신 ValueError"""
+
+import os
+import shutil
+
+import pytest
+
+from conftest import REPO_DIR
+from pptx_library import SlideLibrary, words
+
+DECK = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+
+
+def test_words_keep_single_hangul_syllables():
+    assert words('값 a 회의 B2 x') == {'값', '회의', 'b2'}
+
+
+def test_query_without_usable_terms_is_rejected(tmp_path):
+    with SlideLibrary(str(tmp_path / 'library.db')) as library:
+        with pytest.raises(ValueError):
+            library.search('a')
+        with pytest.raises(ValueError):
+            library.search('! ?')
+        assert library.search('') == library.search(None) == []
+
+
+@pytest.mark.skipif(not os.path.exists(DECK), reason='샘플 PPTX 없음')
+def test_single_syllable_query_matches_word_prefix(tmp_path):
+    decks = tmp_path / 'decks'
+    decks.mkdir()
+    shutil.copy(DECK, decks)
+    with SlideLibrary(str(tmp_path / 'library.db')) as library:
+        library.update(str(decks), verbose=False)
+        expected = library.search('텍스트를')
+        assert expected
+        assert library.search('텍') == expected
@@ -0,0 +1,43 @@
+"""저메모리 모드(iterparse, 파트 캐시 없음)가 일반 모드와 같은 결과를 냄"""
+
+import os
+import zipfile
+
+import pytest
+
+from conftest import REPO_DIR
+import pptx_package as pkg
+from pptx_merge import analyze_all_layouts, analyze_pptx, merge_pptx_stream, open_analysis
+
+BASE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+SOURCE = os.path.join(REPO_DIR, '(원본)PPT템플릿_예시.pptx')
+
+pytestmark = pytest.mark.skipif(not (os.path.exists(BASE) and os.path.exists(SOURCE)), reason='샘플 PPTX 없음')
+
+
+def _parts(path):
+    with zipfile.ZipFile(path) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+def test_parse_slide_shapes_matches_strip_to_shapes():
+    with zipfile.ZipFile(SOURCE) as zf:
+        for name in pkg.slide_partnames(zf):
+            expected = pkg.serialize_xml(pkg.strip_to_shapes(pkg.parse_xml(zf.read(name))))
+            assert pkg.serialize_xml(pkg.parse_slide_shapes(zf, name)) == expected, name
+
+
+def test_low_memory_analysis_matches():
+    for deck in (BASE, SOURCE):
+        assert analyze_pptx(deck, verbose=False, low_memory=True) == analyze_pptx(deck, verbose=False)
+        with open_analysis(deck, low_memory=True) as package:
+            assert not package.cache
+            low = analyze_all_layouts(package, verbose=False)
+        assert low == analyze_all_layouts(deck, verbose=False)
+
+
+def test_low_memory_merge_matches(tmp_path):
+    normal, low = str(tmp_path / 'normal.pptx'), str(tmp_path / 'low.pptx')
+    merge_pptx_stream(BASE, SOURCE, normal, verbose=False)
+    merge_pptx_stream(BASE, SOURCE, low, verbose=False, low_memory=True)
+    assert _parts(low) == _parts(normal)
@@ -0,0 +1,24 @@
+"""pptx_mailmerge: 행 값으로 만든 출력 이름이 출력 디렉터리 밖을 가리키면 그 행의 오류로 보고"""
+
+import os
+
+import pytest
+
+from conftest import REPO_DIR
+from pptx_mailmerge import mail_merge
+
+TEMPLATE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+
+pytestmark = pytest.mark.skipif(not os.path.exists(TEMPLATE), reason='샘플 PPTX 없음')
+
+
+@pytest.mark.parametrize('value', ['../../tmp/evil', '..', 'sub/deck', 'sub\\deck', '/tmp/evil'])
+def test_path_in_output_name_is_rejected(tmp_path, value):
+    data_file = tmp_path / 'rows.csv'
+    data_file.write_text(f'고객명\n정상\n{value}\n', encoding='utf-8')
+    output = tmp_path / 'out' / 'decks'
+
+    with pytest.raises(ValueError, match='2번째 행'):
+        mail_merge(TEMPLATE, str(data_file), str(output), name='{고객명}.pptx', verbose=False)
+    assert os.listdir(output) == ['정상.pptx']
+    assert sorted(os.listdir(tmp_path)) == ['out', 'rows.csv']
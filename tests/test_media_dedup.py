@@ -0,0 +1,55 @@
+"""슬라이드 복사 시 미디어는 SHA-256 콘텐츠 해시로 한 번만 저장 (python-pptx/스트리밍 병합 모두)"""
+
+import io
+import os
+import zipfile
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+from conftest import REPO_DIR
+from pptx_merge import merge_pptx, merge_pptx_stream
+
+BASE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+# 기본 양식에 이미 있는 이미지
+BASE_IMAGE = 'ppt/media/image5.png'
+
+pytestmark = pytest.mark.skipif(not os.path.exists(BASE), reason='샘플 PPTX 없음')
+
+
+def _new_image(image):
+    """기본 양식에 없는 이미지 (PNG 끝에 바이트를 덧붙여 내용만 다르게)"""
+    return image + b'\0'
+
+
+def _source(tmp_path, images):
+    """이미지마다 슬라이드 2장에 같은 그림을 넣은 원본 덱"""
+    prs = Presentation()
+    for image in images:
+        for _ in range(2):
+            slide = prs.slides.add_slide(prs.slide_layouts[6])
+            slide.shapes.add_picture(io.BytesIO(image), Inches(1), Inches(1))
+    path = str(tmp_path / 'source.pptx')
+    prs.save(path)
+    return path
+
+
+def _copies(path, image):
+    with zipfile.ZipFile(path) as zf:
+        return [name for name in zf.namelist() if name.startswith('ppt/media/') and zf.read(name) == image]
+
+
+@pytest.mark.parametrize('merge', [merge_pptx, merge_pptx_stream])
+def test_image_used_twice_is_stored_once(tmp_path, merge):
+    with zipfile.ZipFile(BASE) as zf:
+        base_image = zf.read(BASE_IMAGE)
+    new_image = _new_image(base_image)
+    source = _source(tmp_path, [base_image, new_image])
+    output = str(tmp_path / 'merged.pptx')
+
+    merge(BASE, source, output, apply_template=False)
+
+    assert _copies(output, base_image) == [BASE_IMAGE]
+    assert len(_copies(output, new_image)) == 1
+    assert len(Presentation(output).slides) == len(Presentation(BASE).slides) + 4
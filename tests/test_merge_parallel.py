@@ -0,0 +1,31 @@
+"""merge_pptx 병렬 템플릿 변환(workers)이 순차 변환과 같은 결과를 내는지 파트 단위로 비교"""
+
+import os
+import zipfile
+
+import pytest
+
+from conftest import REPO_DIR
+from pptx_merge import merge_pptx
+
+BASE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+# 그림 placeholder(텍스트 프레임 없는 p:sp)가 있는 원본
+SOURCE = os.path.join(REPO_DIR, '(원본)PPT템플릿_예시.pptx')
+
+
+def _parts(path):
+    with zipfile.ZipFile(path) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+@pytest.mark.skipif(not (os.path.exists(BASE) and os.path.exists(SOURCE)), reason='샘플 PPTX 없음')
+def test_parallel_matches_sequential(tmp_path):
+    sequential = tmp_path / 'sequential.pptx'
+    parallel = tmp_path / 'parallel.pptx'
+    merge_pptx(BASE, SOURCE, str(sequential))
+    merge_pptx(BASE, SOURCE, str(parallel), workers=2)
+
+    expected, actual = _parts(sequential), _parts(parallel)
+    assert sorted(actual) == sorted(expected)
+    different = [name for name in expected if expected[name] != actual[name]]
+    assert different == []
@@ -0,0 +1,61 @@
+"""pptx_optimize: 출력이 열리고, 쓰지 않는 레이아웃이 빠지고, 큰 이미지는 표시 크기에 맞게 축소"""
+
+import io
+import os
+import zipfile
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+from conftest import REPO_DIR
+import pptx_package as pkg
+from pptx_merge import select_slides
+from pptx_optimize import optimize_pptx
+
+DECK = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+
+
+def _texts(path):
+    return [[shape.text_frame.text for shape in slide.shapes if shape.has_text_frame]
+            for slide in Presentation(path).slides]
+
+
+@pytest.mark.skipif(not os.path.exists(DECK), reason='샘플 PPTX 없음')
+def test_unused_layouts_are_pruned(tmp_path):
+    # 슬라이드 2장 + 모든 레이아웃 (대부분 쓰이지 않음)
+    deck, output = str(tmp_path / 'deck.pptx'), str(tmp_path / 'optimized.pptx')
+    select_slides(DECK, [0, 8], deck, all_layouts=True, verbose=False)
+    stats = optimize_pptx(deck, output, verbose=False)
+
+    prs = Presentation(output)
+    used = {slide.slide_layout.name for slide in Presentation(deck).slides}
+    assert sorted(layout.name for layout in prs.slide_layouts) == sorted(used)
+    assert stats['layouts_removed'] == len(Presentation(deck).slide_layouts) - len(used) > 0
+    assert _texts(output) == _texts(deck)
+    with zipfile.ZipFile(output) as zf, zipfile.ZipFile(deck) as zin:
+        # 남은 파트의 관계 대상은 지워지지 않음 (입력에서부터 없던 대상 제외)
+        for name in zf.namelist():
+            if name.endswith('.xml') and '_rels' not in name:
+                for rel in pkg.read_rels(zf, name):
+                    target = pkg.resolve_target(name, rel['target'])
+                    assert rel['external'] or target in zf.NameToInfo or target not in zin.NameToInfo
+
+
+def test_oversized_image_is_downscaled_in_place(tmp_path):
+    image = io.BytesIO()
+    Image.new('RGB', (3000, 3000), (200, 30, 30)).save(image, 'PNG')
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    picture = slide.shapes.add_picture(image, Inches(1), Inches(1), Inches(1), Inches(1))
+    partname = slide.part.related_part(picture._element.blipFill.blip.rEmbed).partname.lstrip('/')
+    path = str(tmp_path / 'deck.pptx')
+    prs.save(path)
+
+    stats = optimize_pptx(path, dpi=150, verbose=False)   # 제자리 교체
+
+    assert stats['images_downscaled'] == 1 and stats['output_bytes'] < stats['input_bytes']
+    with zipfile.ZipFile(path) as zf:
+        assert Image.open(io.BytesIO(zf.read(partname))).size == (150, 150)
+    assert len(Presentation(path).slides) == 1
@@ -0,0 +1,24 @@
+"""pptx_preview 캐시: 다시 내보내면 그리지 않고, use_cache=False이면 모두 다시 그림"""
+
+import os
+
+import pytest
+
+from conftest import REPO_DIR
+from pptx_preview import export_previews
+
+DECK = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+
+pytestmark = pytest.mark.skipif(not os.path.exists(DECK), reason='샘플 PPTX 없음')
+
+
+def test_no_cache_rerenders_every_slide(tmp_path):
+    output, cache_dir = str(tmp_path / 'preview'), str(tmp_path / 'cache')
+    first = export_previews(DECK, output, workers=1, cache_dir=cache_dir, verbose=False)
+    assert first['rendered'] == first['slides'] > 0
+
+    again = export_previews(DECK, output, workers=1, cache_dir=cache_dir, verbose=False)
+    assert again['rendered'] == again['written'] == 0
+
+    forced = export_previews(DECK, output, workers=1, use_cache=False, cache_dir=cache_dir, verbose=False)
+    assert forced['rendered'] == forced['written'] == forced['slides']
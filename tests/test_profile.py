@@ -0,0 +1,47 @@
+"""pptx_profile: 병합 파이프라인이 단계별 이벤트를 남기고 trace로 내보냄"""
+
+import json
+import os
+
+import pytest
+
+from conftest import REPO_DIR
+from pptx_merge import merge_pptx, merge_pptx_stream
+from pptx_profile import Profiler
+
+BASE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+SOURCE = os.path.join(REPO_DIR, 'PPT기본양식_병합.pptx')
+
+pytestmark = pytest.mark.skipif(not (os.path.exists(BASE) and os.path.exists(SOURCE)), reason='샘플 PPTX 없음')
+
+SLIDE_PHASES = {
+    merge_pptx: {'add_slide', 'remove_placeholders', 'copy_shapes', 'template_convert'},
+    merge_pptx_stream: {'parse', 'template_convert', 'copy_relationships', 'write'},
+}
+DECK_PHASES = {
+    merge_pptx: {'open_base', 'open_source', 'save'},
+    merge_pptx_stream: {'open_base', 'copy_base'},
+}
+
+
+@pytest.mark.parametrize('merge', [merge_pptx, merge_pptx_stream])
+def test_merge_records_expected_phases(tmp_path, merge):
+    hooked = []
+    profiler = Profiler(hook=hooked.append)
+    merge(BASE, SOURCE, str(tmp_path / 'merged.pptx'), profiler=profiler)
+    slide_count = len(set(e['slide'] for e in profiler.events if e['slide'] is not None))
+
+    assert hooked == profiler.events
+    assert slide_count > 0
+    phases = {e['phase'] for e in profiler.events}
+    assert DECK_PHASES[merge] | SLIDE_PHASES[merge] <= phases
+    for phase in SLIDE_PHASES[merge]:
+        assert profiler.summary()['phases'][phase]['count'] == slide_count, phase
+    assert all(e['duration_us'] >= 0 for e in profiler.events)
+
+    trace = str(tmp_path / 'merge.trace.json')
+    profiler.write_trace(trace)
+    with open(trace, encoding='utf-8') as f:
+        events = json.load(f)['traceEvents']
+    assert len(events) == len(profiler.events)
+    assert {e['cat'] for e in events} == phases
@@ -0,0 +1,52 @@
+"""select_slides: 요청한 슬라이드와 그 슬라이드가 쓰는 파트만 출력"""
+
+import io
+import os
+import posixpath
+import zipfile
+
+import pytest
+from pptx import Presentation
+
+from conftest import REPO_DIR
+import pptx_package as pkg
+from pptx_merge import select_slides
+
+TEMPLATE = os.path.join(REPO_DIR, '(원본)PPT템플릿_예시.pptx')
+
+pytestmark = pytest.mark.skipif(not os.path.exists(TEMPLATE), reason='샘플 PPTX 없음')
+
+
+def _texts(slide):
+    return [shape.text_frame.text for shape in slide.shapes if shape.has_text_frame]
+
+
+def _reachable(zf):
+    """패키지 루트에서 관계로 도달하는 파트"""
+    found, pending = set(), ['']
+    while pending:
+        name = pending.pop()
+        for rel in pkg.read_rels(zf, name):
+            target = pkg.resolve_target(name, rel['target'])
+            if not rel['external'] and target not in found and target in zf.NameToInfo:
+                found.add(target)
+                pending.append(target)
+    return found
+
+
+def test_select_keeps_only_requested_parts():
+    indices = [3, 0, 3]
+    buffer = io.BytesIO()
+    select_slides(TEMPLATE, indices, buffer, verbose=False)
+
+    template = Presentation(TEMPLATE)
+    output = Presentation(io.BytesIO(buffer.getvalue()))
+    assert [_texts(slide) for slide in output.slides] == [_texts(template.slides[i]) for i in indices]
+    used_layouts = {template.slides[i].slide_layout.name for i in indices}
+    assert sorted(layout.name for layout in output.slide_layouts) == sorted(used_layouts)
+
+    with zipfile.ZipFile(buffer) as zf:
+        names = [n for n in zf.namelist() if n != pkg.CONTENT_TYPES and '/_rels/' not in '/' + n]
+        assert sorted(names) == sorted(_reachable(zf))
+        assert len([n for n in names if posixpath.dirname(n) == 'ppt/slides']) == len(indices)
+        assert not [n for n in names if n.startswith('ppt/notesSlides/')]
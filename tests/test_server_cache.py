@@ -0,0 +1,100 @@
+"""pptx_server.TemplateCache 동시성: 전역 잠금 밖 로드, 사용 중 항목 보호"""
+
+import threading
+
+from pptx_server import TemplateCache
+
+
+class FakeTemplate:
+    def __init__(self, path):
+        self.path = path
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _sizer(nbytes):
+    return lambda key, value: nbytes
+
+
+def _paths(tmp_path, *names):
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_bytes(b'x')
+        paths.append(str(path))
+    return paths
+
+
+def test_slow_load_does_not_block_other_templates(tmp_path):
+    slow, fast = _paths(tmp_path, 'slow.pptx', 'fast.pptx')
+    cache = TemplateCache(1 << 20)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_loader(path):
+        started.set()
+        release.wait(5)
+        return FakeTemplate(path)
+
+    def use_slow():
+        with cache.use('deck', slow, slow_loader, _sizer(1)):
+            pass
+
+    thread = threading.Thread(target=use_slow)
+    thread.start()
+    assert started.wait(5)
+    with cache.use('deck', fast, FakeTemplate, _sizer(1)) as (value, _):
+        assert value.path == fast
+    assert thread.is_alive()
+    release.set()
+    thread.join(5)
+
+
+def test_concurrent_miss_loads_once(tmp_path):
+    path, = _paths(tmp_path, 'a.pptx')
+    cache = TemplateCache(1 << 20)
+    loads = []
+    gate = threading.Event()
+
+    def loader(path):
+        loads.append(path)
+        gate.wait(5)
+        return FakeTemplate(path)
+
+    values = []
+
+    def worker():
+        with cache.use('deck', path, loader, _sizer(1)) as (value, _):
+            values.append(value)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(loads) == 1
+    assert len(values) == 4 and all(value is values[0] for value in values)
+
+
+def test_entry_in_use_is_not_evicted(tmp_path):
+    first, second = _paths(tmp_path, 'a.pptx', 'b.pptx')
+    cache = TemplateCache(10)
+    with cache.use('deck', first, FakeTemplate, _sizer(8)) as (pinned, _):
+        with cache.use('deck', second, FakeTemplate, _sizer(8)) as (other, _):
+            assert not pinned.closed
+        # first가 사용 중이므로 second가 제거됨
+        assert other.closed
+        assert not pinned.closed
+    assert cache.stats()['total_bytes'] <= 10
+
+
+def test_size_is_reestimated_on_release(tmp_path):
+    path, = _paths(tmp_path, 'a.pptx')
+    cache = TemplateCache(1 << 20)
+    sizes = iter([1, 500])
+    sizer = lambda key, value: next(sizes)
+    with cache.use('deck', path, FakeTemplate, sizer):
+        pass
+    assert cache.stats()['total_bytes'] == 500
@@ -0,0 +1,49 @@
+"""pptx_snapshot: 스냅샷은 같은 내용의 템플릿에만 쓰이고, 템플릿이 바뀌면 버려짐"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from conftest import REPO_DIR
+import pptx_merge
+from pptx_snapshot import compile_template, load_snapshot, snapshot_path
+
+DECK = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+OTHER = os.path.join(REPO_DIR, 'PPT기본양식_병합.pptx')
+
+pytestmark = pytest.mark.skipif(not (os.path.exists(DECK) and os.path.exists(OTHER)), reason='샘플 PPTX 없음')
+
+
+def test_snapshot_matches_template_and_is_rejected_after_change(tmp_path):
+    template = str(tmp_path / 'template.pptx')
+    shutil.copy(DECK, template)
+    fresh = pptx_merge.load_base(template)   # 스냅샷 없음 - 템플릿을 직접 읽음
+    compile_template(template, verbose=False)
+
+    snapshot = load_snapshot(template)
+    assert snapshot is not None
+    assert snapshot.base_info() == fresh
+
+    # 수정 시각만 바뀌면 내용 해시로 확인하고 계속 사용
+    stat = os.stat(template)
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_snapshot(template) is not None
+
+    # 내용이 바뀌면 버림
+    shutil.copy(OTHER, template)
+    assert load_snapshot(template) is None
+    assert pptx_merge.load_base(template)['slides'] != fresh['slides']
+
+
+def test_snapshot_from_other_tool_version_is_ignored(tmp_path):
+    template = str(tmp_path / 'template.pptx')
+    shutil.copy(DECK, template)
+    compile_template(template, verbose=False)
+    with open(snapshot_path(template), encoding='utf-8') as f:
+        data = json.load(f)
+    data['tool_version'] = 'old'
+    with open(snapshot_path(template), 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    assert load_snapshot(template) is None
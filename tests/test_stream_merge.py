@@ -0,0 +1,29 @@
+"""merge_pptx_stream(ZIP 스트리밍)가 merge_pptx(python-pptx)와 같은 슬라이드/텍스트를 만드는지 비교"""
+
+import os
+
+import pytest
+from pptx import Presentation
+
+from conftest import REPO_DIR
+from pptx_merge import merge_pptx, merge_pptx_stream
+
+BASE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+SOURCE = os.path.join(REPO_DIR, '(원본)PPT템플릿_예시.pptx')
+
+pytestmark = pytest.mark.skipif(not (os.path.exists(BASE) and os.path.exists(SOURCE)), reason='샘플 PPTX 없음')
+
+
+def _slides(path):
+    """슬라이드별 (레이아웃 이름, shape별 (이름, 텍스트))"""
+    return [(slide.slide_layout.name,
+             [(shape.name, shape.text_frame.text if shape.has_text_frame else None) for shape in slide.shapes])
+            for slide in Presentation(path).slides]
+
+
+@pytest.mark.parametrize('apply_template', [True, False])
+def test_stream_matches_object_model(tmp_path, apply_template):
+    expected, actual = str(tmp_path / 'object.pptx'), str(tmp_path / 'stream.pptx')
+    merge_pptx(BASE, SOURCE, expected, layout_index=8, apply_template=apply_template)
+    merge_pptx_stream(BASE, SOURCE, actual, layout_index=8, apply_template=apply_template)
+    assert _slides(actual) == _slides(expected)
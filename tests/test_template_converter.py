@@ -0,0 +1,78 @@
+"""TemplateConverter 사전 필터: 규칙별 순차 치환(이전 동작)과 결과가 같음"""
+
+import os
+import re
+
+import pytest
+from pptx import Presentation
+
+from conftest import REPO_DIR
+from pptx_merge import REMOVE_PATTERNS, TEMPLATE_REPLACEMENTS, TemplateConverter, _cleanup
+
+SOURCE = os.path.join(REPO_DIR, '(원본)PPT템플릿_예시.pptx')
+
+# 내장 규칙마다 일치하는 문단 (TEMPLATE_REPLACEMENTS와 같은 순서)
+REPLACEMENT_SAMPLES = [
+    ['소제목 Medium 14pt', '소제목/Medium14pt', '| 소제목/ Medium  14pt |'],
+    ['중제목 Medium 16pt', '중제목/Medium, 16pt', '중제목|Medium 16pt.'],
+    ['텍스트를 입력하세요', '텍스트를 입력하세요\n다음 줄', '앞 텍스트를 입력하세요   '],
+    ['텍스트를 입력하시오', '- 텍스트를 입력하시오 -'],
+]
+
+
+def brute_force(text, remove_patterns, replacements):
+    """사전 필터 없는 규칙별 순차 치환 (이전 convert_to_template)"""
+    result = text
+    for pattern in remove_patterns:
+        result = re.sub(pattern, '', result, flags=re.IGNORECASE)
+    for pattern, replacement in replacements:
+        result = re.sub(pattern, replacement, result)
+    if '{{소제목}}' in result and '{{본문_내용}}' not in result:
+        result = result.replace('{{소제목}}', '{{소제목}}\n{{본문_내용}}')
+    return _cleanup(result)
+
+
+def _samples():
+    texts = ['', '일반 문단', ' 앞뒤 공백 ', '{{소제목}}', '.|.']
+    for pattern in REMOVE_PATTERNS:
+        prefix = pattern.replace('[^\\n]*', '')
+        texts += [prefix, f'{prefix} 뒤 문장\n남는 줄', f'앞 줄\n{prefix.upper()}']
+    texts += [text for samples in REPLACEMENT_SAMPLES for text in samples]
+    if os.path.exists(SOURCE):
+        for slide in Presentation(SOURCE).slides:
+            for shape in slide.shapes:
+                if shape.has_text_frame:
+                    texts += [paragraph.text for paragraph in shape.text_frame.paragraphs]
+    return texts
+
+
+def test_builtin_rules_match_brute_force():
+    converter = TemplateConverter(REMOVE_PATTERNS, TEMPLATE_REPLACEMENTS)
+    assert converter._prefilter is not None
+    for pattern, samples in zip([p for p, _ in TEMPLATE_REPLACEMENTS], REPLACEMENT_SAMPLES):
+        assert all(re.search(pattern, text) for text in samples), pattern
+    for text in _samples():
+        assert converter.convert(text) == brute_force(text, REMOVE_PATTERNS, TEMPLATE_REPLACEMENTS), text
+
+
+def test_anchors_and_lookarounds_keep_prefilter():
+    remove = [r'^머리말:[^\n]*']
+    replace = [(r'(?<=\[)이름(?=\])', '{{텍스트}}'), (r'끝$', '{{텍스트}}')]
+    converter = TemplateConverter(remove, replace)
+    assert converter._prefilter is not None
+    for text in ['머리말: 지움', '본문 머리말: 유지', '[이름]', '이름', '마지막 끝', '끝 아님']:
+        assert converter.convert(text) == brute_force(text, remove, replace), text
+
+
+@pytest.mark.parametrize('replace', [
+    [(r'(가)\1', '{{텍스트}}')],                       # 합치면 앞 규칙의 그룹을 가리킴
+    [(r'(?P<글자>가)(?P=글자)', '{{텍스트}}')],
+    [(r'(?m)^가가$', '{{텍스트}}')],                   # 합치면 다른 규칙에도 적용됨
+])
+def test_rules_unsafe_to_combine_disable_prefilter(replace):
+    remove = [r'머리(말)']
+    converter = TemplateConverter(remove, replace)
+    assert converter._prefilter is None
+    for text in ['가가', '앞\n가가', '머리말 가가', '나나']:
+        assert converter.convert(text) == brute_force(text, remove, replace), text
+    assert converter.convert('가가') == '{{텍스트}}'
@@ -0,0 +1,44 @@
+"""pptx_textfit: 크기 범위 검사, 단위 폭 캐시 상한, 슬라이드 테마 글꼴 fitter"""
+
+import os
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+from conftest import REPO_DIR
+from deck_spec import DeckCompiler, slide_fitter
+from pptx_textfit import TextFitter
+
+TEMPLATE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+
+
+def test_min_size_above_max_size_raises():
+    fitter = TextFitter()
+    with pytest.raises(ValueError):
+        fitter.fit('텍스트', Inches(4), Inches(1), max_size=10, min_size=12)
+    with pytest.raises(ValueError):
+        fitter.fit('텍스트', Inches(4), Inches(1), step=0)
+
+
+def test_default_min_size_follows_small_max_size():
+    result = TextFitter().fit('아주 긴 본문 ' * 50, Inches(1), Inches(0.5), max_size=6)
+    assert result['size'] == 6 and not result['fits']
+
+
+def test_width_cache_is_bounded_and_lines_are_not_cached():
+    fitter = TextFitter(width_cache_size=16)
+    text = ' '.join(f'단어{n}' for n in range(200))
+    fitter.fit(text, Inches(4), Inches(3))
+    assert len(fitter._widths) <= 16
+    assert fitter.text_width('단어1 단어2') == pytest.approx(
+        fitter.unit_width('단어1') + fitter.unit_width(' ') + fitter.unit_width('단어2'))
+
+
+@pytest.mark.skipif(not os.path.exists(TEMPLATE), reason='샘플 PPTX 없음')
+def test_slide_fitter_uses_theme_fonts_like_deck_compiler():
+    slide = Presentation(TEMPLATE).slides[0]
+    compiler = DeckCompiler(TEMPLATE)
+    for major in (False, True):
+        fitter, expected = slide_fitter(slide, major), compiler.fitter(major)
+        assert (fitter.latin, fitter.ea) == (expected.latin, expected.ea)
@@ -0,0 +1,50 @@
+"""템플릿 토큰: 변환 중 기록한 토큰이 병합 방식과 무관하게 같고 출력의 iterparse 스캔과 일치"""
+
+import io
+import json
+import os
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+from conftest import REPO_DIR
+from pptx_merge import merge_pptx, merge_pptx_stream, scan_tokens
+
+BASE = os.path.join(REPO_DIR, 'PPT기본양식.pptx')
+SOURCE = os.path.join(REPO_DIR, '(원본)PPT템플릿_예시.pptx')
+
+pytestmark = pytest.mark.skipif(not (os.path.exists(BASE) and os.path.exists(SOURCE)), reason='샘플 PPTX 없음')
+
+
+def _manifest(path):
+    with open(path, encoding='utf-8') as f:
+        return [slide['tokens'] for slide in json.load(f)['slides']]
+
+
+def test_recorded_tokens_match_scan(tmp_path):
+    manifests = {}
+    for name, merge, kwargs in [('object', merge_pptx, {}), ('stream', merge_pptx_stream, {}),
+                                ('parallel', merge_pptx_stream, {'workers': 2})]:
+        output = str(tmp_path / f'{name}.pptx')
+        merge(BASE, SOURCE, output, token_manifest=output + '.tokens.json', **kwargs)
+        manifests[name] = _manifest(output + '.tokens.json')
+
+        added = len(manifests[name])
+        assert [slide['tokens'] for slide in scan_tokens(output)[-added:]] == manifests[name]
+    assert manifests['object'] == manifests['stream'] == manifests['parallel']
+    assert any(manifests['object'])
+
+
+def test_scan_finds_split_and_table_tokens(tmp_path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    paragraph = slide.shapes.add_textbox(0, 0, Inches(4), Inches(1)).text_frame.paragraphs[0]
+    for text in ('앞 {{소', '제목}} 뒤 {{본문}}', ' {{소제목}}'):
+        paragraph.add_run().text = text
+    table = slide.shapes.add_table(1, 1, 0, Inches(2), Inches(4), Inches(1)).table
+    table.cell(0, 0).text = '{{표}}'
+    buffer = io.BytesIO()
+    prs.save(buffer)
+
+    assert [slide['tokens'] for slide in scan_tokens(buffer)] == [['{{소제목}}', '{{본문}}', '{{표}}']]